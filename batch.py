@@ -0,0 +1,30 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+from utils.batch import add_render_args, render_opts, run_batch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate portfolio reports for every client folder in a directory."
+    )
+    parser.add_argument('input_dir', type=Path, help="directory with one sub-folder of input files per client")
+    parser.add_argument(
+        '-o', '--output', type=Path,
+        default=Path.home() / "Desktop" / "portfolio_reports",
+        help="directory for the generated PDFs"
+    )
+    parser.add_argument(
+        '-w', '--workers', type=int, default=os.cpu_count(),
+        help="number of worker processes (default: CPU count)"
+    )
+    add_render_args(parser)
+    args = parser.parse_args(argv)
+    opts = render_opts(parser, args)
+
+    results = run_batch(args.input_dir, args.output, args.workers, opts)
+    return 0 if all(pdf for _, pdf, _, _ in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from matplotlib.backends.backend_pdf import PdfPages
+
+from benchmarks.synth import equity_names, portfolio, split, write_csvs
+from utils.batch import file_list
+from utils.pdfwrite import PdfDoc
+from utils.processing import ld_data, REQ_FILES
+from utils.report import DIRECT_PAGES, PAGE_FNS, report_ctx
+
+SIZES = [100, 1000]
+
+def load_ctx(n, work, seed=0):
+    # CSV round trip so the frames look exactly like ld_data's
+    d = Path(work) / f"n{n}"
+    write_csvs(portfolio(n, seed), d / 'csv')
+    files = file_list(sorted((d / 'csv').glob('*.csv')))
+    return report_ctx(ld_data(files, REQ_FILES, d), frozenset(equity_names(split(n)['equity'])))
+
+def time_mpl(key, ctx, path):
+    start = time.perf_counter()
+    with PdfPages(path) as pdf:
+        PAGE_FNS[key](pdf, ctx)
+        pages = pdf.get_pagecount()
+    return time.perf_counter() - start, pages
+
+def time_direct(key, ctx, path):
+    start = time.perf_counter()
+    doc = PdfDoc(path)
+    DIRECT_PAGES[key](doc, ctx)
+    doc.close()
+    return time.perf_counter() - start, doc.get_pagecount()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the matplotlib and direct PDF backends page by page.")
+    parser.add_argument('-n', '--sizes', type=int, nargs='+', default=SIZES, help="holdings per portfolio")
+    parser.add_argument('-r', '--repeat', type=int, default=1, help="runs per page; the fastest is reported")
+    parser.add_argument('--work-dir', type=Path, help="keep generated inputs and PDFs here instead of a temp dir")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='reportiq_backends_') as tmp:
+        work = args.work_dir or Path(tmp)
+        for n in args.sizes:
+            ctx = load_ctx(n, work)
+            totals = [0.0, 0.0]
+            print(f"{n:>6} holdings          matplotlib      direct  speedup  pages", flush=True)
+            for key in DIRECT_PAGES:
+                mpl = min(time_mpl(key, ctx, work / f"n{n}_{key}_mpl.pdf") for _ in range(args.repeat))
+                direct = min(time_direct(key, ctx, work / f"n{n}_{key}_direct.pdf") for _ in range(args.repeat))
+                totals[0] += mpl[0]
+                totals[1] += direct[0]
+                pages = str(mpl[1]) if mpl[1] == direct[1] else f"{mpl[1]} != {direct[1]}"
+                print(f"         {key:<16} {mpl[0]:9.3f}s {direct[0]:9.3f}s {mpl[0] / direct[0]:7.1f}x  {pages}",
+                      flush=True)
+            print(f"         {'total':<16} {totals[0]:9.3f}s {totals[1]:9.3f}s {totals[0] / totals[1]:7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.synth import portfolio, write_csvs
+from utils.ops import REQ_FILES
+from utils.schema import SCHEMAS, frame_bytes, read_csv
+
+SIZES = [1000, 10000]
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = fn()
+        secs = time.perf_counter() - start
+        best = secs if best is None else min(best, secs)
+    return df, best
+
+def report(d: Path, label: str, repeat: int = 1):
+    # plain pd.read_csv against the schema-driven load, file by file
+    totals = [0, 0, 0.0, 0.0]
+    print(f"{label:<22} {'rows':>7} {'plain KB':>10} {'typed KB':>10} {'saved':>7} {'plain':>8} {'typed':>8}")
+    for fname in REQ_FILES:
+        p = d / fname
+        if not p.exists():
+            continue
+        plain, plain_secs = timed(lambda: pd.read_csv(p), repeat)
+        typed, typed_secs = timed(lambda: read_csv(p, fname), repeat)
+        a, b = frame_bytes(plain), frame_bytes(typed)
+        totals = [totals[0] + a, totals[1] + b, totals[2] + plain_secs, totals[3] + typed_secs]
+        kept = 'all' if SCHEMAS[fname].cols is None else len(typed.columns)
+        print(f"  {fname:<20} {len(plain):>7} {a / 1024:>10.1f} {b / 1024:>10.1f} {1 - b / a:>7.0%} "
+              f"{plain_secs * 1000:>6.1f}ms {typed_secs * 1000:>6.1f}ms  columns {kept}/{len(plain.columns)}")
+    a, b = totals[:2]
+    print(f"  {'total':<20} {'':>7} {a / 1024:>10.1f} {b / 1024:>10.1f} {1 - b / a:>7.0%} "
+          f"{totals[2] * 1000:>6.1f}ms {totals[3] * 1000:>6.1f}ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory and parse time of the schema-driven loader per input file.")
+    parser.add_argument('dirs', type=Path, nargs='*', help="client folders to measure instead of synthetic ones")
+    parser.add_argument('-n', '--sizes', type=int, nargs='+', default=SIZES, help="holdings per synthetic portfolio")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="loads per file; the fastest is reported")
+    args = parser.parse_args(argv)
+
+    if args.dirs:
+        for d in args.dirs:
+            report(d, d.name, args.repeat)
+        return
+    with tempfile.TemporaryDirectory(prefix='reportiq_loading_') as tmp:
+        for n in args.sizes:
+            d = Path(tmp) / f"n{n}"
+            write_csvs(portfolio(n), d)
+            report(d, f"{n} holdings", args.repeat)
+
+if __name__ == '__main__':
+    main()
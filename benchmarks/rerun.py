@@ -0,0 +1,58 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.synth import equity_names, portfolio, split, write_csvs
+from utils.batch import file_list
+from utils.processing import ld_data, REQ_FILES
+from utils.report import create_portfolio_reports
+
+SIZES = [100, 1000]
+
+def edit_debt(d: Path):
+    # one corrected number, as operations would fix it
+    p = d / 'Debt.csv'
+    df = pd.read_csv(p)
+    df.loc[0, 'Market Value'] += 1
+    df.to_csv(p, index=False)
+
+def timed_run(d: Path, out: Path, watchlist, **kw) -> float:
+    files = file_list(sorted(d.glob('*.csv')))
+    start = time.perf_counter()
+    create_portfolio_reports(ld_data(files, REQ_FILES, out), out, 'report.pdf', static_cache=True,
+                             watchlist=watchlist, **kw)
+    return time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Full report runs against reruns that reuse cached pages.")
+    parser.add_argument('-n', '--sizes', type=int, nargs='+', default=SIZES, help="holdings per portfolio")
+    parser.add_argument('--direct', metavar='PAGES', help="as for batch.py")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='reportiq_rerun_') as tmp:
+        # a page cache of our own, so earlier runs on this machine don't count
+        os.environ['REPORTIQ_CACHE'] = str(Path(tmp) / 'cache')
+        for n in args.sizes:
+            d = Path(tmp) / f"n{n}"
+            write_csvs(portfolio(n), d / 'csv')
+            watchlist = frozenset(equity_names(split(n)['equity']))
+            run = lambda **kw: timed_run(d / 'csv', d, watchlist, direct=args.direct, **kw)
+
+            run()  # warm-up: imports, fonts and today's static pages
+            full = run()
+            rows = [('full', full), ('memo, first run', run(memo=True)), ('memo, unchanged', run(memo=True))]
+            edit_debt(d / 'csv')
+            rows.append(('memo, Debt edited', run(memo=True)))
+            print(f"{n:>6} holdings")
+            for label, secs in rows:
+                print(f"         {label:<20} {secs:7.2f}s {secs / full:7.0%}", flush=True)
+
+if __name__ == '__main__':
+    main()
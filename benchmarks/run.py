@@ -0,0 +1,218 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+
+from benchmarks.synth import equity_names, portfolio, split, write_csvs, write_xlsx
+from utils.batch import file_list
+from utils.ops import peak_rss_mb
+from utils.processing import ld_data, xl_to_csv, REQ_FILES
+from utils.report import PAGES, report_ctx
+
+SIZES = [10, 100, 1000, 10000]
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+class TimedPdf:
+    # PdfPages proxy that accumulates time spent in savefig, so page build
+    # and PDF writing can be reported separately
+    def __init__(self, pdf):
+        self.pdf = pdf
+        self.secs = 0.0
+
+    def savefig(self, *args, **kwargs):
+        start = time.perf_counter()
+        self.pdf.savefig(*args, **kwargs)
+        self.secs += time.perf_counter() - start
+
+    def __getattr__(self, name):
+        return getattr(self.pdf, name)
+
+def git_rev() -> str:
+    try:
+        out = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).resolve().parent,
+            capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def rss_mb() -> float:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        # no procfs: fall back to the process-wide high-water mark
+        return peak_rss_mb()
+
+def workers_rss_mb() -> float:
+    # combined resident memory of this process's children (sheet workers),
+    # read from procfs; 0 without it
+    try:
+        pids = [p for p in os.listdir('/proc') if p.isdigit()]
+    except OSError:
+        return 0.0
+    me, total = str(os.getpid()), 0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            if fields[1] == me:
+                with open(f'/proc/{pid}/statm') as f:
+                    total += int(f.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+    return total * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+class RssSampler:
+    # Polls resident memory on a background thread while a stage runs;
+    # unlike tracemalloc it does not slow the measured code down.
+    def __init__(self, interval=0.005, read=rss_mb):
+        self.interval = interval
+        self.read = read
+        self.peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.read())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self.read()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.read())
+
+def measure(fn, memory=True):
+    if not memory:
+        start = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - start, None
+
+    with RssSampler() as sampler:
+        start = time.perf_counter()
+        result = fn()
+        secs = time.perf_counter() - start
+    return result, secs, sampler.peak
+
+def bench_pages(ctx, path, memory=True):
+    rows = []
+    pdf = PdfPages(path)
+    try:
+        for key, build in PAGES:
+            timed = TimedPdf(pdf)
+            _, secs, peak = measure(lambda: build(timed, ctx), memory)
+            rows.append((f"page:{key}", secs - timed.secs, peak))
+            rows.append((f"pdf_write:{key}", timed.secs, None))
+    finally:
+        # PdfPages writes the trailer and cross-reference table on close
+        _, secs, _ = measure(pdf.close, False)
+    rows.append(("pdf_write:close", secs, None))
+    rows.append(("pdf_write", sum(r[1] for r in rows if r[0].startswith('pdf_write')), None))
+    return rows
+
+def bench_size(n, work, repeat=1, memory=True, seed=0):
+    data = portfolio(n, seed)
+    d = Path(work) / f"n{n}"
+    write_csvs(data, d / 'csv')
+    xlsx = write_xlsx(data, d / 'portfolio.xlsx')
+    files = file_list(sorted((d / 'csv').glob('*.csv')))
+    watchlist = frozenset(equity_names(split(n)['equity']))
+
+    stages = {}
+    def record(stage, secs, peak):
+        best = stages.setdefault(stage, {'secs': [], 'peak_rss_mb': None})
+        best['secs'].append(secs)
+        if peak is not None:
+            best['peak_rss_mb'] = max(best['peak_rss_mb'] or 0.0, peak)
+
+    for _ in range(repeat):
+        out = d / 'converted'
+        out.mkdir(exist_ok=True)
+        # the sheets are parsed in worker processes the main sampler does not
+        # see; a second one sums their resident memory at each poll
+        with RssSampler(0.05, workers_rss_mb) if memory else contextlib.nullcontext() as workers:
+            _, secs, peak = measure(lambda: xl_to_csv(str(xlsx), out, use_cache=False), memory)
+        record('xl_to_csv', secs, peak)
+        if memory:
+            record('xl_to_csv:workers', 0.0, workers.peak)
+
+        loaded, secs, peak = measure(lambda: ld_data(files, REQ_FILES, out), memory)
+        record('ld_data', secs, peak)
+
+        ctx, secs, peak = measure(lambda: report_ctx(loaded, watchlist), memory)
+        record('report_ctx', secs, peak)
+
+        for stage, secs, peak in bench_pages(ctx, d / 'report.pdf', memory):
+            record(stage, secs, peak)
+
+    return [
+        dict(holdings=n, stage=stage, secs=min(v['secs']), mean_secs=sum(v['secs']) / len(v['secs']),
+             peak_rss_mb=v['peak_rss_mb'], runs=len(v['secs']))
+        for stage, v in stages.items()
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time report generation on synthetic portfolios of increasing size.")
+    parser.add_argument('-n', '--sizes', type=int, nargs='+', default=SIZES, help="holdings per portfolio")
+    parser.add_argument('-r', '--repeat', type=int, default=1, help="runs per size; the fastest is reported")
+    parser.add_argument('-o', '--output', type=Path, help="results file (default: benchmarks/results/<rev>-<time>.json)")
+    parser.add_argument('--work-dir', type=Path, help="keep generated inputs and PDFs here instead of a temp dir")
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help="skip sampling peak resident memory per stage")
+    args = parser.parse_args(argv)
+
+    rev = git_rev()
+    started = time.strftime('%Y%m%d-%H%M%S')
+    out = args.output or RESULTS_DIR / f"{rev}-{started}.json"
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='reportiq_bench_') as tmp:
+        work = args.work_dir or Path(tmp)
+        for n in args.sizes:
+            rows = bench_size(n, work, args.repeat, args.memory)
+            results.extend(rows)
+            total = sum(r['secs'] for r in rows if r['stage'] in ('xl_to_csv', 'ld_data', 'report_ctx', 'pdf_write')
+                        or r['stage'].startswith('page:'))
+            print(f"{n:>6} holdings: {total:7.2f}s  peak RSS {peak_rss_mb():.0f} MB", flush=True)
+            for r in rows:
+                peak = f"{r['peak_rss_mb']:8.1f} MB" if r['peak_rss_mb'] is not None else ''
+                print(f"         {r['stage']:<24} {r['secs']:8.3f}s {peak}")
+
+    report = dict(
+        rev=rev,
+        started=started,
+        python=sys.version.split()[0],
+        platform=platform.platform(),
+        cpus=os.cpu_count(),
+        versions={'pandas': pd.__version__, 'matplotlib': matplotlib.__version__},
+        repeat=args.repeat,
+        memory=args.memory,
+        max_rss_mb=peak_rss_mb(),
+        results=results,
+    )
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"Wrote {out}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+import random
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from utils.holding import CLIENT_MARKER
+from utils.plotting import WATCHLIST
+
+NCOLS = 15
+
+EQUITY_COLS = [
+    'Instrument Name', 'Quantity', 'Purchase Price', 'Purchase Value', 'Market Price', 'Market Value',
+    'ST Qty', 'ST G/L', 'LT Qty', 'LT G/L', 'Unrealised Gain/Loss', 'Unrealised Gain/Loss %', 'ISIN'
+]
+MF_COLS = [
+    'Scheme Name', 'Units', 'Purchase NAV', 'Purchase Value', 'Current NAV', 'Market Value', 'ST Qty',
+    'ST G/L', 'LT Qty', 'LT G/L', 'Dividend', 'Unrealised GainLoss', 'Unrealised GainLoss Per', 'Asset Type'
+]
+FNO_COLS = [
+    'Instrument Name', 'B/S', 'Quantity', 'Rate', 'Value', 'Market Price', 'Market Value',
+    'UnrealisedGain/Loss', 'Unrealised Gain/Loss%'
+]
+EQUITY_CATS = ['Large Cap', 'Mid Cap', 'Small Cap', 'Flexi Cap']
+DEBT_CATS = ['Bonds', 'Liquid', 'Gilt', 'Corporate Debt']
+
+def _row(*vals) -> list:
+    return (list(vals) + [np.nan] * NCOLS)[:NCOLS]
+
+def _nums(rng: random.Random, n: int, lo: float = -1e4, hi: float = 1e5) -> list:
+    return [round(rng.uniform(lo, hi), 2) for _ in range(n)]
+
+def split(n: int) -> Dict[str, int]:
+    # roughly half direct equity, the rest mutual funds and FnO positions
+    n_eq = max(1, n // 2)
+    n_mf = max(2, (n - n_eq) * 3 // 5)
+    return {'equity': n_eq, 'mf': n_mf, 'fno': max(1, n - n_eq - n_mf)}
+
+def equity_names(n: int) -> List[str]:
+    return [WATCHLIST[i] if i < len(WATCHLIST) else f"Synthetic Co {i} Ltd" for i in range(n)]
+
+def holding(n_eq: int, n_mf: int, n_fno: int, ucid: str = 'UC000001', name: str = 'Synthetic Client',
+            seed: int = 0) -> pd.DataFrame:
+    rng = random.Random(seed)
+    rows = [_row('Holding Statement'), _row(CLIENT_MARKER, f"EQ000001/{ucid}/{name}"), _row()]
+
+    rows.append(_row('Asset Class', *[f"Col {i}" for i in range(1, NCOLS)]))
+    rows.append(_row('Equity', *_nums(rng, NCOLS - 1, 1e5, 1e7)))
+    rows.append(_row('Debt', *_nums(rng, NCOLS - 1, 1e5, 1e7)))
+    rows.append(_row('Total', *_nums(rng, NCOLS - 1, 1e5, 1e7)))
+    rows.append(_row())
+
+    rows.append(_row('Equity:-'))
+    rows.append(_row(*EQUITY_COLS))
+    for i, nm in enumerate(equity_names(n_eq)):
+        rows.append(_row(nm, *_nums(rng, 11), f"INE{i:06d}01"))
+    rows.append(_row('Total', *_nums(rng, 5)))
+    rows.append(_row())
+
+    rows.append(_row('Mutual Fund:-'))
+    rows.append(_row(*MF_COLS))
+    for i in range(n_mf):
+        rows.append(_row(f"Synthetic Scheme {i} - Growth", *_nums(rng, 12), ('Equity', 'Debt')[i % 2]))
+    rows += [_row('Total', *_nums(rng, 2)), _row(), _row(), _row()]
+
+    rows.append(_row('FnO:-'))
+    rows.append(_row(*FNO_COLS))
+    for i in range(n_fno):
+        rows.append(_row(f"NIFTY {i} FUT", rng.choice('BS'), *_nums(rng, 7)))
+    rows += [_row('Total', *_nums(rng, 2)), _row(), _row(), _row()]
+
+    rows.append(_row('Currency:-'))
+    rows.append(_row('Total'))
+    return pd.DataFrame(rows, columns=[f"Unnamed: {i}" for i in range(NCOLS)])
+
+def _positions(rng: random.Random, n: int, cats: List[str], kind: str) -> pd.DataFrame:
+    return pd.DataFrame({
+        'Type': kind,
+        'Category': [rng.choice(cats) for _ in range(n)],
+        'Quantity': [rng.randint(1, 1000) for _ in range(n)],
+        'Buy Price': _nums(rng, n, 1e3, 1e5),
+        'CMP': _nums(rng, n, 1e3, 1e5),
+        'PandL': _nums(rng, n, -1e4, 1e4),
+        'Market Value': _nums(rng, n, 1e3, 1e6),
+    })
+
+def portfolio(n: int, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    # one client's worth of report inputs keyed like ld_data's result
+    rng = random.Random(seed)
+    parts = split(n)
+    return {
+        'Portfolio Value': pd.DataFrame({
+            'Portfolio Component': ['Available Cash', 'Debt', 'Equity', 'Gold'],
+            'Portfolio Value': _nums(rng, 4, 1e5, 1e7),
+        }),
+        'Holding': holding(parts['equity'], parts['mf'], parts['fno'], seed=seed),
+        'XIRR': pd.DataFrame({'Scheme': [f"Scheme {i}" for i in range(parts['mf'])],
+                              'XIRR': _nums(rng, parts['mf'], -20, 40)}),
+        'Equity': _positions(rng, parts['equity'], EQUITY_CATS, 'Equity'),
+        'Debt': _positions(rng, max(1, parts['mf'] // 2), DEBT_CATS, 'Debt'),
+        'FNO': pd.DataFrame({'Instrument Name': [f"NIFTY {i} FUT" for i in range(parts['fno'])],
+                             'Market Value': _nums(rng, parts['fno'])}),
+        'Profits': pd.DataFrame({'Segment': ['Equity', 'Debt', 'FnO'], 'Realised': _nums(rng, 3)}),
+    }
+
+def write_csvs(data: Dict[str, pd.DataFrame], d: Path) -> List[Path]:
+    d = Path(d)
+    d.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for key, df in data.items():
+        p = d / f"{key}.csv"
+        if key == 'Holding':
+            # blank header row, as in the exported file, so columns load as 'Unnamed: N'
+            df.to_csv(p, index=False, header=[''] * df.shape[1])
+        else:
+            df.to_csv(p, index=False)
+        paths.append(p)
+    return paths
+
+def write_xlsx(data: Dict[str, pd.DataFrame], path: Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with pd.ExcelWriter(path, engine='openpyxl') as xw:
+        for key, df in data.items():
+            if key == 'Holding':
+                df.to_excel(xw, sheet_name=key, index=False, header=False, startrow=1)
+            else:
+                df.to_excel(xw, sheet_name=key, index=False)
+    return path
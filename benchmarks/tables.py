@@ -0,0 +1,64 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import io
+import random
+import time
+
+import matplotlib.pyplot as plt
+
+from utils.tables import grid_table
+
+ROWS = [20, 100, 500]
+COLUMNS = ['Instrument Name', 'Quantity', 'Purchase Price', 'Purchase Value', 'Market Price', 'Market Value',
+           'Unrealised Gain/Loss', 'Unrealised Gain/Loss %', 'ISIN']
+
+def cells(n, seed=0):
+    rng = random.Random(seed)
+    return [[f"Synthetic Co {i} Ltd"] + [f"{rng.uniform(-1e4, 1e5):.2f}" for _ in range(7)] + [f"INE{i:06d}01"]
+            for i in range(n)]
+
+def mpl_table(ax, rows):
+    table = ax.table(cellText=rows, colLabels=COLUMNS, cellLoc='center', loc='center', bbox=[0, 0, 1, 1])
+    table.auto_set_font_size(False)
+    table.set_fontsize(10)
+    table.auto_set_column_width(list(range(len(COLUMNS))))
+    for (row, col), cell in table._cells.items():
+        if row == 0:
+            cell.set_facecolor('#E6E6E6')
+            cell.set_text_props(weight='bold')
+        elif col in (6, 7) and cell.get_text().get_text().startswith('-'):
+            cell.get_text().set_color('red')
+
+def fast_table(ax, rows):
+    grid_table(ax, rows, COLUMNS,
+               style=lambda row, col, text: {'color': 'red'} if row and col in (6, 7) and text.startswith('-') else None)
+
+def bench(draw, rows, fmt):
+    fig = plt.figure(figsize=(11.7, max(8.3, len(rows) * 0.16)))
+    ax = fig.add_axes([0.03, 0.02, 0.94, 0.96])
+    ax.axis('off')
+    start = time.perf_counter()
+    draw(ax, rows)
+    build = time.perf_counter() - start
+    fig.savefig(io.BytesIO(), format=fmt, bbox_inches='tight')
+    total = time.perf_counter() - start
+    plt.close(fig)
+    return build, total
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare ax.table with the grid_table renderer.")
+    parser.add_argument('-n', '--rows', type=int, nargs='+', default=ROWS, help="table rows")
+    parser.add_argument('-f', '--format', default='pdf', help="output format passed to savefig")
+    args = parser.parse_args(argv)
+
+    for n in args.rows:
+        rows = cells(n)
+        old = bench(mpl_table, rows, args.format)
+        new = bench(fast_table, rows, args.format)
+        print(f"{n:>5} rows  build {old[0]:7.3f}s -> {new[0]:7.3f}s ({old[0] / new[0]:5.1f}x)"
+              f"  {args.format} {old[1]:7.3f}s -> {new[1]:7.3f}s ({old[1] / new[1]:5.1f}x)", flush=True)
+
+if __name__ == '__main__':
+    main()
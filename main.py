@@ -1,11 +1,50 @@
+import time
+START = time.perf_counter()
+
+import argparse
+import sys
 import tkinter as tk
 from ui.ui import DragDropUploadUI
 
+HEAVY = ('numpy', 'pandas', 'matplotlib', 'openpyxl')
+
+
+def startup_time():
+    # time to a drawn window from the top of this module, which modules it
+    # cost, and how long the background import of the report stack takes
+    imported = time.perf_counter() - START
+    root = tk.Tk()
+    app = DragDropUploadUI(root, prewarm=False)
+    root.update()
+    window = time.perf_counter() - START
+    loaded = [m for m in HEAVY if m in sys.modules]
+
+    start = time.perf_counter()
+    app.prewarm().join()
+    stack = time.perf_counter() - start
+    root.destroy()
+
+    print(f"imports   {imported:6.3f}s")
+    print(f"window    {window:6.3f}s")
+    print(f"stack     {stack:6.3f}s  (background, after the window)")
+    print(f"heavy modules before the window: {', '.join(loaded) or 'none'}")
+    return 1 if loaded else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ReportIQ desktop app.")
+    parser.add_argument(
+        '--startup-time', action='store_true',
+        help="open the window, print how long start-up took and exit (non-zero if the "
+             "scientific stack was imported before the window appeared)"
+    )
+    args = parser.parse_args(argv)
+    if args.startup_time:
+        return startup_time()
 
-def main():
     root = tk.Tk()
     app = DragDropUploadUI(root)
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import argparse
+import os
+import signal
+import sys
+from pathlib import Path
+from utils.batch import add_render_args, render_opts
+from utils.serve import QUEUE_MAX, JobQueue, make_server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run a report service: warm worker processes that take jobs over local HTTP."
+    )
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port (default: 8765)")
+    parser.add_argument('--socket', type=Path, help="listen on this Unix socket path instead of TCP")
+    parser.add_argument(
+        '-o', '--output', type=Path,
+        default=Path.home() / "Desktop" / "portfolio_reports",
+        help="directory for the generated PDFs unless a job names its own"
+    )
+    parser.add_argument(
+        '-w', '--workers', type=int, default=os.cpu_count(),
+        help="number of worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        '-q', '--queue', type=int, default=QUEUE_MAX,
+        help="jobs that may wait beyond those running before submissions get 503; same as REPORTIQ_SERVE_QUEUE"
+    )
+    add_render_args(parser)
+    args = parser.parse_args(argv)
+    opts = render_opts(parser, args)
+
+    jobs = JobQueue(args.output, args.workers, opts, args.queue)
+    server = make_server(jobs, args.host, args.port, args.socket)
+    where = args.socket or f"http://{args.host}:{args.port}"
+    print(f"Serving reports on {where} with {jobs.workers} warm workers", flush=True)
+    # stop cleanly on a service manager's SIGTERM as well as ^C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        jobs.close()
+        if args.socket:
+            args.socket.unlink(missing_ok=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
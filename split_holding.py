@@ -0,0 +1,73 @@
+import argparse
+import sys
+from pathlib import Path
+from utils.split import build_index, client_bytes, client_inputs, link_inputs, load_index, save_index, split_holding
+from utils.ops import safe_name
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Split a multi-client Holding export into one folder per client, as batch.py expects."
+    )
+    parser.add_argument('export', type=Path, help="Holding CSV export covering many clients")
+    parser.add_argument(
+        '-o', '--output', type=Path,
+        help="directory for the per-client folders (default: <export name>_clients next to the export)"
+    )
+    parser.add_argument(
+        '--inputs', type=Path, metavar='DIR',
+        help="directory with a sub-folder per client, named by UCID, holding that client's other input files; "
+             "they are linked next to each split Holding.csv so the output can go straight to batch.py"
+    )
+    parser.add_argument(
+        '--client', action='append', metavar='UCID',
+        help="only extract this client, seeking straight to it with the saved index; repeatable"
+    )
+    parser.add_argument(
+        '--index-only', action='store_true',
+        help="only (re)build the byte-offset index next to the export"
+    )
+    args = parser.parse_args(argv)
+    out = args.output or args.export.with_name(f"{args.export.stem}_clients")
+    missing = []
+
+    def add_inputs(ucid):
+        if args.inputs is None:
+            return ''
+        src = client_inputs(args.inputs, ucid)
+        if src is None:
+            missing.append(ucid)
+            return ', no other inputs'
+        return f", {len(link_inputs(out / safe_name(ucid), src))} other inputs linked"
+
+    try:
+        if args.index_only:
+            idx = build_index(args.export)
+            print(f"Indexed {len(idx.clients)} clients -> {save_index(idx)}")
+        elif args.client:
+            idx = load_index(args.export)
+            for ucid in args.client:
+                d = out / safe_name(ucid)
+                d.mkdir(parents=True, exist_ok=True)
+                (d / 'Holding.csv').write_bytes(client_bytes(args.export, ucid, idx))
+                print(f"{ucid}: {d / 'Holding.csv'}{add_inputs(ucid)}")
+        else:
+            n = 0
+            for ucid, df in split_holding(args.export, out):
+                n += 1
+                print(f"{ucid}: {len(df)} rows{add_inputs(ucid)}")
+            print(f"Split {n} clients into {out}")
+    except KeyError as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if missing:
+        print(f"Warning: no folder under {args.inputs} for {len(missing)} clients ({', '.join(missing)}); "
+              f"batch.py will report them as missing files", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
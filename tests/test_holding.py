@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from benchmarks.synth import portfolio, write_csvs
+from utils.holding import parse_holding
+from utils.schema import read_csv
+
+# The row-by-row parsing the report pages did before parse_holding.
+
+def base_equity_rows(df):
+    rows, in_section = [], False
+    for idx, row in df.iterrows():
+        if isinstance(row['Unnamed: 0'], str) and 'Equity' in row['Unnamed: 0']:
+            in_section = True
+            continue
+        if in_section and isinstance(row['Unnamed: 0'], str):
+            rows.append(idx)
+        if in_section and isinstance(row['Unnamed: 0'], str) and 'Total' in row['Unnamed: 0']:
+            in_section = False
+    return rows
+
+def base_section(df, start, end):
+    s = df[df.iloc[:, 0] == start].index[0]
+    e = df[df.iloc[:, 0] == end].index[0]
+    data = df.iloc[s + 1:e - 4].copy()
+    data.columns = data.iloc[0]
+    data = data.iloc[1:]
+    return data.reset_index(drop=True)
+
+def base_mf(df, drop):
+    data = base_section(df, 'Mutual Fund:-', 'FnO:-')
+    return data[~data['Asset Type'].isin([drop]) & ~data['Asset Type'].isna()]
+
+def odd_holding() -> pd.DataFrame:
+    # a second direct-equity block, a blank and an 'Equity Total' row inside
+    # it, and an untyped mutual fund
+    df = portfolio(40, seed=3)['Holding']
+    names = df['Unnamed: 0']
+    eq = int(np.flatnonzero(names == 'Equity:-')[0])
+    blank = pd.DataFrame([[np.nan] * df.shape[1]], columns=df.columns)
+    extra = df.iloc[eq:eq + 4].copy()
+    extra.iloc[3, 0] = 'Equity Total'
+    df = pd.concat([df.iloc[:eq + 3], blank, df.iloc[eq + 3:eq + 6], extra, df.iloc[eq + 6:]], ignore_index=True)
+    mf = int(np.flatnonzero(df['Unnamed: 0'] == 'Mutual Fund:-')[0])
+    df.iloc[mf + 3, list(df.columns).index('Unnamed: 13')] = np.nan
+    return df
+
+class ParseHoldingTest(unittest.TestCase):
+    def check(self, df):
+        doc = parse_holding(df)
+        names = df['Unnamed: 0']
+        ours = [int(i) for i in doc.equity_rows if isinstance(names.iat[i], str)]
+        self.assertEqual(ours, base_equity_rows(df))
+        assert_frame_equal(doc.mf_equity, base_mf(df, 'Debt'))
+        assert_frame_equal(doc.mf_debt, base_mf(df, 'Equity'))
+        assert_frame_equal(doc.fno, base_section(df, 'FnO:-', 'Currency:-'))
+
+    def test_synthetic_exports(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for n in (3, 25, 400):
+                with self.subTest(n=n):
+                    p = write_csvs({'Holding': portfolio(n, seed=n)['Holding']}, Path(tmp) / str(n))[0]
+                    self.check(read_csv(p, 'Holding.csv'))
+
+    def test_odd_layout(self):
+        self.check(odd_holding())
+
+if __name__ == '__main__':
+    unittest.main()
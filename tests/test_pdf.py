@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from pypdf import PdfReader
+
+from benchmarks.synth import portfolio, write_csvs
+from utils.pdf import _img_key
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def images(clients: Path, out: Path, cache: Path, *args):
+    # (image objects, distinct image contents) in the one report written
+    env = dict(os.environ, REPORTIQ_CACHE=str(cache))
+    subprocess.run([sys.executable, 'batch.py', str(clients), '-o', str(out), '-w', '1', *args],
+                   cwd=ROOT, env=env, check=True, capture_output=True)
+    refs, keys = set(), set()
+    for page in PdfReader(str(next(out.glob('*.pdf')))).pages:
+        xo = page['/Resources'].get('/XObject')
+        for ref in (xo.get_object().values() if xo else ()):
+            img = ref.get_object()
+            if img.get('/Subtype') == '/Image':
+                refs.add(ref.idnum)
+                keys.add(_img_key(img))
+    return len(refs), keys
+
+class MergedImagesTest(unittest.TestCase):
+    def test_image_count_across_modes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            write_csvs(portfolio(20), tmp / 'clients' / 'c1')
+            _, seq = images(tmp / 'clients', tmp / 'seq', tmp / 'cache', '--no-static-cache')
+            modes = [('static', ()), ('parallel', ('-p', '4')), ('memo', ('--memo',)), ('memo rerun', ('--memo',))]
+            for label, args in modes:
+                with self.subTest(label):
+                    n, keys = images(tmp / 'clients', tmp / label.replace(' ', '_'), tmp / 'cache', *args)
+                    self.assertEqual(n, len(keys))
+                    self.assertEqual(keys, seq)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils.plotting import WATCHLIST, ld_watchlist
+
+class WatchlistTest(unittest.TestCase):
+    def test_env_and_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            p = Path(tmp) / 'watch.txt'
+            p.write_text("# names\nAlpha Ltd\n")
+            with mock.patch.dict(os.environ, {'REPORTIQ_WATCHLIST': str(p)}):
+                self.assertEqual(ld_watchlist(), {'Alpha Ltd'})
+                p.write_text("Alpha Ltd\nBeta Ltd\n")
+                os.utime(p, ns=(p.stat().st_atime_ns, p.stat().st_mtime_ns + 10 ** 9))
+                self.assertEqual(ld_watchlist(), {'Alpha Ltd', 'Beta Ltd'})
+            with mock.patch.dict(os.environ, {'REPORTIQ_WATCHLIST': ''}):
+                self.assertEqual(ld_watchlist(), frozenset(WATCHLIST))
+
+if __name__ == '__main__':
+    unittest.main()
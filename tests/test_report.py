@@ -0,0 +1,24 @@
+import os
+import unittest
+from unittest import mock
+
+from utils import report
+
+class PageDigestTest(unittest.TestCase):
+    def digests(self, **env):
+        with mock.patch.dict(os.environ, env):
+            return report.page_digests(list(report.PAGE_INPUTS), {})
+
+    def test_digest_follows_table_rows(self):
+        base = self.digests(REPORTIQ_LAYOUT='fixed')
+        with mock.patch.object(report, 'ROWS_PER_PAGE', report.ROWS_PER_PAGE + 1):
+            rows = self.digests(REPORTIQ_LAYOUT='fixed')
+        self.assertEqual(base, self.digests(REPORTIQ_LAYOUT='fixed'))
+        self.assertTrue(all(rows[k] != base[k] for k in base))
+
+    def test_digest_follows_layout(self):
+        fixed, tight = self.digests(REPORTIQ_LAYOUT='fixed'), self.digests(REPORTIQ_LAYOUT='tight')
+        self.assertTrue(all(fixed[k] != tight[k] for k in fixed))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import http.client
+import json
+import os
+import signal
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from benchmarks.synth import portfolio, write_csvs
+from utils.serve import JobQueue, make_server
+
+def request(port, method, path, body=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        conn.request(method, path, body and json.dumps(body))
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read() or b'null')
+    finally:
+        conn.close()
+
+def wait_for(cond, secs=60):
+    end = time.time() + secs
+    while time.time() < end:
+        if cond():
+            return True
+        time.sleep(0.05)
+    return False
+
+class DeleteTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.jobs = JobQueue(cls.tmp.name, workers=1)
+        cls.server = make_server(cls.jobs, port=0)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.jobs.close()
+        cls.tmp.cleanup()
+
+    def delete(self, path):
+        conn = http.client.HTTPConnection('127.0.0.1', self.server.server_port, timeout=5)
+        try:
+            conn.request('DELETE', path)
+            resp = conn.getresponse()
+            return resp.status, resp.read()
+        finally:
+            conn.close()
+
+    def test_bad_path(self):
+        for path in ('/jobs', '/other', '/jobs/x/pdf'):
+            status, _ = self.delete(path)
+            self.assertEqual(status, 404, path)
+
+    def test_unknown_job(self):
+        status, body = self.delete('/jobs/nope')
+        self.assertEqual(status, 404)
+        self.assertIn(b'no such job', body)
+
+class WorkerDeathTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        tmp = Path(self.tmp.name)
+        os.environ['REPORTIQ_CACHE'] = str(tmp / 'cache')
+        self.client = tmp / 'c1'
+        write_csvs(portfolio(20), self.client)
+        self.jobs = JobQueue(tmp / 'out', workers=1)
+        self.server = make_server(self.jobs, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.jobs.close()
+        os.environ.pop('REPORTIQ_CACHE', None)
+        self.tmp.cleanup()
+
+    def kill_worker(self):
+        for pid in list(self.jobs.pool._processes):
+            os.kill(pid, signal.SIGKILL)
+
+    def run_job(self):
+        status, info = request(self.server.server_port, 'POST', '/jobs', {'client_dir': str(self.client)})
+        self.assertEqual(status, 202)
+        done = lambda: request(self.server.server_port, 'GET', f"/jobs/{info['id']}")[1]['finished']
+        self.assertTrue(wait_for(done))
+        return request(self.server.server_port, 'GET', f"/jobs/{info['id']}")[1]
+
+    def test_idle_worker_killed(self):
+        pool = self.jobs.pool
+        self.kill_worker()
+        self.assertTrue(wait_for(lambda: pool._broken))
+        self.assertEqual(self.run_job()['status'], 'done')
+
+    def test_running_worker_killed(self):
+        status, info = request(self.server.server_port, 'POST', '/jobs', {'client_dir': str(self.client)})
+        self.assertEqual(status, 202)
+        self.kill_worker()
+        get = lambda: request(self.server.server_port, 'GET', f"/jobs/{info['id']}")[1]
+        self.assertTrue(wait_for(lambda: get()['finished']))
+        self.assertEqual(get()['status'], 'failed')
+        self.assertIn('worker process died', get()['error'])
+        self.assertEqual(self.run_job()['status'], 'done')
+
+if __name__ == '__main__':
+    unittest.main()
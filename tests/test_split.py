@@ -0,0 +1,43 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from benchmarks.synth import holding
+from utils.split import build_index, read_client, split_holding
+
+def client_csv(ucid: str, seed: int) -> bytes:
+    # one client's Holding export as written on its own, with CRLF line
+    # ends and instrument names that need quoting
+    df = holding(3 + seed, 4, 2, ucid=ucid, name=f'Client {seed}', seed=seed)
+    names = df['Unnamed: 0'].astype(object)
+    odd = names.str.startswith('Synthetic Scheme', na=False)
+    df.loc[odd, 'Unnamed: 0'] = names[odd] + ', Direct Plan "G"'
+    return df.to_csv(index=False, header=[''] * df.shape[1], lineterminator='\r\n').encode()
+
+class SplitRoundTripTest(unittest.TestCase):
+    def test_every_client_round_trips(self):
+        clients = {f'UC{i:03d}': client_csv(f'UC{i:03d}', i) for i in range(5)}
+        # one export: the header line once, then each client's rows
+        head = next(iter(clients.values())).split(b'\r\n', 1)[0] + b'\r\n'
+        export = head + b''.join(data[len(head):] for data in clients.values())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'Holding.csv'
+            path.write_bytes(export)
+            split = dict(split_holding(path, Path(tmp) / 'out'))
+            idx = build_index(path)
+            self.assertEqual(list(split), list(clients))
+            for ucid, data in clients.items():
+                with self.subTest(ucid):
+                    self.assertEqual((Path(tmp) / 'out' / ucid / 'Holding.csv').read_bytes(), data)
+                    expected = pd.read_csv(io.BytesIO(data))
+                    self.assertTrue(expected.iloc[:, 0].str.contains(', Direct Plan "G"', regex=False).any())
+                    assert_frame_equal(split[ucid], expected)
+                    assert_frame_equal(read_client(path, ucid, idx), expected)
+
+if __name__ == '__main__':
+    unittest.main()
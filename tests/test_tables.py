@@ -0,0 +1,28 @@
+import os
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from utils.tables import _table_rows, paginate
+
+class TableRowsTest(unittest.TestCase):
+    def rows(self, value):
+        with mock.patch.dict(os.environ, {'REPORTIQ_TABLE_ROWS': value}):
+            return _table_rows()
+
+    def test_setting(self):
+        self.assertEqual(self.rows(''), 20)
+        self.assertEqual(self.rows('35'), 35)
+        self.assertEqual(self.rows('0'), 1)
+        self.assertEqual(self.rows('-3'), 1)
+        with self.assertRaisesRegex(ValueError, 'REPORTIQ_TABLE_ROWS'):
+            self.rows('twenty')
+
+    def test_one_row_pages(self):
+        df = pd.DataFrame({'Name': list('abc'), 'Value': [1, 2, 3]})
+        pages = paginate(df, ['Name', 'Value'], ['Value'], rows=self.rows('0'))
+        self.assertEqual([len(p.rows) for p in pages], [1, 1, 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks.synth import portfolio, write_csvs
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def page_spans(clients: Path, out: Path, *args) -> dict:
+    trace = out / 'trace.jsonl'
+    env = dict(os.environ, REPORTIQ_CACHE=str(out / 'cache'))
+    subprocess.run([sys.executable, 'batch.py', str(clients), '-o', str(out), '-w', '1', '--trace', str(trace),
+                    *args], cwd=ROOT, env=env, check=True, capture_output=True)
+    counts = {}
+    for line in trace.read_text().splitlines():
+        stage = json.loads(line)['stage']
+        counts[stage] = counts.get(stage, 0) + 1
+    return counts
+
+class PageWorkerTraceTest(unittest.TestCase):
+    def test_page_spans_with_page_workers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            write_csvs(portfolio(20), tmp / 'clients' / 'c1')
+            seq = page_spans(tmp / 'clients', tmp / 'seq', '--no-static-cache')
+            par = page_spans(tmp / 'clients', tmp / 'par', '--no-static-cache', '-p', '2')
+            self.assertGreater(seq.get('page', 0), 0)
+            self.assertEqual(par.get('page'), seq['page'])
+            self.assertEqual(par.get('savefig'), seq['savefig'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,30 @@
+import os
 import tkinter as tk
-import pandas as pd
 from tkinter import ttk, messagebox
 from pathlib import Path
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Tuple
+import queue
 import threading
-from utils.ops import brw_files, val_file, sim_up
-from utils.processing import ld_data, chk_files, xl_to_csv
-from utils.report import create_portfolio_reports
+from multiprocessing import Manager
+from utils.ops import brw_files, chk_files, val_file, poll_q, REQ_FILES, XL_EXTS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# ms after the window is up to start importing the report stack in the
+# background; negative leaves it to the first Convert/Generate
+PREWARM_MS = int(os.environ.get('REPORTIQ_PREWARM_MS', 300))
+
+def load_stack():
+    # pandas, matplotlib and the report modules, kept out of start-up so the
+    # window appears with little more than tkinter loaded
+    import matplotlib
+    matplotlib.use('Agg')
+    from utils import processing, report
+    return processing, report
 
 class DragDropUploadUI:
-    def __init__(self, root):
+    def __init__(self, root, prewarm: bool = True):
         self.root = root
         self.root.title("ReportIQ")
         self.root.geometry("600x400")
@@ -17,17 +32,25 @@ class DragDropUploadUI:
             'Excel files': ('*.xlsx', '*.xls', '*.xlsm'),
             'CSV files': ('*.csv',)
         }
-        self.required_files = [
-            'Portfolio Value.csv', 'Holding.csv', 'XIRR.csv', 
-            'Equity.csv', 'Debt.csv', 'FNO.csv', 'Profits.csv'
-        ]
+        self.required_files = list(REQ_FILES)
         self.files_to_upload: List[Tuple[str, int, str]] = []
+        self.progress_bars: List[ttk.Progressbar] = []
+        # converted frames of each uploaded file, keyed by its path
+        self.frames: Dict[str, Dict[str, 'pd.DataFrame']] = {}
+        self.export_csv = tk.BooleanVar(master=self.root, value=False)
         self.desktop_path = Path.home() / "Desktop"
         self.output_dir = self.desktop_path / "converted_files"
         self.output_dir.mkdir(exist_ok=True)
         self.portfolio_dir = self.desktop_path / "portfolio_reports"
         self.portfolio_dir.mkdir(exist_ok=True)
         self.setup_ui()
+        if prewarm and PREWARM_MS >= 0:
+            self.root.after(PREWARM_MS, self.prewarm)
+
+    def prewarm(self) -> threading.Thread:
+        thread = threading.Thread(target=load_stack, daemon=True)
+        thread.start()
+        return thread
 
     def setup_ui(self):
         self.main_container = ttk.Frame(self.root, padding="20")
@@ -96,6 +119,13 @@ class DragDropUploadUI:
         )
         self.generate_btn.pack(side=tk.LEFT, padx=5)
 
+        export_chk = ttk.Checkbutton(
+            button_frame,
+            text="Also save converted CSVs",
+            variable=self.export_csv
+        )
+        export_chk.pack(side=tk.LEFT, padx=5)
+
     def browse_files(self):
         files = brw_files(self.root, self.accepted_types)
         if files:
@@ -143,9 +173,8 @@ class DragDropUploadUI:
             cancel_btn.pack(side=tk.RIGHT, padx=5)
             
             self.files_to_upload.append((filename, size, file))
+            self.progress_bars.append(progress)
             self.update_counter()
-            
-            sim_up(progress, self.root)
         
         button_state = 'normal' if self.files_to_upload else 'disabled'
         self.convert_btn['state'] = button_state
@@ -153,7 +182,10 @@ class DragDropUploadUI:
 
     def remove_file(self, file_frame):
         index = list(self.files_frame.children.values()).index(file_frame)
-        self.files_to_upload.pop(index)
+        _, _, path = self.files_to_upload.pop(index)
+        self.progress_bars.pop(index)
+        if all(p != path for _, _, p in self.files_to_upload):
+            self.frames.pop(path, None)
         file_frame.destroy()
         self.update_counter()
         button_state = 'normal' if self.files_to_upload else 'disabled'
@@ -169,31 +201,67 @@ class DragDropUploadUI:
         self.convert_btn['state'] = 'disabled'
         self.generate_btn['state'] = 'disabled'
         
+        export = self.export_csv.get()
+        files = list(self.files_to_upload)
+        bars = list(self.progress_bars)
+        for bar in bars:
+            bar.configure(value=0, maximum=1)
+
+        manager = Manager()
+        prog_q = manager.Queue()
+        done_q = queue.Queue()
+        errors = []
+        finished = set()
+
         def conversion_thread():
-            converted_files = []
-            for filename, _, file_path in self.files_to_upload:
-                try:
-                    if file_path.lower().endswith(('.xlsx', '.xls', '.xlsm')):
-                        converted = xl_to_csv(file_path, self.output_dir)
-                        converted_files.extend(converted)
-                    else:
-                        output_path = self.output_dir / filename
-                        pd.read_csv(file_path).to_csv(output_path, index=False)
-                        converted_files.append(filename)
-                        
-                except Exception as e:
-                    messagebox.showerror("Error", f"Error processing {filename}: {str(e)}")
-                    continue
-            
-            messagebox.showinfo("Success", "Files have been processed successfully!")
-            self.convert_btn['state'] = 'normal'
-            self.generate_btn['state'] = 'normal'
+            try:
+                processing, _ = load_stack()
+                for i, frames, err in processing.conv_files(files, self.required_files, prog_q):
+                    if export and not err and files[i][2].lower().endswith(XL_EXTS):
+                        processing.exp_csv(frames, self.output_dir)
+                    done_q.put(('result', i, frames, err))
+            except Exception as e:
+                done_q.put(('result', None, {}, e))
+            done_q.put(('finished',))
+
+        def handle(msg):
+            if msg[0] == 'finished':
+                manager.shutdown()
+                if errors:
+                    messagebox.showerror("Error", "\n".join(errors))
+                else:
+                    messagebox.showinfo("Success", "Files have been processed successfully!")
+                self.convert_btn['state'] = 'normal'
+                self.generate_btn['state'] = 'normal'
+                return False
 
-        thread = threading.Thread(target=conversion_thread)
+            if msg[0] == 'result':
+                _, i, frames, err = msg
+                # a file removed while it converted keeps no frames
+                if i is not None and any(p == files[i][2] for _, _, p in self.files_to_upload):
+                    self.frames[files[i][2]] = frames
+                finished.add(i)
+                if err:
+                    name = files[i][0] if i is not None else "files"
+                    errors.append(f"Error processing {name}: {str(err)}")
+                if i is not None and bars[i].winfo_exists():
+                    bars[i]['value'] = bars[i]['maximum']
+                return
+
+            i, kind, n = msg
+            if i in finished or not bars[i].winfo_exists():
+                return
+            if kind == 'total':
+                bars[i].configure(maximum=max(n, 1), value=0)
+            else:
+                bars[i]['value'] = min(bars[i]['value'] + n, bars[i]['maximum'])
+
+        thread = threading.Thread(target=conversion_thread, daemon=True)
         thread.start()
+        poll_q(self.root, [prog_q, done_q], handle)
 
     def generate_files(self):
-        if not chk_files(self.files_to_upload, self.required_files, self.output_dir):
+        if not chk_files(self.files_to_upload, self.required_files, self.output_dir, self.frames):
             return
 
         self.generate_btn['state'] = 'disabled'
@@ -205,46 +273,74 @@ class DragDropUploadUI:
         progress_window.transient(self.root)
     
         progress_label = ttk.Label(progress_window, text="Generating portfolio reports...")
-        progress_label.pack(pady=20)
+        progress_label.pack(pady=(20, 10))
     
-        progress_bar = ttk.Progressbar(progress_window, mode='indeterminate')
-        progress_bar.pack(pady=10, padx=20, fill=tk.X)
-        progress_bar.start()
+        # the page count arrives with the first progress event
+        progress_bar = ttk.Progressbar(progress_window, mode='determinate', maximum=1)
+        progress_bar.pack(pady=5, padx=20, fill=tk.X)
+
+        cancel = threading.Event()
+        events = queue.Queue()
+
+        def cancel_job():
+            cancel.set()
+            cancel_btn['state'] = 'disabled'
+            progress_label.configure(text="Cancelling...")
+
+        cancel_btn = ttk.Button(progress_window, text="Cancel", command=cancel_job)
+        cancel_btn.pack(pady=10)
+        progress_window.protocol("WM_DELETE_WINDOW", cancel_job)
 
         def generation_thread():
             try:
-                data = ld_data(self.files_to_upload, self.required_files, self.output_dir)
-                if not data:
-                    progress_window.destroy()
-                    return
-
-                self.root.after(0, lambda: self.create_reports_on_main_thread(data, progress_window))
-            
+                processing, report = load_stack()
             except Exception as e:
-                def error_handler():
-                    progress_window.destroy()
-                    messagebox.showerror("Error", f"Error generating reports: {str(e)}")
-                    self.reset_interface()
-            
-                self.root.after(0, error_handler)
+                events.put(('error', e))
+                return
+            try:
+                frames = {k: v for converted in self.frames.values() for k, v in converted.items()}
+                data = processing.rd_data(self.files_to_upload, self.required_files, self.output_dir, frames)
+                path = report.create_portfolio_reports(
+                    data, self.portfolio_dir,
+                    progress=lambda done, total, key: events.put(('page', done, total)),
+                    cancel=cancel,
+                )
+                events.put(('done', path))
+            except report.ReportCancelled:
+                events.put(('cancelled',))
+            except Exception as e:
+                events.put(('error', e))
 
-        thread = threading.Thread(target=generation_thread)
-        thread.start()
+        def handle(msg):
+            if msg[0] == 'page':
+                _, done, total = msg
+                progress_bar.configure(value=done, maximum=total)
+                if not cancel.is_set():
+                    progress_label.configure(text=f"Rendering page {done}/{total}")
+                return
 
-    def create_reports_on_main_thread(self, data, progress_window):
-        try:
-            create_portfolio_reports(data, self.portfolio_dir)
             progress_window.destroy()
-            messagebox.showinfo(
-                "Success", 
-                f"Portfolio reports have been generated successfully in the '{self.portfolio_dir}' directory."
-            )
-            self.reset_interface()
-        except Exception as e:
-            messagebox.showerror("Error", f"Error generating reports: {str(e)}")
-            self.reset_interface()
+            if msg[0] == 'done':
+                messagebox.showinfo(
+                    "Success", 
+                    f"Portfolio reports have been generated successfully in the '{self.portfolio_dir}' directory."
+                )
+                self.reset_interface()
+            elif msg[0] == 'cancelled':
+                self.convert_btn['state'] = 'normal'
+                self.generate_btn['state'] = 'normal'
+            else:
+                messagebox.showerror("Error", f"Error generating reports: {str(msg[1])}")
+                self.reset_interface()
+            return False
+
+        thread = threading.Thread(target=generation_thread, daemon=True)
+        thread.start()
+        poll_q(self.root, [events], handle)
 
     def reset_interface(self):
         self.files_to_upload = []
+        self.progress_bars = []
+        self.frames = {}
         self.create_upload_interface()
         self.root.update()
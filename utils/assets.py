@@ -0,0 +1,50 @@
+import threading
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+from PIL import Image
+
+ASSET_DIR = Path(__file__).resolve().parent.parent
+IMG_DPI = 200
+
+_imgs = {}
+_stats = {'hits': 0, 'misses': 0}
+_lock = threading.Lock()
+
+def asset_path(name: str) -> Path:
+    return ASSET_DIR / name
+
+def _decode(name: str, box: Tuple[float, float], dpi: int) -> np.ndarray:
+    with Image.open(asset_path(name)) as im:
+        im = im.convert('RGBA')
+        if box:
+            scale = min(box[0] * dpi / im.width, box[1] * dpi / im.height)
+            if scale < 1:
+                size = (max(1, round(im.width * scale)), max(1, round(im.height * scale)))
+                im = im.resize(size, Image.LANCZOS)
+        img = np.array(im)
+    img.setflags(write=False)
+    return img
+
+def get_img(name: str, box: Tuple[float, float] = None, dpi: int = IMG_DPI) -> np.ndarray:
+    key = (name, box, dpi)
+    with _lock:
+        img = _imgs.get(key)
+        if img is not None:
+            _stats['hits'] += 1
+            return img
+        _stats['misses'] += 1
+
+    img = _decode(name, box, dpi)
+    with _lock:
+        return _imgs.setdefault(key, img)
+
+def asset_stats() -> dict:
+    with _lock:
+        return dict(_stats, cached=len(_imgs))
+
+def clr_assets() -> None:
+    with _lock:
+        _imgs.clear()
+        _stats.update(hits=0, misses=0)
@@ -0,0 +1,135 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Tuple
+
+from utils.ops import safe_name, val_file
+from utils.plotting import ld_watchlist
+from utils.processing import rd_data, rd_frames, REQ_FILES
+from utils.report import LAYOUT_ENV, create_portfolio_reports, direct_keys, get_customer_details
+from utils.trace import PROFILE_ENV, TRACE_ENV, span, tag, traced_run
+
+def add_render_args(parser) -> None:
+    # how each report is drawn; shared by batch.py and serve.py
+    parser.add_argument(
+        '-p', '--page-workers', type=int, default=0,
+        help="render the pages of each report in this many processes and merge them (needs pypdf)"
+    )
+    parser.add_argument(
+        '--no-static-cache', dest='static_cache', action='store_false',
+        help="render the cover, benchmark and notes pages for every client instead of reusing today's cached copy"
+    )
+    parser.add_argument(
+        '--watchlist', type=Path,
+        help="text file with one instrument name per line for the direct equity page"
+    )
+    parser.add_argument(
+        '--direct', metavar='PAGES',
+        help="write these table pages (comma-separated keys or 'all') with the direct PDF writer; "
+             "same as REPORTIQ_DIRECT"
+    )
+    parser.add_argument(
+        '--memo', action='store_true',
+        help="reuse data pages whose inputs are unchanged since an earlier run today instead of drawing "
+             "them again (needs pypdf); same as REPORTIQ_MEMO=1"
+    )
+    parser.add_argument(
+        '--layout', choices=['fixed', 'tight'],
+        help="'fixed' draws data pages once on their fixed canvas (default); 'tight' measures them with "
+             "bbox_inches='tight' first; same as REPORTIQ_LAYOUT"
+    )
+    parser.add_argument(
+        '--trace', metavar='FILE',
+        help="append per-stage timings as JSON lines to FILE ('-' for stderr); same as REPORTIQ_TRACE"
+    )
+    parser.add_argument(
+        '--profile', type=int, metavar='N',
+        help="profile each report and write the top N functions next to its PDF; same as REPORTIQ_PROFILE"
+    )
+
+def render_opts(parser, args) -> dict:
+    # checks the add_render_args options and returns create_portfolio_reports
+    # keywords; the env settings are made here, before any worker pool
+    # starts, so every process inherits them
+    try:
+        direct_keys(args.direct)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.page_workers < 0:
+        parser.error("--page-workers must be 0 or more")
+
+    if args.trace:
+        os.environ[TRACE_ENV] = 'stderr' if args.trace == '-' else str(Path(args.trace).resolve())
+    if args.profile:
+        os.environ[PROFILE_ENV] = str(args.profile)
+    if args.layout:
+        os.environ[LAYOUT_ENV] = args.layout
+
+    return dict(
+        parallel=args.page_workers > 0,
+        workers=args.page_workers or None,
+        static_cache=args.static_cache,
+        watchlist=ld_watchlist(str(args.watchlist)) if args.watchlist else None,
+        direct=args.direct,
+        memo=args.memo or None,
+    )
+
+def fnd_clients(root: Path) -> List[Path]:
+    root = Path(root)
+    return sorted(
+        d for d in root.iterdir()
+        if d.is_dir() and any(val_file(f.name) for f in d.iterdir())
+    )
+
+def client_files(d: Path) -> List[Tuple[str, int, str]]:
+    return file_list(f for f in sorted(Path(d).iterdir()) if f.is_file() and val_file(f.name))
+
+def file_list(paths) -> List[Tuple[str, int, str]]:
+    return [(f.name, f.stat().st_size // (1024 * 1024), str(f)) for f in map(Path, paths)]
+
+def run_client(client_dir: Path, out_dir: Path, opts: dict = None, files=None) -> Tuple[str, str, str, float]:
+    # files: explicit input paths; by default every input file in client_dir
+    client_dir = Path(client_dir)
+    start = time.perf_counter()
+    try:
+        with traced_run(client=client_dir.name), span('client'):
+            files = file_list(files) if files else client_files(client_dir)
+            # clients already run one per process; keep sheet parsing in-process
+            data = rd_data(files, REQ_FILES, frames=rd_frames(files, REQ_FILES, workers=1))
+
+            _, ucid = get_customer_details(data['Holding'])
+            tag(ucid=ucid)
+            fname = f"{safe_name(ucid)}_{safe_name(client_dir.name)}.pdf"
+            pdf_path = create_portfolio_reports(data, out_dir, fname, **(opts or {}))
+        return client_dir.name, str(pdf_path), None, time.perf_counter() - start
+    except Exception as e:
+        return client_dir.name, None, str(e), time.perf_counter() - start
+
+def run_batch(in_dir: Path, out_dir: Path, workers: int = None, opts: dict = None) -> List[Tuple[str, str, str, float]]:
+    clients = fnd_clients(in_dir)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futs = [ex.submit(run_client, d, out_dir, opts) for d in clients]
+        for i, fut in enumerate(as_completed(futs), 1):
+            name, pdf_path, err, secs = fut.result()
+            results.append((name, pdf_path, err, secs))
+            status = pdf_path if pdf_path else f"FAILED: {err}"
+            print(f"[{i}/{len(clients)}] {name} ({secs:.1f}s) -> {status}", flush=True)
+
+    elapsed = time.perf_counter() - start
+    ok = sum(1 for r in results if r[1])
+    rate = ok / (elapsed / 60) if elapsed > 0 else 0.0
+    print(
+        f"Generated {ok} of {len(clients)} reports in {elapsed:.1f}s "
+        f"with {workers} workers ({rate:.1f} clients/minute)"
+    )
+    return results
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.ops import cache_dir, del_f
+from utils.pdf import asm_pdf
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+CACHE_MB = int(os.environ.get('REPORTIQ_CACHE_MB', 512))
+PAGE_CACHE_MB = int(os.environ.get('REPORTIQ_PAGE_CACHE_MB', 256))
+FMT_VERSION = 1
+
+def file_hash(fp: str) -> str:
+    h = hashlib.sha256()
+    with open(fp, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _sheet_key(digest: str, sheet: str) -> str:
+    return hashlib.sha256(f"{FMT_VERSION}:{digest}:{sheet}".encode()).hexdigest()
+
+def _sheet_dir() -> Path:
+    return cache_dir('sheets')
+
+def _touch(p: Path) -> None:
+    try:
+        os.utime(p)
+    except OSError:
+        pass
+
+def _write(df: pd.DataFrame, base: Path) -> None:
+    tmp = base.with_name(f"{base.name}.{os.getpid()}.tmp")
+    if pyarrow is not None:
+        try:
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, base.with_suffix('.parquet'))
+            return
+        except Exception:
+            # mixed-type object columns (typical for Holding) have no Parquet type
+            del_f(tmp)
+
+    df.to_pickle(tmp)
+    os.replace(tmp, base.with_suffix('.pkl'))
+
+def _read(p: Path) -> pd.DataFrame:
+    if p.suffix == '.parquet':
+        return pd.read_parquet(p).fillna(np.nan)
+    return pd.read_pickle(p)
+
+def _manifest(digest: str) -> List[str]:
+    try:
+        return json.loads((_sheet_dir() / f"{digest}.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+def get_sheets(digest: str, req: List[str] = None) -> Dict[str, pd.DataFrame]:
+    d = _sheet_dir()
+    manifest = d / f"{digest}.json"
+    stored = _manifest(digest)
+    if stored is None:
+        return None
+
+    # the manifest lists every sheet in the workbook; a sheet that was not
+    # converted yet has no file and makes this a miss
+    sheets = stored if req is None else [sht for sht in req if sht in stored]
+
+    try:
+        frames = {}
+        for sht in sheets:
+            base = d / _sheet_key(digest, sht)
+            exts = ('.parquet', '.pkl') if pyarrow is not None else ('.pkl',)
+            p = next((base.with_suffix(e) for e in exts if base.with_suffix(e).exists()), None)
+            if p is None:
+                return None
+            frames[sht] = _read(p)
+            _touch(p)
+    except Exception:
+        return None
+
+    _touch(manifest)
+    return frames
+
+def put_sheets(digest: str, frames: Dict[str, pd.DataFrame], sheets: List[str] = None,
+               cap_mb: int = CACHE_MB) -> None:
+    d = _sheet_dir()
+    for sht, df in frames.items():
+        _write(df, d / _sheet_key(digest, sht))
+
+    tmp = d / f"{digest}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(sheets or list(frames)))
+    os.replace(tmp, d / f"{digest}.json")
+    evict(cap_mb)
+
+def evict(cap_mb: int = CACHE_MB, d: Path = None, exts=('.parquet', '.pkl', '.json')) -> List[Path]:
+    # least recently used files in d (the sheet cache by default) until the
+    # rest fit in cap_mb
+    entries = []
+    for p in (d or _sheet_dir()).iterdir():
+        if p.suffix in exts:
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+
+    total = sum(size for _, size, _ in entries)
+    removed = []
+    for _, size, p in sorted(entries):
+        if total <= cap_mb * 1024 * 1024:
+            break
+        del_f(p)
+        total -= size
+        removed.append(p)
+    return removed
+
+def value_hash(v) -> str:
+    # content hash of one report input: frames by dtypes, index and values
+    h = hashlib.sha256()
+    if isinstance(v, pd.DataFrame):
+        h.update(repr([(str(c), str(t)) for c, t in v.dtypes.items()]).encode())
+        h.update(pd.util.hash_pandas_object(v).to_numpy().tobytes())
+    elif isinstance(v, (set, frozenset)):
+        h.update(repr(sorted(v)).encode())
+    else:
+        h.update(repr(v).encode())
+    return h.hexdigest()
+
+def _page_path(key: str, digest: str) -> Path:
+    return cache_dir('pages') / f"{key}_{digest}.pdf"
+
+def get_page(key: str, digest: str) -> Path:
+    p = _page_path(key, digest)
+    if not p.exists():
+        return None
+    _touch(p)
+    return p
+
+def put_page(key: str, digest: str, parts: List[Tuple]) -> Path:
+    # parts as for asm_pdf: the pages one page builder rendered
+    p = _page_path(key, digest)
+    tmp = p.with_name(f"{p.stem}.{os.getpid()}.tmp")
+    try:
+        asm_pdf(parts, tmp)
+        os.replace(tmp, p)
+    finally:
+        del_f(tmp)
+    return p
+
+def evict_pages(cap_mb: int = PAGE_CACHE_MB) -> List[Path]:
+    return evict(cap_mb, cache_dir('pages'), ('.pdf',))
@@ -0,0 +1,84 @@
+from functools import lru_cache
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import Normalize
+from matplotlib.image import BboxImage
+from matplotlib.transforms import Bbox, TransformedBbox
+
+from utils.assets import IMG_DPI, get_img
+
+# images each page template carries, placed in figure fractions
+CHROME = {
+    'page': (('logo.png', (0.79, 0.9, 0.2, 0.08)), ('header.png', (0.02, 0.77, 0.9, 0.3))),
+    'cover': (('logo.png', (0.78, 0.88, 0.2, 0.08)), ('footer.png', (0.23, 0.12, 0.8, 0.2))),
+}
+GRADIENT = np.linspace(1, 0.9, 500).reshape(1, -1)
+GRADIENT_CMAP = 'Blues'
+GRADIENT_ALPHA = 0.3
+FOOTER_COLOR = '#2F4F4F'
+
+_made = {}
+
+def fit_rect(size, rect, shape):
+    # where imshow(aspect='equal') puts an image in an axes at rect: scaled
+    # to fit and centred, in figure fractions
+    l, b, w, h = rect
+    ih, iw = shape[:2]
+    scale = min(w * size[0] / iw, h * size[1] / ih)
+    fw, fh = iw * scale / size[0], ih * scale / size[1]
+    return l + (w - fw) / 2, b + (h - fh) / 2, fw, fh
+
+class ChromeImage(BboxImage):
+    # A BboxImage whose resampled output is kept per process: every page
+    # draws the same array, which PdfPages then embeds only once.
+    def __init__(self, key, bbox, data, **kw):
+        super().__init__(bbox, resample=plt.rcParams['image.resample'], **kw)
+        self.key = key
+        self.set_data(data)
+
+    def make_image(self, renderer, magnification=1.0, unsampled=False):
+        key = (self.key, tuple(self.get_window_extent(renderer).bounds), magnification, unsampled)
+        made = _made.get(key)
+        if made is None:
+            made = _made[key] = super().make_image(renderer, magnification, unsampled)
+        return made
+
+@lru_cache(maxsize=None)
+def chrome(kind='page', size=(15.8, 10)):
+    # decoded images and their fitted rects for a template, once per process
+    box = lambda rect: (round(size[0] * rect[2], 3), round(size[1] * rect[3], 3))
+    imgs = []
+    for name, rect in CHROME[kind]:
+        img = get_img(name, box(rect), IMG_DPI)
+        imgs.append((name, img, fit_rect(size, rect, img.shape)))
+    return tuple(imgs)
+
+def add_chrome(fig, kind='page'):
+    # gradient behind the page axes, template images above them; kept as
+    # separate images so each stays the shared array
+    size = tuple(fig.get_size_inches())
+    fig.suppressComposite = True
+    fig.add_artist(ChromeImage(('gradient', GRADIENT_CMAP, GRADIENT_ALPHA),
+                               TransformedBbox(Bbox.unit(), fig.transFigure), GRADIENT,
+                               cmap=GRADIENT_CMAP, norm=Normalize(GRADIENT.min(), GRADIENT.max()),
+                               alpha=GRADIENT_ALPHA, zorder=-1))
+    try:
+        for name, img, rect in chrome(kind, size):
+            fig.add_artist(ChromeImage((name, size), TransformedBbox(Bbox.from_bounds(*rect), fig.transFigure),
+                                       img, zorder=1))
+    except Exception as e:
+        print(f"Warning: Image loading error: {e}")
+
+def chrome_fig(size=(15.8, 10), kind='page', footer=None):
+    # a page figure with its chrome, the disclaimer footer if given, and one
+    # full-page axes for content
+    fig = plt.figure(figsize=size)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.axis('off')
+    add_chrome(fig, kind)
+    if footer:
+        ax.text(0.5, 0.02, footer, horizontalalignment='center', fontsize=10, color=FOOTER_COLOR, wrap=True)
+    return fig, ax
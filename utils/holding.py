@@ -0,0 +1,123 @@
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+CLIENT_MARKER = 'Client Equity Code/UCID/Name'
+SECTIONS = {
+    'mf': ('Mutual Fund:-', 'FnO:-'),
+    'fno': ('FnO:-', 'Currency:-'),
+}
+SECTION_TAIL = 4
+# the asset-class rows of the summary block at the top of the statement,
+# and the named fields their Unnamed: N columns hold
+ASSET_CLASSES = ('Equity', 'Debt')
+SUMMARY_FIELDS = {
+    'Unnamed: 4': 'cost',
+    'Unnamed: 6': 'market_value',
+    'Unnamed: 11': 'dividend',
+    'Unnamed: 13': 'gain_loss',
+}
+
+@dataclass
+class Section:
+    name: str
+    start: int
+    end: int
+    header: int
+    frame: pd.DataFrame
+
+@dataclass
+class HoldingDoc:
+    raw: pd.DataFrame
+    client_info: str = None
+    clients: int = 0
+    markers: Dict[str, int] = field(default_factory=dict)
+    equity_rows: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=int))
+    sections: Dict[str, Section] = field(default_factory=dict)
+
+    def section(self, name: str) -> pd.DataFrame:
+        if name not in self.sections:
+            start, end = SECTIONS[name]
+            missing = [m for m in (start, end) if m not in self.markers]
+            raise ValueError(f"Holding file has no {' / '.join(missing)} section marker")
+        return self.sections[name].frame
+
+    @cached_property
+    def summary(self) -> pd.DataFrame:
+        # SUMMARY_FIELDS totals per asset class, indexed by ASSET_CLASSES,
+        # over that class's rows with no empty cell, as the summary block's
+        # are; typed once, for only those cells
+        names = self.raw.iloc[:, 0]
+        rows = self.raw[names.isin(ASSET_CLASSES).to_numpy(bool)]
+        rows = rows[rows.notna().all(axis=1)]
+        nums = rows[list(SUMMARY_FIELDS)].apply(pd.to_numeric, errors='coerce').rename(columns=SUMMARY_FIELDS)
+        return pd.DataFrame(
+            {name: [nums[name][rows.iloc[:, 0] == cls].sum() for cls in ASSET_CLASSES] for name in nums},
+            index=list(ASSET_CLASSES),
+        )
+
+    @property
+    def mf(self) -> pd.DataFrame:
+        return self.section('mf')
+
+    @property
+    def fno(self) -> pd.DataFrame:
+        return self.section('fno')
+
+    @cached_property
+    def mf_split(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        asset_type = self.mf['Asset Type']
+        typed = asset_type.notna()
+        return self.mf[typed & (asset_type != 'Debt')], self.mf[typed & (asset_type != 'Equity')]
+
+    @property
+    def mf_equity(self) -> pd.DataFrame:
+        return self.mf_split[0]
+
+    @property
+    def mf_debt(self) -> pd.DataFrame:
+        return self.mf_split[1]
+
+def _sub_frame(df: pd.DataFrame, name: str, start: int, end: int) -> Section:
+    header = start + 1
+    sub = df.iloc[header:end - SECTION_TAIL].copy()
+    sub.columns = sub.iloc[0]
+    sub = sub.iloc[1:].reset_index(drop=True)
+    return Section(name, start, end, header, sub)
+
+def _equity_rows(names: pd.Series) -> np.ndarray:
+    # A row containing 'Equity' opens a direct-equity section from the next
+    # row on; a 'Total' row is still part of the section it closes.
+    is_eq = names.str.contains('Equity', regex=False).fillna(False).to_numpy(bool)
+    is_total = names.str.contains('Total', regex=False).fillna(False).to_numpy(bool) & ~is_eq
+
+    events = np.full(len(names), np.nan)
+    events[is_eq] = 1
+    events[is_total] = 0
+    in_section = pd.Series(events).shift(1).ffill().fillna(0).to_numpy() == 1
+    return np.flatnonzero(in_section & ~is_eq)
+
+def parse_holding(df: pd.DataFrame) -> HoldingDoc:
+    doc = HoldingDoc(df)
+    names = df.iloc[:, 0].astype('string')
+
+    watched = {m for pair in SECTIONS.values() for m in pair} | {CLIENT_MARKER}
+    for i in np.flatnonzero(names.isin(watched).to_numpy(bool)):
+        doc.markers.setdefault(names.iat[i], int(i))
+
+    doc.clients = int((names == CLIENT_MARKER).sum())
+    if CLIENT_MARKER in doc.markers:
+        doc.client_info = df.iloc[doc.markers[CLIENT_MARKER], 1]
+    doc.equity_rows = _equity_rows(names)
+
+    for name, (start, end) in SECTIONS.items():
+        if start in doc.markers and end in doc.markers:
+            doc.sections[name] = _sub_frame(df, name, doc.markers[start], doc.markers[end])
+
+    return doc
+
+def as_doc(holding) -> HoldingDoc:
+    return holding if isinstance(holding, HoldingDoc) else parse_holding(holding)
@@ -1,7 +1,17 @@
-import threading
-import time
 import os
-from tkinter import filedialog
+import queue
+import re
+import sys
+from pathlib import Path
+from tkinter import filedialog, messagebox
+from typing import Dict, List, Tuple
+
+REQ_FILES = [
+    'Portfolio Value.csv', 'Holding.csv', 'XIRR.csv',
+    'Equity.csv', 'Debt.csv', 'FNO.csv', 'Profits.csv'
+]
+
+XL_EXTS = ('.xlsx', '.xls', '.xlsm')
 
 def brw_files(rt, acc_types):
     ftypes = [(n, ' '.join(ext)) for n, ext in acc_types.items()]
@@ -13,15 +23,91 @@ def val_file(fn: str) -> bool:
     exts = ('.xlsx', '.xls', '.xlsm', '.csv')
     return ext in exts
 
-def sim_up(pb, rt):
-    def upd_prog():
-        for i in range(101):
-            pb['value'] = i
-            time.sleep(0.05)
-            rt.update()
+def chk_files(files: List[Tuple[str, int, str]], req: List[str], out: Path,
+              frames: Dict[str, dict] = None) -> bool:
+    # frames: the converted frames of each uploaded file, keyed by its path
+    frames = frames or {}
+    books = [(n, p) for n, _, p in files if n.lower().endswith(XL_EXTS)]
+    stale = [n for n, p in books if p not in frames]
+    if stale:
+        messagebox.showerror(
+            "Convert Files",
+            f"These workbooks have not been converted since they were added:\n{', '.join(stale)}\n\n"
+            "Click Convert Files before generating."
+        )
+        return False
+
+    exist = {n for n, _, _ in files}
+    for converted in frames.values():
+        exist.update(converted)
+    if out.exists() and not books:
+        exist.update(f.name for f in out.glob('*.csv'))
+
+    miss = set(req) - exist
+    if miss:
+        messagebox.showerror(
+            "Missing Files",
+            f"The following required files are missing:\n{', '.join(miss)}"
+        )
+        return False
+
+    return True
+
+def safe_name(s: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(s)).strip('_') or 'client'
+
+class Prog:
+    # Reports progress of one item as (key, 'total', n) / (key, 'done', n) on
+    # a queue; usable from worker processes when the queue is a Manager queue.
+    def __init__(self, q, key, step: int = 1):
+        self.q = q
+        self.key = key
+        self.step = step
+        self.pending = 0
+
+    def total(self, n: int) -> None:
+        self.step = max(self.step, n // 100)
+        self.q.put((self.key, 'total', n))
+
+    def __call__(self, n: int = 1) -> None:
+        self.pending += n
+        if self.pending >= self.step:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending:
+            self.q.put((self.key, 'done', self.pending))
+            self.pending = 0
+
+def poll_q(rt, queues, handle, ms: int = 50) -> None:
+    # Drains thread-safe queues on the Tk loop; handle returns False to stop.
+    def tick():
+        for q in queues:
+            while True:
+                try:
+                    msg = q.get_nowait()
+                except queue.Empty:
+                    break
+                if handle(msg) is False:
+                    return
+        rt.after(ms, tick)
+
+    rt.after(ms, tick)
+
+def cache_dir(*parts: str) -> Path:
+    root = os.environ.get('REPORTIQ_CACHE') or Path.home() / '.reportiq' / 'cache'
+    d = Path(root).joinpath(*parts)
+    d.mkdir(parents=True, exist_ok=True)
+    return d
 
-    t = threading.Thread(target=upd_prog)
-    t.start()
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
 
 def mk_dir(p: str) -> None:
     os.makedirs(p, exist_ok=True)
@@ -0,0 +1,66 @@
+import hashlib
+from pathlib import Path
+from typing import List, Tuple
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    PdfReader = PdfWriter = None
+
+def can_merge() -> bool:
+    return PdfWriter is not None
+
+def _img_key(img) -> str:
+    # content of an image XObject, its soft mask included; part files give
+    # identical images different object numbers, so compare bytes instead
+    h = hashlib.sha256(img._data)
+    for k in sorted(img):
+        if k == '/Length':
+            continue
+        v = img[k]
+        h.update(k.encode())
+        h.update((_img_key(v.get_object()) if k == '/SMask' else repr(v)).encode())
+    return h.hexdigest()
+
+def dedupe_images(writer) -> None:
+    seen = {}
+    for page in writer.pages:
+        res = page.get('/Resources')
+        xo = res and res.get_object().get('/XObject')
+        if not xo:
+            continue
+        xo = xo.get_object()
+        for name, ref in list(xo.items()):
+            img = ref.get_object()
+            if img.get('/Subtype') != '/Image':
+                continue
+            xo[name] = seen.setdefault(_img_key(img), ref)
+
+def asm_pdf(parts: List[Tuple], out: Path) -> Path:
+    # parts: (src, page) or (src, page, stamp_src, stamp_page), in output order
+    if PdfWriter is None:
+        raise ImportError("pypdf is required to merge PDF pages (pip install pypdf)")
+
+    readers = {}
+    def rd(p):
+        if p not in readers:
+            readers[p] = PdfReader(str(p))
+        return readers[p]
+
+    writer = PdfWriter()
+    for part in parts:
+        page = writer.add_page(rd(part[0]).pages[part[1]])
+        if len(part) > 2:
+            page.merge_page(rd(part[2]).pages[part[3]])
+
+    # every part file carries its own copy of the chrome images and fonts;
+    # keep one of each, as a single-pass render would
+    dedupe_images(writer)
+    writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+    with open(out, 'wb') as f:
+        writer.write(f)
+    writer.close()
+    return Path(out)
+
+def pdf_pages(path: Path) -> int:
+    return len(PdfReader(str(path)).pages)
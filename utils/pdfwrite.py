@@ -0,0 +1,261 @@
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
+import matplotlib
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.colors import to_rgb
+from matplotlib.font_manager import FontProperties, findfont, get_font
+
+from utils.chrome import GRADIENT, GRADIENT_ALPHA, GRADIENT_CMAP, chrome
+from utils.tables import BASELINE
+
+FONTS = {'normal': 'Helvetica', 'bold': 'Helvetica-Bold'}
+# advance for glyphs outside the AFM's ASCII range (Helvetica's digit width)
+DEFAULT_ADVANCE = 0.556
+
+@lru_cache(maxsize=None)
+def _afm(name: str) -> dict:
+    # character advances (per unit font size) from matplotlib's copy of the
+    # standard-14 AFM files
+    path = Path(matplotlib.get_data_path()) / 'fonts' / 'pdfcorefonts' / f"{name}.afm"
+    widths = {}
+    for line in path.read_text(encoding='latin-1').splitlines():
+        if not line.startswith('C '):
+            continue
+        fields = dict(f.strip().split(' ', 1) for f in line.split(';') if f.strip())
+        code = int(fields['C'])
+        if 32 <= code < 127:
+            widths[chr(code)] = float(fields['WX']) / 1000
+    return widths
+
+def text_width(s: str, size: float = 10, weight: str = 'normal') -> float:
+    widths = _afm(FONTS['bold' if weight == 'bold' else 'normal'])
+    return sum(widths.get(ch, DEFAULT_ADVANCE) for ch in s) * size
+
+@lru_cache(maxsize=None)
+def _line_metrics():
+    # ascent/descent of "lp" and the line advance (1.2 x typographic height)
+    # of matplotlib's default font, as Text uses for alignment and line
+    # spacing; reusing them keeps text on the figure backend's baselines
+    font = get_font(findfont(FontProperties()))
+    os2 = font.get_sfnt_table('OS/2')
+    lead = 1.2 * (os2['sTypoAscender'] - os2['sTypoDescender']) / font.get_sfnt_table('head')['unitsPerEm']
+    font.set_size(100, 72)
+    font.set_text('lp', 0)
+    h = font.get_width_height()[1] / 64 / 100
+    d = font.get_descent() / 64 / 100
+    return h - d, d, lead
+
+def _rgb(color) -> str:
+    return ' '.join(f"{c:.4g}" for c in to_rgb(color))
+
+def _num(v: float) -> str:
+    return f"{v:.2f}".rstrip('0').rstrip('.')
+
+def _pdf_str(s: str) -> str:
+    return '<' + s.encode('cp1252', errors='replace').hex() + '>'
+
+class Page:
+    # One page drawn in figure-fraction coordinates, like an axes spanning a
+    # matplotlib figure of `size` inches saved with `pad` inches of margin.
+    def __init__(self, doc, size, pad=0.0):
+        self.doc = doc
+        self.size = size
+        self.w, self.h = size[0] * 72, size[1] * 72
+        self.pad = pad * 72
+        self.ops = []
+        self.xobjects = {}
+
+    text_width = staticmethod(text_width)
+
+    @property
+    def media(self):
+        return self.w + 2 * self.pad, self.h + 2 * self.pad
+
+    def _x(self, x: float) -> float:
+        return self.pad + x * self.w
+
+    def _y(self, y: float) -> float:
+        return self.pad + y * self.h
+
+    def rects(self, boxes) -> None:
+        # boxes: (x0, y0, x1, y1, color) filled without edges
+        last = None
+        for x0, y0, x1, y1, color in boxes:
+            if color != last:
+                self.ops.append(f"{_rgb(color)} rg")
+                last = color
+            self.ops.append(f"{_num(self._x(x0))} {_num(self._y(y0))} "
+                            f"{_num((x1 - x0) * self.w)} {_num((y1 - y0) * self.h)} re f")
+
+    def rect(self, x, y, w, h, color) -> None:
+        self.rects([(x, y, x + w, y + h, color)])
+
+    def lines(self, segs, color='black', lw=1.0) -> None:
+        self.ops.append(f"{_rgb(color)} RG {_num(lw)} w")
+        for (x0, y0), (x1, y1) in segs:
+            self.ops.append(f"{_num(self._x(x0))} {_num(self._y(y0))} m "
+                            f"{_num(self._x(x1))} {_num(self._y(y1))} l")
+        self.ops.append("S")
+
+    def text(self, x, y, s, size=10, color='black', weight='normal', ha='left', va='baseline') -> None:
+        # matches Text: va='baseline' anchors the last line, lines keep
+        # matplotlib's line spacing, each line aligned by ha
+        ascent, descent, lead = _line_metrics()
+        lines = s.split('\n')
+        lead *= size
+        y = self._y(y)
+        if va == 'top':
+            y -= ascent * size + (len(lines) - 1) * lead
+        elif va == 'center':
+            y -= ((ascent - descent) * size + (len(lines) - 1) * lead) / 2
+
+        font = self.doc.font(weight)
+        self.ops.append(f"BT /{font} {_num(size)} Tf {_rgb(color)} rg")
+        for i, line in enumerate(lines):
+            if not line:
+                continue
+            px = self._x(x)
+            if ha != 'left':
+                width = text_width(line, size, weight)
+                px -= width if ha == 'right' else width / 2
+            py = y + (len(lines) - 1 - i) * lead
+            self.ops.append(f"1 0 0 1 {_num(px)} {_num(py)} Tm {_pdf_str(line)} Tj")
+        self.ops.append("ET")
+
+    def _draw_image(self, key, img, x, y, w, h, interpolate=False) -> None:
+        name = self.doc.image(key, img, interpolate)
+        self.xobjects[name] = self.doc.images[key][1]
+        self.ops.append(f"q {_num(w)} 0 0 {_num(h)} {_num(x)} {_num(y)} cm /{name} Do Q")
+
+    def _place(self, key, img, rect) -> None:
+        l, b, w, h = rect
+        self._draw_image(key, img, self._x(l), self._y(b), w * self.w, h * self.h)
+
+    def chrome(self, kind='page') -> None:
+        # the template images chrome.add_chrome puts on figure pages
+        try:
+            for name, img, rect in chrome(kind, self.size):
+                self._place((name, self.size), img, rect)
+        except Exception as e:
+            print(f"Warning: Image loading error: {e}")
+
+    def gradient(self) -> None:
+        # the chrome gradient backdrop, pre-blended over the white page
+        cmap = colormaps[GRADIENT_CMAP]
+        norm = (GRADIENT[0] - GRADIENT.min()) / (GRADIENT.max() - GRADIENT.min())
+        rgb = cmap(norm)[:, :3] * GRADIENT_ALPHA + (1 - GRADIENT_ALPHA)
+        img = (rgb * 255).round().astype(np.uint8).reshape(1, -1, 3)
+        self._draw_image(('gradient', GRADIENT_CMAP, GRADIENT_ALPHA), img, self._x(0), self._y(0), self.w, self.h, True)
+
+    def table(self, lay, edgecolor='black', lw=1.0) -> None:
+        # draws a tables.TableLayout laid out in figure fractions
+        self.rects(lay.fills)
+        self.lines(lay.segs, edgecolor, lw)
+
+        size = lay.fontsize
+        clipped = []
+        self.ops.append("BT")
+        font = color = None
+        for x, yc, s, ha, weight, c, width, x0, x1 in lay.items:
+            px = self._x(x) - (width if ha == 'right' else width / 2 if ha == 'center' else 0)
+            py = self._y(yc) - BASELINE * size
+            if px < self._x(x0) or px + width > self._x(x1):
+                clipped.append((px, py, s, weight, c, x0, x1))
+                continue
+            if self.doc.font(weight) != font:
+                font = self.doc.font(weight)
+                self.ops.append(f"/{font} {_num(size)} Tf")
+            if c != color:
+                color = c
+                self.ops.append(f"{_rgb(c)} rg")
+            self.ops.append(f"1 0 0 1 {_num(px)} {_num(py)} Tm {_pdf_str(s)} Tj")
+        self.ops.append("ET")
+
+        # overflowing text is cut at the cell edge, as the next cell's
+        # background does in matplotlib's table
+        for px, py, s, weight, c, x0, x1 in clipped:
+            self.ops.append(f"q {_num(self._x(x0))} {_num(py - size)} {_num((x1 - x0) * self.w)} {_num(3 * size)} re W n "
+                            f"BT /{self.doc.font(weight)} {_num(size)} Tf {_rgb(c)} rg "
+                            f"1 0 0 1 {_num(px)} {_num(py)} Tm {_pdf_str(s)} Tj ET Q")
+
+class PdfDoc:
+    # Writes pages straight to PDF operators with the standard Helvetica
+    # fonts; no figure, artist or text-layout machinery involved.
+    def __init__(self, path):
+        self.path = Path(path)
+        self.objs: List[bytes] = []
+        self.pages: List[int] = []
+        self.images = {}
+        self.fonts = {}
+        self.pages_id = self._reserve()
+
+    def _reserve(self) -> int:
+        self.objs.append(b'')
+        return len(self.objs)
+
+    def _add(self, data: bytes) -> int:
+        self.objs.append(data)
+        return len(self.objs)
+
+    def _stream(self, head: str, data: bytes) -> int:
+        data = zlib.compress(data)
+        return self._add(f"<< {head} /Filter /FlateDecode /Length {len(data)} >>\nstream\n".encode()
+                         + data + b"\nendstream")
+
+    def font(self, weight: str) -> str:
+        base = FONTS['bold' if weight == 'bold' else 'normal']
+        if base not in self.fonts:
+            oid = self._add(f"<< /Type /Font /Subtype /Type1 /BaseFont /{base} "
+                            f"/Encoding /WinAnsiEncoding >>".encode())
+            self.fonts[base] = (f"F{len(self.fonts) + 1}", oid)
+        return self.fonts[base][0]
+
+    def image(self, key, img: np.ndarray, interpolate=False) -> str:
+        if key not in self.images:
+            h, w = img.shape[:2]
+            head = (f"/Type /XObject /Subtype /Image /Width {w} /Height {h} /BitsPerComponent 8"
+                    f"{' /Interpolate true' if interpolate else ''}")
+            smask = ''
+            if img.shape[2] == 4 and (img[:, :, 3] < 255).any():
+                sid = self._stream(f"{head} /ColorSpace /DeviceGray", np.ascontiguousarray(img[:, :, 3]).tobytes())
+                smask = f" /SMask {sid} 0 R"
+            oid = self._stream(f"{head} /ColorSpace /DeviceRGB{smask}", np.ascontiguousarray(img[:, :, :3]).tobytes())
+            self.images[key] = (f"Im{len(self.images) + 1}", oid)
+        return self.images[key][0]
+
+    def page(self, size=(16, 10), pad=0.0) -> Page:
+        return Page(self, size, pad)
+
+    def add(self, page: Page) -> None:
+        content = self._stream('', '\n'.join(page.ops).encode('latin-1'))
+        fonts = ' '.join(f"/{name} {oid} 0 R" for name, oid in self.fonts.values())
+        xobjs = ' '.join(f"/{name} {oid} 0 R" for name, oid in page.xobjects.items())
+        w, h = page.media
+        self.pages.append(self._add(
+            f"<< /Type /Page /Parent {self.pages_id} 0 R /MediaBox [0 0 {_num(w)} {_num(h)}] "
+            f"/Resources << /Font << {fonts} >> /XObject << {xobjs} >> >> /Contents {content} 0 R >>".encode()
+        ))
+
+    def get_pagecount(self) -> int:
+        return len(self.pages)
+
+    def close(self) -> Path:
+        kids = ' '.join(f"{p} 0 R" for p in self.pages)
+        self.objs[self.pages_id - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>".encode()
+        root = self._add(f"<< /Type /Catalog /Pages {self.pages_id} 0 R >>".encode())
+
+        offsets = []
+        with open(self.path, 'wb') as f:
+            f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+            for i, obj in enumerate(self.objs, 1):
+                offsets.append(f.tell())
+                f.write(f"{i} 0 obj\n".encode() + obj + b"\nendobj\n")
+            xref = f.tell()
+            f.write(f"xref\n0 {len(self.objs) + 1}\n0000000000 65535 f \n".encode())
+            f.write(''.join(f"{o:010d} 00000 n \n" for o in offsets).encode())
+            f.write(f"trailer\n<< /Size {len(self.objs) + 1} /Root {root} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+        return self.path
@@ -1,32 +1,17 @@
-import numpy as np
+import os
+from functools import lru_cache
 import pandas as pd
 import matplotlib.pyplot as plt
+from utils.chrome import FOOTER_COLOR, chrome_fig
+from utils.holding import as_doc
+from utils.tables import draw_table, grid_table, layout_table, paginate, write_table
 
-def plot_table_and_pie(Holding, equity_allocation_percentage):
-    Holding = Holding.dropna()
-    Holding = Holding.dropna(axis=1)
-    Holding = Holding.dropna(how='all')
-    
-    df_equity = Holding[Holding['Unnamed: 0'] == 'Equity']
-    df_debt = Holding[Holding['Unnamed: 0'] == 'Debt']
-
-    df_equity.loc[:, 'Unnamed: 4'] = pd.to_numeric(df_equity['Unnamed: 4'], errors='coerce')
-    df_debt.loc[:, 'Unnamed: 4'] = pd.to_numeric(df_debt['Unnamed: 4'], errors='coerce')
-    df_equity.loc[:, 'Unnamed: 6'] = pd.to_numeric(df_equity['Unnamed: 6'], errors='coerce')
-    df_debt.loc[:, 'Unnamed: 6'] = pd.to_numeric(df_debt['Unnamed: 6'], errors='coerce')
-    df_equity.loc[:, 'Unnamed: 11'] = pd.to_numeric(df_equity['Unnamed: 11'], errors='coerce')
-    df_debt.loc[:, 'Unnamed: 11'] = pd.to_numeric(df_debt['Unnamed: 11'], errors='coerce')
-    df_equity.loc[:, 'Unnamed: 13'] = pd.to_numeric(df_equity['Unnamed: 13'], errors='coerce')
-    df_debt.loc[:, 'Unnamed: 13'] = pd.to_numeric(df_debt['Unnamed: 13'], errors='coerce')
-
-    equity_sum = df_equity['Unnamed: 4'].sum()
-    debt_sum = df_debt['Unnamed: 4'].sum()
-    equity_mkt_val = df_equity['Unnamed: 6'].sum()
-    debt_mkt_val = df_debt['Unnamed: 6'].sum()
-    equity_dividend = df_equity['Unnamed: 11'].sum()
-    debt_dividend = df_debt['Unnamed: 11'].sum()
-    equity_gl = df_equity['Unnamed: 13'].sum()
-    debt_gl = df_debt['Unnamed: 13'].sum()
+def plot_table_and_pie(Holding, equity_allocation_percentage, stamp=True):
+    summary = as_doc(Holding).summary
+    equity_sum, debt_sum = summary['cost']
+    equity_mkt_val, debt_mkt_val = summary['market_value']
+    equity_dividend, debt_dividend = summary['dividend']
+    equity_gl, debt_gl = summary['gain_loss']
 
     equity_sum_in_lacs = equity_sum / 100000
     debt_sum_in_lacs = debt_sum / 100000
@@ -40,51 +25,15 @@ def plot_table_and_pie(Holding, equity_allocation_percentage):
     total_dividend = equity_dividend_in_lacs + debt_dividend_in_lacs
     total_gl = equity_gl + debt_gl
 
-    fig = plt.figure(figsize=(15.8, 10))
-    ax = fig.add_subplot(111)
-    ax.set_position([0, 0, 1, 1])
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
-
-    gradient = np.linspace(1, 0.9, 500).reshape(1, -1)
-    ax.imshow(gradient, extent=(0, 1, 0, 1), cmap='Blues', aspect='auto', alpha=0.3)
-
-    try:
-        logo = plt.imread('logo.png')
-        header_img = plt.imread('header.png')
-        
-        logo_ax = fig.add_axes([0.79, 0.9, 0.2, 0.08])
-        logo_ax.imshow(logo)
-        logo_ax.axis('off')
-        
-        header_ax = fig.add_axes([0.02, 0.77, 0.9, 0.3])
-        header_ax.imshow(header_img)
-        header_ax.axis('off')
-    except:
-        print("Warning: One or more image files not found")
+    fig, ax = chrome_fig((15.8, 10), footer=page_footer() if stamp else None)
 
     current_date = pd.Timestamp.now().strftime('%d-%b-%Y')
-    current_time = pd.Timestamp.now().strftime('%I:%M %p')
     
     ax.text(0.11, 0.915, "Holding Summary and Performance", 
             fontsize=28, color='#CD0000', weight='light')
     ax.text(0.56, 0.92, f"For Period (As On {current_date})",
             fontsize=12, color='#000000', weight='normal')
 
-    client_info_raw = (
-        Holding['Unnamed: 1'].iloc[1]
-        if not Holding.empty and 'Unnamed: 1' in Holding.columns and len(Holding) > 1
-        else "N/A"
-    )
-    if '/' in client_info_raw:
-        parts = client_info_raw.split('/')
-        name = parts[-1]
-        id_num = parts[0]
-    else:
-        name = client_info_raw
-        id_num = ""
-
     asset_data = {
         "Asset Class": [
             "EQUITY", "MULTI ASSET", "DEBT", "ALTERNATE QUOTED", 
@@ -121,34 +70,20 @@ def plot_table_and_pie(Holding, equity_allocation_percentage):
     ax.add_patch(plt.Rectangle((0.035, 0.85), 0.004, 0.015,
                               facecolor='#CD0000'))
 
+    def total_style(row, col, text):
+        if row == len(asset_df):
+            return {'fill': '#E6F3FF', 'weight': 'bold'} if col > 0 else {'weight': 'bold'}
+
     table_ax1 = fig.add_axes([0.05, 0.48, 0.55, 0.35])
     table_ax1.axis('off')
     
-    table1 = table_ax1.table(
-        cellText=asset_df[asset_df.columns[:4]].values,
-        colLabels=asset_df.columns[:4],
-        cellLoc='right',
-        loc='center',
-        bbox=[0, 0, 1, 1],
-        colWidths=[0.3, 0.2, 0.25, 0.25]
+    grid_table(
+        table_ax1, asset_df[asset_df.columns[:4]].values, asset_df.columns[:4],
+        col_widths=[0.3, 0.2, 0.25, 0.25],
+        align='right',
+        style=total_style,
     )
 
-    table1.auto_set_font_size(False)
-    table1.set_fontsize(10)
-    for (row, col), cell in table1._cells.items():
-        cell.set_edgecolor('black')
-        if col == 0:  
-            cell._loc = 'left'
-        else:
-            cell._loc = 'right'
-        if row == 0:
-            cell.set_facecolor('#E6E6E6')
-            cell.set_text_props(weight='bold')
-        if row == len(asset_df) and col > 0:
-            cell.set_facecolor('#E6F3FF')
-        if row == len(asset_df):
-            cell.get_text().set_weight('bold')
-
     pie_ax = fig.add_axes([0.65, 0.48, 0.3, 0.35])
     
     portfolio_data = list(zip(asset_data['Asset Class'], asset_data['% of Portfolio']))
@@ -191,88 +126,17 @@ def plot_table_and_pie(Holding, equity_allocation_percentage):
     table_ax2 = fig.add_axes([0.05, 0.06, 0.9, 0.35])
     table_ax2.axis('off')
     
-    table2 = table_ax2.table(
-        cellText=asset_df.values,
-        colLabels=asset_df.columns,
-        cellLoc='right',
-        loc='center',
-        bbox=[0, 0, 1, 1],
-        colWidths=[0.2, 0.15, 0.15, 0.15, 0.15, 0.2]
-    )
-
-    table2.auto_set_font_size(False)
-    table2.set_fontsize(10)
-    for (row, col), cell in table2._cells.items():
-        cell.set_edgecolor('black')
-        if col == 0:  
-            cell._loc = 'left'
-        else:
-            cell._loc = 'right'
-        if row == 0:
-            cell.set_facecolor('#E6E6E6')
-            cell.set_text_props(weight='bold')
-        if row == len(asset_df) and col > 0:
-            cell.set_facecolor('#E6F3FF')
-        if row == len(asset_df):
-            cell.get_text().set_weight('bold')
-
-    footer_text = (
-        "This document is not valid without disclosure, Please refer to the last page for the disclaimer. | "
-        "Strictly Private & Confidential.\n"
-        f"Incase of any query / feedback on the report, please write to query@motilaloswal.com. | "
-        f"Generated Date & Time : {current_date} & {current_time}"
-    )
-    ax.text(
-        0.5, 0.02, footer_text,
-        horizontalalignment='center',
-        fontsize=10,
-        color='#2F4F4F',
-        wrap=True
+    grid_table(
+        table_ax2, asset_df.values, asset_df.columns,
+        col_widths=[0.2, 0.15, 0.15, 0.15, 0.15, 0.2],
+        align='right',
+        style=total_style,
     )
 
     return fig
 
 
-def create_holdings_summary(equity_file, debt_file, holding_df):
-    fig = plt.figure(figsize=(15.8, 10))
-    ax = fig.add_subplot(111)
-    ax.set_position([0, 0, 1, 1])
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
-    
-    gradient = np.linspace(1, 0.9, 500).reshape(1, -1)
-    ax.imshow(gradient, extent=(0, 1, 0, 1), cmap='Blues', aspect='auto', alpha=0.3)
-    
-    current_date = pd.Timestamp.now().strftime('%d-%b-%Y')
-    current_time = pd.Timestamp.now().strftime('%I:%M %p')
-    
-    ax.text(0.11, 0.915, 'Holding Summary and Performance', 
-            color='#CD0000', fontsize=28, fontweight='light')
-    ax.text(0.56, 0.92, f"For Period (As On {current_date})",
-            fontsize=12, color='#000000', weight='normal')
-    
-    ax.text(0.05, 0.77, "Productwise Performance", 
-            fontsize=16, fontweight='bold', color='#000000')
-    ax.text(0.83, 0.77, "(Amount in Lacs)", 
-            fontsize=12, color='#666666')
-    ax.add_patch(plt.Rectangle((0.035, 0.77), 0.004, 0.015,
-                                facecolor='#CD0000'))
-    
-    try:
-        logo = plt.imread('logo.png')
-        header = plt.imread('header.png')
-        
-        logo_ax = fig.add_axes([0.79, 0.9, 0.2, 0.08])
-        logo_ax.imshow(logo)
-        logo_ax.axis('off')
-        
-        header_ax = fig.add_axes([0.02, 0.77, 0.9, 0.3])
-        header_ax.imshow(header)
-        header_ax.axis('off')
-    except:
-        print("Warning: Image files not found")
-    
+def create_holdings_summary(equity_file, debt_file, holding_df, pdf_doc=None, stamp=True):
     summary_tables = []
     for df, category_label in [(equity_file, 'Equity'), (debt_file, 'Debt')]:
         temp_summary = pd.DataFrame()
@@ -300,7 +164,6 @@ def create_holdings_summary(equity_file, debt_file, holding_df):
     
     if 'Market Value' in numeric_cols:
         combined_summary['Market Value'] = combined_summary['Market Value'].apply(lambda x: round(x, 3))
-    combined_summary['Unrealised G/L %'] = combined_summary['Unrealised G/L %'].round(2)
     
     total_row = pd.DataFrame(combined_summary.select_dtypes(include=['number']).sum()).T
     total_row.insert(0, 'Asset Class', 'TOTAL')
@@ -310,486 +173,174 @@ def create_holdings_summary(equity_file, debt_file, holding_df):
     total_row['Unrealised G/L %'] = '-'  
     combined_summary = pd.concat([combined_summary, total_row], ignore_index=True)
     
+    cells = combined_summary.values.tolist()
+    if 'Market Value' in combined_summary.columns:
+        mv = combined_summary.columns.get_loc('Market Value')
+        for i in range(len(cells) - 2):
+            cells[i][mv] = f"{float(cells[i][mv]):.3f}"
+
+    style = lambda row, col, text: {'fill': '#ADD8E6', 'weight': 'bold'} if row == len(combined_summary) else None
+    title = 'Holding Summary and Performance'
+
+    if pdf_doc is not None:
+        page = write_detail_page(pdf_doc, "Productwise Performance", title=title, stamp=stamp)
+        page.table(layout_table(cells, combined_summary.columns, bbox=(0.03, 0.25, 0.9, 0.5), style=style,
+                                measure=page.text_width))
+        pdf_doc.add(page)
+        return None
+
+    fig = detail_page("Productwise Performance", title=title, stamp=stamp)
     table_ax = fig.add_axes([0.03, 0.25, 0.9, 0.5])
     table_ax.axis('off')
-    
-    table = table_ax.table(
-        cellText=combined_summary.values,
-        colLabels=combined_summary.columns,
-        cellLoc='center',
-        loc='center',
-        bbox=[0, 0, 1, 1]
-    )
-    
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    table.auto_set_column_width(col=list(range(len(combined_summary.columns))))
-    
-    for (row, col), cell in table._cells.items():
-        cell.set_edgecolor('black')
-        if row == 0:  
-            cell.set_facecolor('#E6E6E6')
-            cell.set_text_props(weight='bold')
-        elif row == len(combined_summary):  
-            cell.set_facecolor('#ADD8E6')  
-            cell.set_text_props(weight='bold')
-        elif 'Market Value' in combined_summary.columns and col == combined_summary.columns.get_loc('Market Value'):
-            if row != len(combined_summary) - 1:  
-                cell.get_text().set_text(f"{float(cell.get_text().get_text()):.3f}")
-    
-    current_time = pd.Timestamp.now()
-    footer_text = (
-        "This document is not valid without disclosure, Please refer to the last page for the disclaimer. | "
-        "Strictly Private & Confidential.\n"
-        f"Incase of any query / feedback on the report, please write to query@motilaloswal.com. | "
-        f"Generated Date & Time : {current_time.strftime('%d-%b-%Y')} & {current_time.strftime('%I:%M %p')}"
-    )
-    
-    ax.text(0.5, 0.02, footer_text,
-            horizontalalignment='center',
-            fontsize=10,
-            color='#2F4F4F',
-            wrap=True)
-    
+    grid_table(table_ax, cells, combined_summary.columns, style=style)
     return fig
 
-def create_portfolio_table(df):
-    target_stocks = [
-        "Bajaj Finserv Ltd",
-        "Central Depository Services (India) Ltd",
-        "HDFC Bank Ltd",
-        "IDFC First Bank Ltd",
-        "Kotak Mahindra Bank Ltd",
-        "Shriram Finance Ltd",
-    ]
-    
-    equity_data = []
-    equity_section = False
-    for idx, row in df.iterrows():
-        if isinstance(row['Unnamed: 0'], str) and 'Equity' in row['Unnamed: 0']:
-            equity_section = True
-            continue
-        if equity_section and isinstance(row['Unnamed: 0'], str) and any(stock in row['Unnamed: 0'] for stock in target_stocks):
-            equity_data.append(row.tolist())
-        if equity_section and isinstance(row['Unnamed: 0'], str) and 'Total' in row['Unnamed: 0']:
-            equity_section = False
-    
-    cols = [
-        "Instrument Name", "Quantity", "Purchase Price", "Purchase Value",
-        "Market Price", "Market Value", "ST Qty", "ST G/L", "LT Qty", "LT G/L",
-        "Unrealised Gain/Loss", "Unrealised Gain/Loss %", "ISIN", "Unused_1", "Unused_2"
-    ]
-    equity = pd.DataFrame(equity_data, columns=df.columns)
-    equity.columns = cols
-    
-    if target_stocks:
-        equity = equity[equity["Instrument Name"].isin(target_stocks)]
-    
-    display_cols = [
-        "Instrument Name", "Quantity", "Purchase Price", "Purchase Value",
-        "Market Price", "Market Value", "Unrealised Gain/Loss",
-        "Unrealised Gain/Loss %", "ISIN"
-    ]
-    
-    fig = plt.figure(figsize=(15.8, 10))
-    ax = fig.add_subplot(111)
-    ax.set_position([0, 0, 1, 1])
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
-    
-    gradient = np.linspace(1, 0.9, 500).reshape(1, -1)
-    ax.imshow(gradient, extent=(0, 1, 0, 1), cmap='Blues', aspect='auto', alpha=0.3)
-    
+WATCHLIST = (
+    "Bajaj Finserv Ltd",
+    "Central Depository Services (India) Ltd",
+    "HDFC Bank Ltd",
+    "IDFC First Bank Ltd",
+    "Kotak Mahindra Bank Ltd",
+    "Shriram Finance Ltd",
+)
+
+def ld_watchlist(path=None):
+    # the env var and the file's mtime are read on every call, so a changed
+    # setting or an edited file is picked up; only the parse is cached
+    path = path or os.environ.get('REPORTIQ_WATCHLIST')
+    if not path:
+        return frozenset(WATCHLIST)
+    return _rd_watchlist(os.path.abspath(path), os.stat(path).st_mtime_ns)
+
+@lru_cache(maxsize=8)
+def _rd_watchlist(path, mtime):
+    with open(path, encoding='utf-8') as f:
+        return frozenset(
+            line.strip() for line in f
+            if line.strip() and not line.lstrip().startswith('#')
+        )
+
+def page_footer():
     current_date = pd.Timestamp.now().strftime('%d-%b-%Y')
     current_time = pd.Timestamp.now().strftime('%I:%M %p')
-    
-    ax.text(0.11, 0.915, 'Detailed Holdings and Performance', 
-            color='#CD0000', fontsize=28, fontweight='light')
-    ax.text(0.56, 0.92, f"For Period (As On {current_date})",
-            fontsize=12, color='#000000', weight='normal')
-    
-    ax.text(0.05, 0.77, "Equity - ", 
-            fontsize=16, fontweight='bold', color='#CD0000')
-    ax.text(0.12, 0.77, "Direct Equity", 
-            fontsize=16, fontweight='light', color='#666666')
-    ax.text(0.83, 0.77, "(Amount in Lacs)", 
-            fontsize=12, color='#666666')
-    ax.add_patch(plt.Rectangle((0.035, 0.77), 0.004, 0.015,
-                              facecolor='#CD0000'))
-    
-    try:
-        logo = plt.imread('logo.png')
-        logo_ax = fig.add_axes([0.79, 0.9, 0.2, 0.08])
-        logo_ax.imshow(logo)
-        logo_ax.axis('off')
-            
-        header = plt.imread('header.png')
-        header_ax = fig.add_axes([0.02, 0.77, 0.9, 0.3])
-        header_ax.imshow(header)
-        header_ax.axis('off')
-    except Exception as e:
-        print(f"Warning: Image loading error: {e}")
-    
-    table_data = equity[display_cols].values.tolist()
-    
-    table_ax = fig.add_axes([0.03, 0.25, 0.94, 0.5])
-    table_ax.axis('off')
-    
-    table = table_ax.table(
-        cellText=table_data,
-        colLabels=display_cols,
-        cellLoc='center',
-        loc='center',
-        bbox=[0, 0, 1, 1]
-    )
-    
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    
-    col_widths = [0.25] + [0.09375] * (len(display_cols) - 1)
-    for i, width in enumerate(col_widths):
-        table.auto_set_column_width([i])
-    
-    for (row, col), cell in table._cells.items():
-        cell.set_edgecolor('black')
-        
-        if row == 0:
-            cell.set_facecolor('#E6E6E6')
-            cell.set_text_props(weight='bold')
-        
-        if col == 0 and row != 0:
-            cell._loc = 'left'
-            
-        if row > 0 and col in [6, 7]:  
-            text = cell.get_text().get_text()
-            if text.startswith('(') or (text.replace('.','').replace('-','').isdigit() and float(text) < 0):
-                cell.get_text().set_color('red')
-    
-    footer_text = (
+    return (
         "This document is not valid without disclosure, Please refer to the last page for the disclaimer. | "
         "Strictly Private & Confidential.\n"
         f"Incase of any query / feedback on the report, please write to query@motilaloswal.com. | "
         f"Generated Date & Time : {current_date} & {current_time}"
     )
-    
-    ax.text(0.5, 0.02, footer_text,
-            horizontalalignment='center',
-            fontsize=10,
-            color='#2F4F4F',
-            wrap=True)
-    
-    return fig
 
-def analyze_fno_holdings(df):
-    fno_start = df[df.iloc[:, 0] == 'FnO:-'].index[0]
-    fno_end = df[df.iloc[:, 0] == 'Currency:-'].index[0]
-    
-    fno_data = df.iloc[fno_start+1:fno_end-4].copy()
-    fno_data.columns = fno_data.iloc[0]
-    fno_data = fno_data.iloc[1:]
-    fno_data = fno_data.reset_index(drop=True)
-    fno_data = fno_data.dropna(subset=['Instrument Name'])
-    
-    fig = plt.figure(figsize=(15.8, 10))
-    ax = fig.add_subplot(111)
-    ax.set_position([0, 0, 1, 1])
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
-    
-    gradient = np.linspace(1, 0.9, 500).reshape(1, -1)
-    ax.imshow(gradient, extent=(0, 1, 0, 1), cmap='Blues', aspect='auto', alpha=0.3)
+def detail_page(label, sub=None, label_color='#000000', title='Detailed Holdings and Performance', stamp=True):
+    fig, ax = chrome_fig((15.8, 10), footer=page_footer() if stamp else None)
     
     current_date = pd.Timestamp.now().strftime('%d-%b-%Y')
-    current_time = pd.Timestamp.now().strftime('%I:%M %p')
     
-    ax.text(0.11, 0.915, 'Detailed Holdings and Performance', 
+    ax.text(0.11, 0.915, title, 
             color='#CD0000', fontsize=28, fontweight='light')
     ax.text(0.56, 0.92, f"For Period (As On {current_date})",
             fontsize=12, color='#000000', weight='normal')
     
-    ax.text(0.05, 0.77, "Derivatives", 
-            fontsize=16, fontweight='bold', color='#000000')
+    ax.text(0.05, 0.77, label, 
+            fontsize=16, fontweight='bold', color=label_color)
+    if sub:
+        ax.text(0.12, 0.77, sub, 
+                fontsize=16, fontweight='light', color='#666666')
     ax.text(0.83, 0.77, "(Amount in Lacs)", 
             fontsize=12, color='#666666')
     ax.add_patch(plt.Rectangle((0.035, 0.77), 0.004, 0.015,
                               facecolor='#CD0000'))
     
-    try:
-        logo = plt.imread('logo.png')
-        logo_ax = fig.add_axes([0.79, 0.9, 0.2, 0.08])
-        logo_ax.imshow(logo)
-        logo_ax.axis('off')
-            
-        header = plt.imread('header.png')
-        header_ax = fig.add_axes([0.02, 0.77, 0.9, 0.3])
-        header_ax.imshow(header)
-        header_ax.axis('off')
-    except Exception as e:
-        print(f"Warning: Image loading error: {e}")
-    
-    columns = [
-        'Instrument Name', 'B/S', 'Quantity', 'Rate', 'Value',
-        'Market Price', 'Market Value', 'UnrealisedGain/Loss',
-        'Unrealised Gain/Loss%'
-    ]
-    
-    table_ax = fig.add_axes([0.03, 0.25, 0.94, 0.5])
-    table_ax.axis('off')
-    
-    table = table_ax.table(
-        cellText=fno_data[columns].values,
-        colLabels=columns,
-        cellLoc='center',
-        loc='center',
-        bbox=[0, 0, 1, 1]
-    )
-    
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    
-    col_widths = [0.25] + [0.09375] * (len(columns) - 1)
-    for i, width in enumerate(col_widths):
-        table.auto_set_column_width([i])
-    
-    for (row, col), cell in table._cells.items():
-        cell.set_edgecolor('black')
-        
-        if row == 0:
-            cell.set_facecolor('#E6E6E6')
-            cell.set_text_props(weight='bold')
-        
-        if col == 0 and row != 0:
-            cell._loc = 'left'
-            
-        if row > 0 and col in [7, 8]:  
-            text = cell.get_text().get_text()
-            if text.startswith('(') or (text.replace('.','').replace('-','').isdigit() and float(text) < 0):
-                cell.get_text().set_color('red')
-    
-    footer_text = (
-        "This document is not valid without disclosure, Please refer to the last page for the disclaimer. | "
-        "Strictly Private & Confidential.\n"
-        f"Incase of any query / feedback on the report, please write to query@motilaloswal.com. | "
-        f"Generated Date & Time : {current_date} & {current_time}"
-    )
-    
-    ax.text(0.5, 0.02, footer_text,
-            horizontalalignment='center',
-            fontsize=10,
-            color='#2F4F4F',
-            wrap=True)
-    
     return fig
 
-def eqmf(df):
-    eq_strt = df[df.iloc[:, 0] == 'Mutual Fund:-'].index[0]
-    eq_end = df[df.iloc[:, 0] == 'FnO:-'].index[0]
-    
-    eq_data = df.iloc[eq_strt+1:eq_end-4].copy()
-    eq_data.columns = eq_data.iloc[0]
-    eq_data = eq_data.iloc[1:]
-    eq_data = eq_data.reset_index(drop=True)
-    eq_data = eq_data[~eq_data['Asset Type'].isin(['Debt']) & ~eq_data['Asset Type'].isna()]
-    
-    fig = plt.figure(figsize=(15.8, 10))
-    ax = fig.add_subplot(111)
-    ax.set_position([0, 0, 1, 1])
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
-    
-    gradient = np.linspace(1, 0.9, 500).reshape(1, -1)
-    ax.imshow(gradient, extent=(0, 1, 0, 1), cmap='Blues', aspect='auto', alpha=0.3)
-    
+def write_detail_page(doc, label, sub=None, label_color='#000000', title='Detailed Holdings and Performance',
+                      stamp=True):
+    # detail_page drawn straight to PDF; same size as the tight-bbox figure
+    page = doc.page((15.8, 10), pad=0.1)
+    page.gradient()
     current_date = pd.Timestamp.now().strftime('%d-%b-%Y')
-    current_time = pd.Timestamp.now().strftime('%I:%M %p')
 
-    ax.text(0.11, 0.915, 'Detailed Holdings and Performance', 
-            color='#CD0000', fontsize=28, fontweight='light')
-    ax.text(0.56, 0.92, f"For Period (As On {current_date})",
-            fontsize=12, color='#000000', weight='normal')
+    page.text(0.11, 0.915, title, size=28, color='#CD0000')
+    page.text(0.56, 0.92, f"For Period (As On {current_date})", size=12, color='#000000')
+    page.text(0.05, 0.77, label, size=16, weight='bold', color=label_color)
+    if sub:
+        page.text(0.12, 0.77, sub, size=16, color='#666666')
+    page.text(0.83, 0.77, "(Amount in Lacs)", size=12, color='#666666')
+    page.rect(0.035, 0.77, 0.004, 0.015, '#CD0000')
+    if stamp:
+        page.text(0.5, 0.02, page_footer(), size=10, color=FOOTER_COLOR, ha='center')
+    page.chrome()
+    return page
+
+def _section_figs(pages, label, sub, label_color, red_cols, stamp):
+    # yields one figure per page so callers can save and close each before
+    # the next is built
+    for page in pages:
+        fig = detail_page(label, sub, label_color, stamp=stamp)
+        draw_table(fig, page, red_cols)
+        yield fig
+
+def section_pages(data, columns, label, sub=None, label_color='#000000', sum_cols=(), red_cols=(), pdf_doc=None,
+                  stamp=True):
+    pages = paginate(data, columns, sum_cols)
+    if pdf_doc is None:
+        return _section_figs(pages, label, sub, label_color, red_cols, stamp)
+
+    for page in pages:
+        out = write_detail_page(pdf_doc, label, sub, label_color, stamp=stamp)
+        write_table(out, page, red_cols)
+        pdf_doc.add(out)
+
+EQUITY_SUMS = ["Purchase Value", "Market Value", "Unrealised Gain/Loss"]
+FNO_SUMS = ['Value', 'Market Value', 'UnrealisedGain/Loss']
+MF_SUMS = ['Purchase Value', 'Market Value', 'ST G/L', 'LT G/L', 'Dividend', 'Unrealised GainLoss']
+
+def create_portfolio_table(df, watchlist=None, pdf_doc=None, stamp=True):
+    watchlist = ld_watchlist() if watchlist is None else watchlist
+    
+    doc = as_doc(df)
+    rows = doc.raw.iloc[doc.equity_rows]
+    equity = rows[rows.iloc[:, 0].isin(list(watchlist))].copy()
     
-    ax.text(0.05, 0.77, "Equity - ", 
-            fontsize=16, fontweight='bold', color='#CD0000')
-    ax.text(0.12, 0.77, "Mutual Fund", 
-            fontsize=16, fontweight='light', color='#666666')
-    ax.text(0.83, 0.77, "(Amount in Lacs)", 
-            fontsize=12, color='#666666')
-    ax.add_patch(plt.Rectangle((0.035, 0.77), 0.004, 0.015,
-                              facecolor='#CD0000'))
+    cols = [
+        "Instrument Name", "Quantity", "Purchase Price", "Purchase Value",
+        "Market Price", "Market Value", "ST Qty", "ST G/L", "LT Qty", "LT G/L",
+        "Unrealised Gain/Loss", "Unrealised Gain/Loss %", "ISIN", "Unused_1", "Unused_2"
+    ]
+    equity.columns = cols
     
-    try:
-        logo = plt.imread('logo.png')
-        logo_ax = fig.add_axes([0.79, 0.9, 0.2, 0.08])
-        logo_ax.imshow(logo)
-        logo_ax.axis('off')
-            
-        header = plt.imread('header.png')
-        header_ax = fig.add_axes([0.02, 0.77, 0.9, 0.3])
-        header_ax.imshow(header)
-        header_ax.axis('off')
-    except Exception as e:
-        print(f"Warning: Image loading error: {e}")
-        
+    display_cols = [
+        "Instrument Name", "Quantity", "Purchase Price", "Purchase Value",
+        "Market Price", "Market Value", "Unrealised Gain/Loss",
+        "Unrealised Gain/Loss %", "ISIN"
+    ]
     
-    columns = [
-        'Scheme Name', 'Units', 'Purchase NAV', 'Purchase Value', 'Current NAV',
-        'Market Value', 'ST Qty', 'ST G/L', 'LT Qty', 'LT G/L', 'Dividend','Unrealised GainLoss',
-        'Unrealised GainLoss Per'
-    ]        
+    return section_pages(equity, display_cols, "Equity - ", "Direct Equity", '#CD0000',
+                         EQUITY_SUMS, red_cols=[6, 7], pdf_doc=pdf_doc, stamp=stamp)
 
-    table_ax = fig.add_axes([0.03, 0.25, 0.94, 0.5])
-    table_ax.axis('off')
-    
-    table = table_ax.table(
-        cellText=eq_data[columns].values,
-        colLabels=columns,
-        cellLoc='center',
-        loc='center',
-        bbox=[0, 0, 1, 1]
-    )
-    
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
+def analyze_fno_holdings(df, pdf_doc=None, stamp=True):
+    fno_data = as_doc(df).fno.dropna(subset=['Instrument Name'])
     
-    col_widths = [0.25] + [0.09375] * (len(columns) - 1)
-    for i, width in enumerate(col_widths):
-        table.auto_set_column_width([i])
-    
-    for (row, col), cell in table._cells.items():
-        cell.set_edgecolor('black')
-        
-        if row == 0:
-            cell.set_facecolor('#E6E6E6')
-            cell.set_text_props(weight='bold')
-        
-        if col == 0 and row != 0:
-            cell._loc = 'left'
-            
-        if row > 0 and col in [7, 8]:  
-            text = cell.get_text().get_text()
-            if text.startswith('(') or (text.replace('.','').replace('-','').isdigit() and float(text) < 0):
-                cell.get_text().set_color('red')
-    
-    footer_text = (
-        "This document is not valid without disclosure, Please refer to the last page for the disclaimer. | "
-        "Strictly Private & Confidential.\n"
-        f"Incase of any query / feedback on the report, please write to query@motilaloswal.com. | "
-        f"Generated Date & Time : {current_date} & {current_time}"
-    )
-    
-    ax.text(0.5, 0.02, footer_text,
-            horizontalalignment='center',
-            fontsize=10,
-            color='#2F4F4F',
-            wrap=True)
+    columns = [
+        'Instrument Name', 'B/S', 'Quantity', 'Rate', 'Value',
+        'Market Price', 'Market Value', 'UnrealisedGain/Loss',
+        'Unrealised Gain/Loss%'
+    ]
     
-    return fig
+    return section_pages(fno_data, columns, "Derivatives", sum_cols=FNO_SUMS, red_cols=[7, 8], pdf_doc=pdf_doc,
+                         stamp=stamp)
 
-def dmf(df):
-    d_strt = df[df.iloc[:, 0] == 'Mutual Fund:-'].index[0]
-    d_end = df[df.iloc[:, 0] == 'FnO:-'].index[0]
-    
-    d_data = df.iloc[d_strt+1:d_end-4].copy()
-    d_data.columns = d_data.iloc[0]
-    d_data = d_data.iloc[1:]
-    d_data = d_data.reset_index(drop=True)
-    d_data = d_data[~d_data['Asset Type'].isin(['Equity']) & ~d_data['Asset Type'].isna()]
-    
-    fig = plt.figure(figsize=(15.8, 10))
-    ax = fig.add_subplot(111)
-    ax.set_position([0, 0, 1, 1])
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
-    
-    gradient = np.linspace(1, 0.9, 500).reshape(1, -1)
-    ax.imshow(gradient, extent=(0, 1, 0, 1), cmap='Blues', aspect='auto', alpha=0.3)
-    
-    current_date = pd.Timestamp.now().strftime('%d-%b-%Y')
-    current_time = pd.Timestamp.now().strftime('%I:%M %p')
+MF_COLUMNS = [
+    'Scheme Name', 'Units', 'Purchase NAV', 'Purchase Value', 'Current NAV',
+    'Market Value', 'ST Qty', 'ST G/L', 'LT Qty', 'LT G/L', 'Dividend','Unrealised GainLoss',
+    'Unrealised GainLoss Per'
+]
 
-    ax.text(0.11, 0.915, 'Detailed Holdings and Performance', 
-            color='#CD0000', fontsize=28, fontweight='light')
-    ax.text(0.56, 0.92, f"For Period (As On {current_date})",
-            fontsize=12, color='#000000', weight='normal')
-    
-    ax.text(0.05, 0.77, "Debt - ", 
-            fontsize=16, fontweight='bold', color='#CD0000')
-    ax.text(0.12, 0.77, "Mutual Fund", 
-            fontsize=16, fontweight='light', color='#666666')
-    ax.text(0.83, 0.77, "(Amount in Lacs)", 
-            fontsize=12, color='#666666')
-    ax.add_patch(plt.Rectangle((0.035, 0.77), 0.004, 0.015,
-                              facecolor='#CD0000'))
-    
-    try:
-        logo = plt.imread('logo.png')
-        logo_ax = fig.add_axes([0.79, 0.9, 0.2, 0.08])
-        logo_ax.imshow(logo)
-        logo_ax.axis('off')
-            
-        header = plt.imread('header.png')
-        header_ax = fig.add_axes([0.02, 0.77, 0.9, 0.3])
-        header_ax.imshow(header)
-        header_ax.axis('off')
-    except Exception as e:
-        print(f"Warning: Image loading error: {e}")
-        
-    
-    columns = [
-        'Scheme Name', 'Units', 'Purchase NAV', 'Purchase Value', 'Current NAV',
-        'Market Value', 'ST Qty', 'ST G/L', 'LT Qty', 'LT G/L', 'Dividend','Unrealised GainLoss',
-        'Unrealised GainLoss Per'
-    ]        
+def eqmf(df, pdf_doc=None, stamp=True):
+    eq_data = as_doc(df).mf_equity
+    return section_pages(eq_data, MF_COLUMNS, "Equity - ", "Mutual Fund", '#CD0000', MF_SUMS, red_cols=[7, 8], pdf_doc=pdf_doc,
+                         stamp=stamp)
 
-    table_ax = fig.add_axes([0.03, 0.25, 0.94, 0.5])
-    table_ax.axis('off')
-    
-    table = table_ax.table(
-        cellText=d_data[columns].values,
-        colLabels=columns,
-        cellLoc='center',
-        loc='center',
-        bbox=[0, 0, 1, 1]
-    )
-    
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    
-    col_widths = [0.25] + [0.09375] * (len(columns) - 1)
-    for i, width in enumerate(col_widths):
-        table.auto_set_column_width([i])
-    
-    for (row, col), cell in table._cells.items():
-        cell.set_edgecolor('black')
-        
-        if row == 0:
-            cell.set_facecolor('#E6E6E6')
-            cell.set_text_props(weight='bold')
-        
-        if col == 0 and row != 0:
-            cell._loc = 'left'
-            
-        if row > 0 and col in [7, 8]:  
-            text = cell.get_text().get_text()
-            if text.startswith('(') or (text.replace('.','').replace('-','').isdigit() and float(text) < 0):
-                cell.get_text().set_color('red')
-    
-    footer_text = (
-        "This document is not valid without disclosure, Please refer to the last page for the disclaimer. | "
-        "Strictly Private & Confidential.\n"
-        f"Incase of any query / feedback on the report, please write to query@motilaloswal.com. | "
-        f"Generated Date & Time : {current_date} & {current_time}"
-    )
-    
-    ax.text(0.5, 0.02, footer_text,
-            horizontalalignment='center',
-            fontsize=10,
-            color='#2F4F4F',
-            wrap=True)
-    
-    return fig
-    
\ No newline at end of file
+def dmf(df, pdf_doc=None, stamp=True):
+    d_data = as_doc(df).mf_debt
+    return section_pages(d_data, MF_COLUMNS, "Debt - ", "Mutual Fund", '#CD0000', MF_SUMS, red_cols=[7, 8], pdf_doc=pdf_doc,
+                         stamp=stamp)
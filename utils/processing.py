@@ -1,11 +1,34 @@
+import io
+import os
+import zipfile
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from tkinter import messagebox
-from typing import List, Tuple
+from typing import Dict, Iterator, List, Tuple
+from openpyxl import load_workbook
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+from utils.cache import file_hash, get_sheets, put_sheets
+from utils.ops import Prog, REQ_FILES, XL_EXTS, chk_files
+from utils.schema import conform, read_csv
+from utils.trace import span
 
-def ld_data(files: List[Tuple[str, int, str]], req: List[str], out: Path) -> dict:
+XL_WORKERS = int(os.environ.get('REPORTIQ_XL_WORKERS', min(4, os.cpu_count() or 1)))
+FILE_WORKERS = int(os.environ.get('REPORTIQ_FILE_WORKERS', os.cpu_count() or 1))
+XL_MEM_MB = int(os.environ.get('REPORTIQ_XL_MEM_MB', 1024))
+
+def rd_data(files: List[Tuple[str, int, str]], req: List[str], out: Path = None,
+            frames: Dict[str, pd.DataFrame] = None) -> dict:
     data = {}
     for fname in req:
+        if frames and fname in frames:
+            try:
+                data[fname.replace('.csv', '')] = conform(frames[fname], fname)
+            except Exception as e:
+                raise ValueError(f"Could not load {fname}: {str(e)}") from e
+            continue
+
         fpath = None
         
         for n, _, p in files:
@@ -13,49 +36,229 @@ def ld_data(files: List[Tuple[str, int, str]], req: List[str], out: Path) -> dic
                 fpath = p
                 break
         
-        if not fpath:
+        if not fpath and out is not None:
+            if any(n.lower().endswith(XL_EXTS) for n, _, _ in files):
+                # the uploaded workbooks are the source; a CSV left in out by
+                # an earlier conversion may be stale or another client's
+                raise FileNotFoundError(f"Missing required file: {fname}. Convert the uploaded workbooks again.")
             conv_p = out / fname
             if conv_p.exists():
                 fpath = conv_p
         
-        if fpath:
-            try:
-                data[fname.replace('.csv', '')] = pd.read_csv(fpath)
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not load {fname}: {str(e)}")
-                return None
-        else:
-            messagebox.showerror("Error", f"Missing required file: {fname}")
-            return None
+        if not fpath:
+            raise FileNotFoundError(f"Missing required file: {fname}")
+
+        try:
+            with span('load', file=fname):
+                data[fname.replace('.csv', '')] = read_csv(fpath, fname)
+        except Exception as e:
+            raise ValueError(f"Could not load {fname}: {str(e)}") from e
     
     return data
 
-def xl_to_csv(fp: str, out: Path) -> List[str]:
+def ld_data(files: List[Tuple[str, int, str]], req: List[str], out: Path,
+            frames: Dict[str, pd.DataFrame] = None) -> dict:
     try:
-        xl = pd.ExcelFile(fp, engine="openpyxl")
-        cvt = []
-        
-        for sht in xl.sheet_names:
-            df = xl.parse(sht)
-            csv_name = out / f"{sht}.csv"
-            df.to_csv(csv_name, index=False)
-            cvt.append(csv_name.name)
-        
-        return cvt
+        return rd_data(files, req, out, frames)
+    except (FileNotFoundError, ValueError) as e:
+        messagebox.showerror("Error", str(e))
+        return None
+
+def _cell(v):
+    if v is None:
+        return ''
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+def rd_sheet(ws, prog=None) -> pd.DataFrame:
+    rows = []
+    width = 0
+    last = -1
+    for i, vals in enumerate(ws.iter_rows(values_only=True)):
+        if prog is not None:
+            prog()
+        row = [_cell(v) for v in vals]
+        while row and row[-1] == '':
+            row.pop()
+        if row:
+            last = i
+            width = max(width, len(row))
+        rows.append(row)
+    del rows[last + 1:]
+
+    if not rows:
+        return pd.DataFrame()
+    for row in rows:
+        row.extend([''] * (width - len(row)))
+
+    try:
+        return TextParser(rows, header=0, skip_blank_lines=False).read()
+    except EmptyDataError:
+        return pd.DataFrame()
+
+class SheetError(ValueError):
+    def __init__(self, fp: str, errors: Dict[str, str], frames: Dict[str, pd.DataFrame]):
+        self.fp = fp
+        self.errors = errors
+        self.frames = frames
+        detail = '; '.join(f"sheet '{sht}': {err}" for sht, err in errors.items())
+        super().__init__(f"Error converting {Path(fp).name}: {detail}")
+
+    def __reduce__(self):
+        return SheetError, (self.fp, self.errors, self.frames)
+
+class _Counted(io.RawIOBase):
+    def __init__(self, f, prog):
+        self.f = f
+        self.prog = prog
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = self.f.readinto(b)
+        if n:
+            self.prog(n)
+        return n
+
+def _open_wb(fp: str):
+    return load_workbook(fp, read_only=True, data_only=True, keep_links=False)
+
+def conv_sheet(fp: str, title: str, out: Path = None, prog: Prog = None) -> pd.DataFrame:
+    with span('convert_sheet', file=Path(fp).name, sheet=title):
+        wb = _open_wb(fp)
+        try:
+            df = rd_sheet(wb[title], prog)
+        finally:
+            wb.close()
+            if prog is not None:
+                prog.flush()
+    if out is not None:
+        df.to_csv(Path(out) / f"{title}.csv", index=False)
+    return df
+
+def xl_workers(fp: str) -> int:
+    # Every sheet worker opens the workbook itself; read-only mode streams
+    # the rows but loads all shared strings, and a sheet's frame peaks near
+    # 1.5x its XML. Allow as many workers as fit in XL_MEM_MB together.
+    try:
+        with zipfile.ZipFile(fp) as z:
+            sizes = {i.filename: i.file_size for i in z.infolist()}
+    except (OSError, zipfile.BadZipFile):
+        return XL_WORKERS
+    strings = sum(n for name, n in sizes.items() if name.endswith('sharedStrings.xml'))
+    sheet = max((n for name, n in sizes.items() if name.startswith('xl/worksheets/')), default=0)
+    per = (2 * strings + 1.5 * sheet) / (1024 * 1024)
+    return max(1, int(XL_MEM_MB // max(per, 1)))
+
+def conv_sheets(fp: str, titles: List[str], out: Path = None, workers: int = None, prog: Prog = None):
+    workers = min(workers or XL_WORKERS, len(titles), xl_workers(fp))
+    frames, errors = {}, {}
+    if workers <= 1:
+        for title in titles:
+            try:
+                frames[f"{title}.csv"] = conv_sheet(fp, title, out, prog)
+            except Exception as e:
+                errors[title] = str(e)
+        return frames, errors
+
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futs = [(title, ex.submit(conv_sheet, fp, title, out, prog)) for title in titles]
+        for title, fut in futs:
+            try:
+                frames[f"{title}.csv"] = fut.result()
+            except Exception as e:
+                errors[title] = str(e)
+    return frames, errors
+
+def xl_to_frames(fp: str, req: List[str] = None, use_cache: bool = True, out: Path = None,
+                 workers: int = None, prog: Prog = None) -> Dict[str, pd.DataFrame]:
+    digest = file_hash(fp) if use_cache else None
+    if digest:
+        frames = get_sheets(digest, req)
+        if frames is not None:
+            if out is not None:
+                exp_csv(frames, out)
+            if prog is not None:
+                prog.total(1)
+                prog(1)
+                prog.flush()
+            return frames
+
+    try:
+        wb = _open_wb(fp)
+        sheets = [f"{ws.title}.csv" for ws in wb.worksheets]
+        wss = [ws for ws in wb.worksheets if req is None or f"{ws.title}.csv" in req]
+        titles = [ws.title for ws in wss]
+        rows = sum(ws.max_row or 0 for ws in wss)
+        wb.close()
     except Exception as e:
-        raise Exception(f"Error converting {fp} to CSV: {str(e)}")
+        raise Exception(f"Error converting {fp}: {str(e)}")
 
-def chk_files(files: List[Tuple[str, int, str]], req: List[str], out: Path) -> bool:
-    exist = {n for n, _, _ in files}
-    if out.exists():
-        exist.update(f.name for f in out.glob('*.csv'))
-    
-    miss = set(req) - exist
-    if miss:
-        messagebox.showerror(
-            "Missing Files",
-            f"The following required files are missing:\n{', '.join(miss)}"
-        )
-        return False
-    
-    return True
\ No newline at end of file
+    if prog is not None:
+        prog.total(rows)
+    frames, errors = conv_sheets(fp, titles, out, workers, prog)
+
+    if digest:
+        try:
+            put_sheets(digest, frames, sheets)
+        except OSError as e:
+            print(f"Warning: could not cache converted sheets of {fp}: {e}")
+    if errors:
+        raise SheetError(fp, errors, frames)
+    return frames
+
+def conv_file(n: str, p: str, req: List[str] = None, prog: Prog = None,
+              workers: int = None) -> Dict[str, pd.DataFrame]:
+    if n.lower().endswith(XL_EXTS):
+        with span('convert', file=n):
+            return xl_to_frames(p, req, workers=workers, prog=prog)
+
+    try:
+        with span('load', file=n):
+            if prog is None:
+                return {n: read_csv(p, n)}
+            prog.total(os.path.getsize(p))
+            with open(p, 'rb', buffering=0) as f:
+                return {n: read_csv(io.BufferedReader(_Counted(f, prog), 1 << 20), n)}
+    except Exception as e:
+        raise ValueError(f"Could not load {n}: {str(e)}") from e
+    finally:
+        if prog is not None:
+            prog.flush()
+
+def conv_files(files: List[Tuple[str, int, str]], req: List[str] = None, q=None,
+               workers: int = None) -> Iterator[Tuple[int, Dict[str, pd.DataFrame], Exception]]:
+    # Yields (index, frames, error) per file as each finishes; progress for
+    # file i is posted on q (a Manager queue) under key i.
+    if not files:
+        return
+    workers = min(workers or FILE_WORKERS, len(files))
+    sheet_workers = max(1, XL_WORKERS // workers)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futs = {
+            ex.submit(conv_file, n, p, req, Prog(q, i) if q is not None else None, sheet_workers): i
+            for i, (n, _, p) in enumerate(files)
+        }
+        for fut in as_completed(futs):
+            try:
+                yield futs[fut], fut.result(), None
+            except Exception as e:
+                yield futs[fut], getattr(e, 'frames', {}), e
+
+def rd_frames(files: List[Tuple[str, int, str]], req: List[str] = None,
+              workers: int = None) -> Dict[str, pd.DataFrame]:
+    frames = {}
+    for n, _, p in files:
+        frames.update(conv_file(n, p, req, workers=workers))
+    return frames
+
+def exp_csv(frames: Dict[str, pd.DataFrame], out: Path) -> List[str]:
+    for name, df in frames.items():
+        df.to_csv(out / name, index=False)
+    return list(frames)
+
+def xl_to_csv(fp: str, out: Path, workers: int = None, use_cache: bool = True) -> List[str]:
+    with span('convert', file=Path(fp).name):
+        return list(xl_to_frames(fp, use_cache=use_cache, out=out, workers=workers))
@@ -4,22 +4,39 @@ from utils.plotting import (
     create_portfolio_table,
     eqmf,
     analyze_fno_holdings,
-    dmf
+    dmf,
+    ld_watchlist,
+    page_footer
 )
 from matplotlib.backends.backend_pdf import PdfPages
 import matplotlib.pyplot as plt
+from matplotlib.transforms import Bbox
 import pandas as pd
-import numpy as np
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from utils.cache import evict_pages, get_page, put_page, value_hash
+from utils.chrome import FOOTER_COLOR, chrome_fig
+from utils.holding import as_doc, parse_holding
+from utils.ops import cache_dir, del_f
+from utils.pdf import can_merge, asm_pdf, pdf_pages
+from utils.pdfwrite import PdfDoc
+from utils.tables import ROWS_PER_PAGE, layout_table
+from utils.trace import collected, merge, profiled, span, tag, traced_pdf, traced_run
 
 def get_customer_details(holding_df):
-    client_row = holding_df[holding_df['Unnamed: 0'] == 'Client Equity Code/UCID/Name']
+    doc = as_doc(holding_df)
+    client_info = doc.client_info
     
-    if client_row.empty:
+    if doc.clients > 1:
+        raise ValueError(f"Holding data covers {doc.clients} clients; split it into one file per client first "
+                         f"(split_holding.py)")
+    if client_info is None:
         raise ValueError("Could not find client information row in the Holding dataframe")
     
-    client_info = client_row['Unnamed: 1'].iloc[0]
-    
     parts = client_info.split('/')
     if len(parts) != 3:
         raise ValueError(f"Unexpected format in client information: {client_info}")
@@ -29,33 +46,25 @@ def get_customer_details(holding_df):
     
     return customer_name, ucid
 
-def create_cover_page(pdf, customer_name, ucid):
-    fig = plt.figure(figsize=(16, 10))
-    ax = fig.add_subplot(111)
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
-
-    gradient = np.linspace(1, 0.9, 500).reshape(1, -1)
-    ax.imshow(
-        gradient,
-        extent=(0, 1, 0, 1),
-        cmap='Blues',
-        aspect='auto',
-        alpha=0.3
+def footer_text():
+    current_date = pd.Timestamp.now().strftime('%d-%b-%Y')
+    return (
+        "This document is not valid without disclosure, please refer to the last page for the disclaimer. | "
+        "Strictly Private & Confidential.\n"
+        f"Incase of any query / feedback on the report, please write to query@motilaloswal.com. | "
+        f"Generated Date & Time : {current_date} | {pd.Timestamp.now().strftime('%I:%M %p')}"
     )
-    
-    logo_img = plt.imread('logo.png')
-    logo_ax = fig.add_axes([0.78, 0.88, 0.2, 0.08])  
-    logo_ax.imshow(logo_img)
-    logo_ax.axis('off')
 
+def draw_footer(ax, y=0.02, fontsize=10):
     ax.text(
-        0.04, 0.92, "CUSTOMER STATEMENT",
-        fontsize=32, color='#8B0000',
-        weight='light'
+        0.5, y, footer_text(),
+        horizontalalignment='center',
+        fontsize=fontsize,
+        color=FOOTER_COLOR,
+        wrap=True
     )
 
+def draw_cover_stamp(ax, customer_name, ucid):
     current_date = pd.Timestamp.now().strftime('%d-%b-%Y')
     ax.text(
         0.045, 0.88,  
@@ -66,20 +75,20 @@ def create_cover_page(pdf, customer_name, ucid):
     ax.text(0.05, 0.6, customer_name, fontsize=28, color='#2F4F4F', weight='bold')  
     ax.text(0.05, 0.55, f"UCID : {ucid}", fontsize=20, color='#2F4F4F') 
 
-    footer_text = (
-        "This document is not valid without disclosure, please refer to the last page for the disclaimer. | "
-        "Strictly Private & Confidential.\n"
-        f"Incase of any query / feedback on the report, please write to query@motilaloswal.com. | "
-        f"Generated Date & Time : {current_date} | {pd.Timestamp.now().strftime('%I:%M %p')}"
-    )
+    draw_footer(ax, y=0.1, fontsize=12)
+
+def create_cover_page(pdf, customer_name, ucid, stamp=True):
+    fig, ax = chrome_fig((16, 10), 'cover')
+
     ax.text(
-        0.5, 0.1, footer_text,
-        horizontalalignment='center',
-        fontsize=12,
-        color='#2F4F4F',
-        wrap=True
+        0.04, 0.92, "CUSTOMER STATEMENT",
+        fontsize=32, color='#8B0000',
+        weight='light'
     )
 
+    if stamp:
+        draw_cover_stamp(ax, customer_name, ucid)
+
     ax.text(
         0.056, 0.23, "WINNING PORTFOLIOS",
         fontsize=14,
@@ -98,220 +107,177 @@ def create_cover_page(pdf, customer_name, ucid):
         )
     )
 
-    footer_img = plt.imread('footer.png')
-    footer_logo_ax = fig.add_axes([0.23, 0.12, 0.8, 0.2])  
-    footer_logo_ax.imshow(footer_img)
-    footer_logo_ax.axis('off')
-
-    plt.subplots_adjust(top=1, bottom=0, left=0, right=1, hspace=0, wspace=0)
     pdf.savefig(fig, bbox_inches=None, pad_inches=0)
     plt.close(fig)
 
-def create_footer_page(pdf):
-    fig = plt.figure(figsize=(16, 10))
-    ax = fig.add_subplot(111)
-    
-    ax.set_position([0, 0, 1, 1])
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
+NOTES_TEXT = (
+    "1. All valuation as on last available Price / NAV.\n\n"
+    "2. Unrealised Gain / Loss = Market Value - Investment at cost. It does not account for Dividend / Interest Paid out. XIRR will be frozen for that day till next valuation is available.\n\n"
+    "3. XIRR and Benchmark Values are calculated on balance units for open scripts / folios. In case there are reinvestments in a prior closed script / folio, then all historical cashflow of that script / foliow will be considered\n\n     for XIRR & Benchmark Calculations.\n\n"
+    "4. All Private Equity Funds(RE) and Real Estate Funds(RE) are classified as Alternates (Unquoted).Since Quoted Valuations of PE & RE Funds are not available its Market value is computed as Total Drawdown(Cost) -\n\n    Capital Returned.XIRR and benchmarks are not computed for PE & RE Funds.\n\n"
+    "5. If bifurcation between Capital Return & Profit is not provided by Manufacturers for AIF / PE / RE distribution, they will appear as Profit / Unallocated distribution in report.\n\n"
+    "6. Net investments for PMS might not match with AMC statement due to difference in calculation methodology.In case if cost in folio is less than equal to zero and Market Value is less than 50000, we will consider this\n\n    as a cloud investment and will not appear in report.\n\n"
+    "7. For Mutual Funds, less than 1 units or fraction unit is considered as closed.\n\n"
+    "8. Capital Gain / (Loss) – for Equity Stocks / Mutual Fund: Short Term < 1 Year, Long Term > 1 Year; & for Debt Mutual Fund Only, Short Term < 3 Years, Long Term > 3 Years. Long Term Capital Gains (LTCG) and Short\n\n     Term Capital Gains (STCG) does not account for Exit Loads.\n\n"
+    "9. Interest accrued - all unpaid interest is accrued on FV from the last Interest Payment date.\n\n"
+    "10. Bonds & Other listed instruments: Valuation of instruments that are actively traded on the exchange will be shown at the market price. Due to market dependent bid - ask spreads,the availability of the price\n\n      displayed cannot be guaranteed. For debt instruments which are not actively traded on the exchange, valuation will be shown at Face Value.\n\n"
+    "11. For Direct equity transactions, balance quantity is adjusted on trade date, while the Demat Service provider may account for it within T + 3 days.\n\n"
+    "12. Any case where DP is not with Motilal Oswal Financial Services Limited, all stock trades will be squared off at the end of day.\n\n"
+    "13. In Case of a corporate action on a Direct Equity Stock, Holdings in Report might not Tally with DP due to delay in receiving corporate action transactions in DP.\n\n"
+    "14. In case of any security held as collateral, this will appear in the client portfolio and might not tally with actual DP holdings.\n\n"
+    "15. Unit rate of Stocks acquired in ESOP / bought via other brokers / Off Market Transfers might not tally with actual buying price. Please contact your Advisor to update the same.\n\n"
+    "16. Since values are displayed in Lakhs, total of individual rows might not match with Grand Total Row on account of rounding off differences.\n\n"
+    "17. In case of IPO issue price declared will be taken as cost.\n\n"
+    "18. Arbitrage Funds are classified in the report as Debt based on underlying risk. This differs from SEBI classification.\n\n"
+    "19. Benchmark XIRR calculations are done by imitating the cash flows of each security on underlying benchmark (as per benchmark list).\n\n"
+    "20. The ledger balances depicted above is held with Motilal Oswal Financial Services Limited: No changes.\n\n"
+    "21. The Bank balances depicted above are held with HDFC Bank having Power of Attorney with Motilal Oswal Wealth Limited/HDFC Custody.\n\n"
+    "22. We are showing the Bank and Ledger balances August 1st, 2023 onwards. We are not displaying back-dated bank and ledger balances.\n\n"
+)
 
-    gradient = np.linspace(1, 0.9, 500).reshape(1, -1)
-    ax.imshow(
-        gradient,
-        extent=(0, 1, 0, 1),
-        cmap='Blues',
-        aspect='auto',
-        alpha=0.3
-    )
+BENCH_INDICES = [
+    ['List of Indices', ''],
+    ['All Direct Equity / Stocks', 'Nifty 50'],
+    ['All Bonds', 'CRISIL Composite Bond Fund Index'],
+    ['All Structure Products', 'Crisil Short Term Bond Fund Index']
+]
+
+BENCH_MF = [
+    ['List of Mutual Fund Indices', ''],
+    ['Mutual Fund Categories', 'Benchmark'],
+    ['Equity Savings Fund', 'Nifty Equity Saving TRI'],
+    ['Thematic Fund', 'Nifty 500 TRI'],
+    ['Arbitrage Fund', 'Nifty 50 Arbitrage'],
+    ['Banking and PSU', 'CRISIL Short Term Bond Fund Index'],
+    ['Corporate Bond', 'Crisil Composite Bond Fund Index'],
+    ['Credit Risk', 'Crisil Short Term Bond Fund Index'],
+    ['Debt Hybrid Fund', 'Crisil Short Term Bond Fund Index'],
+    ['Dynamic Bond Fund', 'Crisil Composite Bond Fund Index'],
+    ['ELSS', 'Nifty 500 TRI'],
+    ['Equity Hybrid Fund', 'CRISIL Hybrid 35+65 - Aggressive Index'],
+    ['Fixed Maturity Fund', 'Crisil Short Term Bond Fund Index'],
+    ['Flexi Cap Fund', 'Nifty 500 TRI'],
+    ['Floating Rate Fund', 'Crisil Short Term Bond Fund Index'],
+    ['GILT Fund', 'CRISIL GILT Index'],
+    ['GOLD FUND', 'MCX GOLD SPOT'],
+    ['Income Fund', 'Crisil Composite Bond Fund Index'],
+    ['International Fund', 'S&P 500 INR'],
+    ['Large Cap Fund', 'Nifty 50 TRI'],
+    ['Liquid Fund', 'Crisil Liquid Fund Index'],
+    ['Long Duration', 'Crisil Composite Bond Fund Index'],
+    ['Low Duration', 'Crisil Liquid Fund Index'],
+    ['Medium Duration', 'Crisil Composite Bond Fund Index'],
+    ['Medium to Long Duration', 'Crisil Composite Bond Fund Index'],
+    ['Mid Cap Fund', 'Nifty Midcap 150 TRI'],
+    ['Multi Cap Fund', 'Nifty 500 TRI'],
+    ['Overnight', 'Crisil Liquid Fund Index'],
+    ['Short Duration', 'Crisil Short Term Bond Fund Index'],
+    ['Silver Fund', 'MCX Silver SPOT'],
+    ['Small Cap Fund', 'Nifty Smallcap 250 TRI'],
+    ['Target Maturity Fund', 'Crisil Composite Bond Fund Index'],
+    ['Thematic Fund', 'Nifty 500 TRI'],
+    ['Ultra Short Duration Fund', 'Crisil Liquid Fund Index'],
+]
+
+BENCH_PMS = [
+    ['List of PMS / AIF Indices', ''],
+    ['Schemes', 'Benchmark'],
+    ['Ashmore India Opportunities Fund Class B', 'BSE Small Cap'],
+    ['ASK Growth Portfolio', 'S&P BSE 500'],
+    ['Ask India Vision Portfolio', 'S&P BSE 500'],
+    ['ASK India Select Portfolio', 'S&P BSE 500'],
+    ['ASK Indian Entrepreneur Portfolio', 'S&P BSE 500'],
+    ['Avendus Absolute Return Fund', 'Crisil Short Term Bond Fund Index'],
+    ['Avendus Enhanced Return Fund', 'Nifty 50'],
+    ['DHFL Pramerica Deep Value Strategy', 'Nifty 500'],
+    ['Edelweiss Stressed Troubled Assets Revival Fund Estar', 'Nifty 50'],
+    ['India Invest Opportunity -Citi Bank', 'Nifty 50'],
+    ['India Opportunities Portfolio Strategy', 'S&P BSE 500'],
+    ['India Opportunity Portfolio Strategy V2', 'Nifty Free Float Smallcap 100'],
+    ['Invesco India Dawn Portfolio', 'S&P BSE 500'],
+    ['Invesco India Rise Portfolio', 'S&P BSE 500'],
+    ['Liquid Strategy', 'CRISIL Liquid Fund Index'],
+    ['Motilal Oswal Focused Emergence Fund', 'BSE Small Cap'],
+    ['Motilal Oswal Focused Multicap Opportunities Fund', 'Nifty 500'],
+    ['Next Trillion Dollar Opportunity Strategy', 'S&P BSE 500'],
+    ['OBCMPL All Cap Strategy', 'S&P BSE 500'],
+    ['OBCMPL Thematic Portfolio', 'Nifty 50'],
+    ['Old Bridge Nri Vantage Equity Plan', 'S&P BSE 500'],
+    ['Old Bridge Vantage Equity Fund', 'S&P BSE 500'],
+    ['Reliance Yield Maximiser All Schemes', 'Crisil Liquid Fund Index + 2%'],
+    ['Renaissance India Next Portfolio', 'Nifty 50'],
+    ['UTI Structured Debt Opportunities Fund I', 'Crisil Short Term Bond Fund Index'],
+    ['Value Strategy', 'Nifty 50'],
+    ['Unifi Blend Fund', 'S&P BSE Midcap'],
+    ['WO Pioneers PMS', 'S&P BSE 200']
+]
+
+BENCH_PMS2 = [
+    ['List of PMS / AIF Indices', ''],
+    ['Schemes', 'Benchmark'],
+    ['Unifi Blend PMS', 'S&P BSE 500'],
+    ['Motilal Oswal Value PMS', 'Nifty 50 TRI'],
+    ['Motilal Oswal NTDOC PMS', 'Nifty 500'],
+    ['ASK India Select PMS', 'S&P BSE 500'],
+    ['ASk IEP PMS', 'S&P BSE 500'],
+    ['ASK India Vision', 'S&P BSE 500'],
+    ['ASK Indian Entrepreneur Portfolio', 'S&P BSE 500'],
+    ['Abakkus All Cap', 'S&P  BSE 200'],
+    ['ENAM IDEA', 'Nifty 500'],
+    ['Motilal Oswal BOP PMS', 'Nifty 50 TRI'],
+    ['Marcellus CC PMS', 'Nifty 50'],
+    ['Renaissance Oppurtunities PMS', 'Nifty 50'],
+    ['Renaissance India Next Portfolio', 'Nifty 50'],
+    ['Invesco India DAWN', 'S&P BSE 500'],
+    ['Invesco India RISE', 'S&P BSE 500'],
+    ['ASK India 2025', 'S&P BSE 500'],
+    ['Renaissance Midcap', 'Nifty Free Float Midcap 100'],
+    ['Unifi Blended PMS', 'S&P BSE Midcap'],
+    ['Unifi BCAD PMS', 'S&P BSE Midcap'],
+    ['Unifi Blend AIF', 'S&P BSE Midcap'],
+    ['Motilal Oswal IOP PMS', 'Nifty Small Cap 50 Tri'],
+    ['MO EOP 2', 'Nifty 500'],
+    ['Marcellus Little Champs', 'S&P BSE 500'],
+    ['Old Bridge Long Term Equility', 'Nifty 50'],
+    ['Alchemy High Growth Select Stock', 'S&P BSE 500'],
+    ['Alchemy High Growth', 'S&P BSE 500'],
+    ['MO BAF 2(Anti Fragile)', 'Nifty 500'],
+]
+
+def create_footer_page(pdf, stamp=True):
+    fig, ax = chrome_fig((16, 10), footer=footer_text() if stamp else None)
 
-    logo_img = plt.imread('logo.png')
-    logo_ax = fig.add_axes([0.79, 0.9, 0.2, 0.08])  
-    logo_ax.imshow(logo_img)
-    logo_ax.axis('off')
-    
     ax.text(
         0.11, 0.92, "Notes & Assumptions",
         fontsize=32, color='#8B0000',
         weight='light'
     )
-
-    current_date = pd.Timestamp.now().strftime('%d-%b-%Y')
     
-    main_txt = (
-        "1. All valuation as on last available Price / NAV.\n\n"
-        "2. Unrealised Gain / Loss = Market Value - Investment at cost. It does not account for Dividend / Interest Paid out. XIRR will be frozen for that day till next valuation is available.\n\n"
-        "3. XIRR and Benchmark Values are calculated on balance units for open scripts / folios. In case there are reinvestments in a prior closed script / folio, then all historical cashflow of that script / foliow will be considered\n\n     for XIRR & Benchmark Calculations.\n\n"
-        "4. All Private Equity Funds(RE) and Real Estate Funds(RE) are classified as Alternates (Unquoted).Since Quoted Valuations of PE & RE Funds are not available its Market value is computed as Total Drawdown(Cost) -\n\n    Capital Returned.XIRR and benchmarks are not computed for PE & RE Funds.\n\n"
-        "5. If bifurcation between Capital Return & Profit is not provided by Manufacturers for AIF / PE / RE distribution, they will appear as Profit / Unallocated distribution in report.\n\n"
-        "6. Net investments for PMS might not match with AMC statement due to difference in calculation methodology.In case if cost in folio is less than equal to zero and Market Value is less than 50000, we will consider this\n\n    as a cloud investment and will not appear in report.\n\n"
-        "7. For Mutual Funds, less than 1 units or fraction unit is considered as closed.\n\n"
-        "8. Capital Gain / (Loss) – for Equity Stocks / Mutual Fund: Short Term < 1 Year, Long Term > 1 Year; & for Debt Mutual Fund Only, Short Term < 3 Years, Long Term > 3 Years. Long Term Capital Gains (LTCG) and Short\n\n     Term Capital Gains (STCG) does not account for Exit Loads.\n\n"
-        "9. Interest accrued - all unpaid interest is accrued on FV from the last Interest Payment date.\n\n"
-        "10. Bonds & Other listed instruments: Valuation of instruments that are actively traded on the exchange will be shown at the market price. Due to market dependent bid - ask spreads,the availability of the price\n\n      displayed cannot be guaranteed. For debt instruments which are not actively traded on the exchange, valuation will be shown at Face Value.\n\n"
-        "11. For Direct equity transactions, balance quantity is adjusted on trade date, while the Demat Service provider may account for it within T + 3 days.\n\n"
-        "12. Any case where DP is not with Motilal Oswal Financial Services Limited, all stock trades will be squared off at the end of day.\n\n"
-        "13. In Case of a corporate action on a Direct Equity Stock, Holdings in Report might not Tally with DP due to delay in receiving corporate action transactions in DP.\n\n"
-        "14. In case of any security held as collateral, this will appear in the client portfolio and might not tally with actual DP holdings.\n\n"
-        "15. Unit rate of Stocks acquired in ESOP / bought via other brokers / Off Market Transfers might not tally with actual buying price. Please contact your Advisor to update the same.\n\n"
-        "16. Since values are displayed in Lakhs, total of individual rows might not match with Grand Total Row on account of rounding off differences.\n\n"
-        "17. In case of IPO issue price declared will be taken as cost.\n\n"
-        "18. Arbitrage Funds are classified in the report as Debt based on underlying risk. This differs from SEBI classification.\n\n"
-        "19. Benchmark XIRR calculations are done by imitating the cash flows of each security on underlying benchmark (as per benchmark list).\n\n"
-        "20. The ledger balances depicted above is held with Motilal Oswal Financial Services Limited: No changes.\n\n"
-        "21. The Bank balances depicted above are held with HDFC Bank having Power of Attorney with Motilal Oswal Wealth Limited/HDFC Custody.\n\n"
-        "22. We are showing the Bank and Ledger balances August 1st, 2023 onwards. We are not displaying back-dated bank and ledger balances.\n\n"
-    )
     
     ax.text(
         0.04, 0.04,
-        main_txt,
+        NOTES_TEXT,
         horizontalalignment='left',
         fontsize=10,
         color='#2F4F4F'
     )
 
-    footer_text = (
-        "This document is not valid without disclosure, please refer to the last page for the disclaimer. | "
-        "Strictly Private & Confidential.\n"
-        f"Incase of any query / feedback on the report, please write to query@motilaloswal.com. | "
-        f"Generated Date & Time : {current_date} | {pd.Timestamp.now().strftime('%I:%M %p')}"
-    )
-    ax.text(
-        0.5, 0.02, footer_text,
-        horizontalalignment='center',
-        fontsize=10,
-        color='#2F4F4F',
-        wrap=True
-    )
-    
-    footer = plt.imread('header.png')
-    footer_ax = fig.add_axes([0.02, 0.77, 0.9, 0.3])
-    footer_ax.imshow(footer)
-    footer_ax.axis('off')
-
     pdf.savefig(fig, bbox_inches=None, pad_inches=0)
     plt.close(fig)
 
-def create_benchmark_tables_page(pdf):
-    fig = plt.figure(figsize=(16, 10))
-    ax = fig.add_subplot(111)
-    
-    ax.set_position([0, 0, 1, 1])
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
-
-    # Background gradient
-    gradient = np.linspace(1, 0.9, 500).reshape(1, -1)
-    ax.imshow(
-        gradient,
-        extent=(0, 1, 0, 1),
-        cmap='Blues',
-        aspect='auto',
-        alpha=0.3
-    )
+def create_benchmark_tables_page(pdf, stamp=True):
+    fig, ax = chrome_fig((16, 10), footer=footer_text() if stamp else None)
 
-    # Logo
-    logo_img = plt.imread('logo.png')
-    logo_ax = fig.add_axes([0.79, 0.9, 0.2, 0.08])  
-    logo_ax.imshow(logo_img)
-    logo_ax.axis('off')
-    
     ax.text(
     0.11, 0.92, "List of Benchmarks used for comparison",
     fontsize=32, color='#8B0000',
     weight='light'
     )
-    
-    # Header
-    footer = plt.imread('header.png')
-    footer_ax = fig.add_axes([0.02, 0.77, 0.9, 0.3])
-    footer_ax.imshow(footer)
-    footer_ax.axis('off')
-
-    # Define table data
-    indices_data = [
-        ['List of Indices', ''],
-        ['All Direct Equity / Stocks', 'Nifty 50'],
-        ['All Bonds', 'CRISIL Composite Bond Fund Index'],
-        ['All Structure Products', 'Crisil Short Term Bond Fund Index']
-    ]
-
-    mutual_fund_data = [
-        ['List of Mutual Fund Indices', ''],
-        ['Mutual Fund Categories', 'Benchmark'],
-        ['Equity Savings Fund', 'Nifty Equity Saving TRI'],
-        ['Thematic Fund', 'Nifty 500 TRI'],
-        ['Arbitrage Fund', 'Nifty 50 Arbitrage'],
-        ['Banking and PSU', 'CRISIL Short Term Bond Fund Index'],
-        ['Corporate Bond', 'Crisil Composite Bond Fund Index'],
-        ['Credit Risk', 'Crisil Short Term Bond Fund Index'],
-        ['Debt Hybrid Fund', 'Crisil Short Term Bond Fund Index'],
-        ['Dynamic Bond Fund', 'Crisil Composite Bond Fund Index'],
-        ['ELSS', 'Nifty 500 TRI'],
-        ['Equity Hybrid Fund', 'CRISIL Hybrid 35+65 - Aggressive Index'],
-        ['Fixed Maturity Fund', 'Crisil Short Term Bond Fund Index'],
-        ['Flexi Cap Fund', 'Nifty 500 TRI'],
-        ['Floating Rate Fund', 'Crisil Short Term Bond Fund Index'],
-        ['GILT Fund', 'CRISIL GILT Index'],
-        ['GOLD FUND', 'MCX GOLD SPOT'],
-        ['Income Fund', 'Crisil Composite Bond Fund Index'],
-        ['International Fund', 'S&P 500 INR'],
-        ['Large Cap Fund', 'Nifty 50 TRI'],
-        ['Liquid Fund', 'Crisil Liquid Fund Index'],
-        ['Long Duration', 'Crisil Composite Bond Fund Index'],
-        ['Low Duration', 'Crisil Liquid Fund Index'],
-        ['Medium Duration', 'Crisil Composite Bond Fund Index'],
-        ['Medium to Long Duration', 'Crisil Composite Bond Fund Index'],
-        ['Mid Cap Fund', 'Nifty Midcap 150 TRI'],
-        ['Multi Cap Fund', 'Nifty 500 TRI'],
-        ['Overnight', 'Crisil Liquid Fund Index'],
-        ['Short Duration', 'Crisil Short Term Bond Fund Index'],
-        ['Silver Fund', 'MCX Silver SPOT'],
-        ['Small Cap Fund', 'Nifty Smallcap 250 TRI'],
-        ['Target Maturity Fund', 'Crisil Composite Bond Fund Index'],
-        ['Thematic Fund', 'Nifty 500 TRI'],
-        ['Ultra Short Duration Fund', 'Crisil Liquid Fund Index'],
-    ]
-
-    pms_data = [
-        ['List of PMS / AIF Indices', ''],
-        ['Schemes', 'Benchmark'],
-        ['Ashmore India Opportunities Fund Class B', 'BSE Small Cap'],
-        ['ASK Growth Portfolio', 'S&P BSE 500'],
-        ['Ask India Vision Portfolio', 'S&P BSE 500'],
-        ['ASK India Select Portfolio', 'S&P BSE 500'],
-        ['ASK Indian Entrepreneur Portfolio', 'S&P BSE 500'],
-        ['Avendus Absolute Return Fund', 'Crisil Short Term Bond Fund Index'],
-        ['Avendus Enhanced Return Fund', 'Nifty 50'],
-        ['DHFL Pramerica Deep Value Strategy', 'Nifty 500'],
-        ['Edelweiss Stressed Troubled Assets Revival Fund Estar', 'Nifty 50'],
-        ['India Invest Opportunity -Citi Bank', 'Nifty 50'],
-        ['India Opportunities Portfolio Strategy', 'S&P BSE 500'],
-        ['India Opportunity Portfolio Strategy V2', 'Nifty Free Float Smallcap 100'],
-        ['Invesco India Dawn Portfolio', 'S&P BSE 500'],
-        ['Invesco India Rise Portfolio', 'S&P BSE 500'],
-        ['Liquid Strategy', 'CRISIL Liquid Fund Index'],
-        ['Motilal Oswal Focused Emergence Fund', 'BSE Small Cap'],
-        ['Motilal Oswal Focused Multicap Opportunities Fund', 'Nifty 500'],
-        ['Next Trillion Dollar Opportunity Strategy', 'S&P BSE 500'],
-        ['OBCMPL All Cap Strategy', 'S&P BSE 500'],
-        ['OBCMPL Thematic Portfolio', 'Nifty 50'],
-        ['Old Bridge Nri Vantage Equity Plan', 'S&P BSE 500'],
-        ['Old Bridge Vantage Equity Fund', 'S&P BSE 500'],
-        ['Reliance Yield Maximiser All Schemes', 'Crisil Liquid Fund Index + 2%'],
-        ['Renaissance India Next Portfolio', 'Nifty 50'],
-        ['UTI Structured Debt Opportunities Fund I', 'Crisil Short Term Bond Fund Index'],
-        ['Value Strategy', 'Nifty 50'],
-        ['Unifi Blend Fund', 'S&P BSE Midcap'],
-        ['WO Pioneers PMS', 'S&P BSE 200']
-    ]
 
     # Create tables
     # Left side tables
     indices_table = ax.table(
-        cellText=indices_data,
+        cellText=BENCH_INDICES,
         loc='upper left',
         bbox=[0.05, 0.78, 0.3, 0.1],
         cellLoc='left'
@@ -320,7 +286,7 @@ def create_benchmark_tables_page(pdf):
     indices_table.set_fontsize(8)
     
     mutual_fund_table = ax.table(
-        cellText=mutual_fund_data,
+        cellText=BENCH_MF,
         loc='upper left',
         bbox=[0.05, 0.06, 0.4, 0.7],
         cellLoc='left'
@@ -329,7 +295,7 @@ def create_benchmark_tables_page(pdf):
     mutual_fund_table.set_fontsize(8)
 
     pms_table = ax.table(
-        cellText=pms_data,
+        cellText=BENCH_PMS,
         loc='upper right',
         bbox=[0.55, 0.06, 0.4, 0.8],
         cellLoc='left'
@@ -345,92 +311,20 @@ def create_benchmark_tables_page(pdf):
                 table._cells[cell].set_facecolor('#D3D3D3')
                 table._cells[cell].set_text_props(weight='bold')
 
-    current_date = pd.Timestamp.now().strftime('%d-%b-%Y')
-    footer_text = (
-        "This document is not valid without disclosure, please refer to the last page for the disclaimer. | "
-        "Strictly Private & Confidential.\n"
-        f"Incase of any query / feedback on the report, please write to query@motilaloswal.com. | "
-        f"Generated Date & Time : {current_date} | {pd.Timestamp.now().strftime('%I:%M %p')}"
-    )
-    ax.text(
-        0.5, 0.02, footer_text,
-        horizontalalignment='center',
-        fontsize=10,
-        color='#2F4F4F',
-        wrap=True
-    )
-
     pdf.savefig(fig, bbox_inches=None, pad_inches=0)
     plt.close(fig)
     
-def create_benchmark_tables_page2(pdf):
-    fig = plt.figure(figsize=(16, 10))
-    ax = fig.add_subplot(111)
-    
-    ax.set_position([0, 0, 1, 1])
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
-
-    gradient = np.linspace(1, 0.9, 500).reshape(1, -1)
-    ax.imshow(
-        gradient,
-        extent=(0, 1, 0, 1),
-        cmap='Blues',
-        aspect='auto',
-        alpha=0.3
-    )
+def create_benchmark_tables_page2(pdf, stamp=True):
+    fig, ax = chrome_fig((16, 10), footer=footer_text() if stamp else None)
 
-    logo_img = plt.imread('logo.png')
-    logo_ax = fig.add_axes([0.79, 0.9, 0.2, 0.08])  
-    logo_ax.imshow(logo_img)
-    logo_ax.axis('off')
-    
     ax.text(
     0.11, 0.92, "List of Benchmarks used for comparison",
     fontsize=32, color='#8B0000',
     weight='light'
     )
-    
-    footer = plt.imread('header.png')
-    footer_ax = fig.add_axes([0.02, 0.77, 0.9, 0.3])
-    footer_ax.imshow(footer)
-    footer_ax.axis('off')
-
-    pms_data = [
-        ['List of PMS / AIF Indices', ''],
-        ['Schemes', 'Benchmark'],
-        ['Unifi Blend PMS', 'S&P BSE 500'],
-        ['Motilal Oswal Value PMS', 'Nifty 50 TRI'],
-        ['Motilal Oswal NTDOC PMS', 'Nifty 500'],
-        ['ASK India Select PMS', 'S&P BSE 500'],
-        ['ASk IEP PMS', 'S&P BSE 500'],
-        ['ASK India Vision', 'S&P BSE 500'],
-        ['ASK Indian Entrepreneur Portfolio', 'S&P BSE 500'],
-        ['Abakkus All Cap', 'S&P  BSE 200'],
-        ['ENAM IDEA', 'Nifty 500'],
-        ['Motilal Oswal BOP PMS', 'Nifty 50 TRI'],
-        ['Marcellus CC PMS', 'Nifty 50'],
-        ['Renaissance Oppurtunities PMS', 'Nifty 50'],
-        ['Renaissance India Next Portfolio', 'Nifty 50'],
-        ['Invesco India DAWN', 'S&P BSE 500'],
-        ['Invesco India RISE', 'S&P BSE 500'],
-        ['ASK India 2025', 'S&P BSE 500'],
-        ['Renaissance Midcap', 'Nifty Free Float Midcap 100'],
-        ['Unifi Blended PMS', 'S&P BSE Midcap'],
-        ['Unifi BCAD PMS', 'S&P BSE Midcap'],
-        ['Unifi Blend AIF', 'S&P BSE Midcap'],
-        ['Motilal Oswal IOP PMS', 'Nifty Small Cap 50 Tri'],
-        ['MO EOP 2', 'Nifty 500'],
-        ['Marcellus Little Champs', 'S&P BSE 500'],
-        ['Old Bridge Long Term Equility', 'Nifty 50'],
-        ['Alchemy High Growth Select Stock', 'S&P BSE 500'],
-        ['Alchemy High Growth', 'S&P BSE 500'],
-        ['MO BAF 2(Anti Fragile)', 'Nifty 500'],
-    ]
-    
+
     pms_table = ax.table(
-        cellText=pms_data,
+        cellText=BENCH_PMS2,
         loc='upper right',
         bbox=[0.25, 0.06, 0.4, 0.8],
         cellLoc='left'
@@ -445,25 +339,45 @@ def create_benchmark_tables_page2(pdf):
                 table._cells[cell].set_facecolor('#D3D3D3')
                 table._cells[cell].set_text_props(weight='bold')
 
-    
-    current_date = pd.Timestamp.now().strftime('%d-%b-%Y')
-    footer_text = (
-        "This document is not valid without disclosure, please refer to the last page for the disclaimer. | "
-        "Strictly Private & Confidential.\n"
-        f"Incase of any query / feedback on the report, please write to query@motilaloswal.com. | "
-        f"Generated Date & Time : {current_date} | {pd.Timestamp.now().strftime('%I:%M %p')}"
-    )
-    ax.text(
-        0.5, 0.02, footer_text,
-        horizontalalignment='center',
-        fontsize=10,
-        color='#2F4F4F',
-        wrap=True
-    )
-
     pdf.savefig(fig, bbox_inches=None, pad_inches=0)
     plt.close(fig)
 
+def _write_chrome(doc, title):
+    page = doc.page((16, 10))
+    page.gradient()
+    page.text(0.11, 0.92, title, size=32, color='#8B0000')
+    return page
+
+def _write_images(page, stamp):
+    if stamp:
+        page.text(0.5, 0.02, footer_text(), size=10, color=FOOTER_COLOR, ha='center')
+    page.chrome()
+    page.doc.add(page)
+
+def _bench_table(page, rows, bbox, heads):
+    # same look as the ax.table version: equal columns, 8pt left-aligned,
+    # the first `heads` rows grey and bold
+    style = lambda row, col, text: {'fill': '#D3D3D3', 'weight': 'bold'} if row < heads else None
+    page.table(layout_table(rows, bbox=bbox, col_widths=[1, 1], align='left', fontsize=8, style=style,
+                            measure=page.text_width), lw=0.5)
+
+def write_footer_page(doc, stamp=True):
+    page = _write_chrome(doc, "Notes & Assumptions")
+    page.text(0.04, 0.04, NOTES_TEXT, size=10, color='#2F4F4F')
+    _write_images(page, stamp)
+
+def write_benchmark_tables_page(doc, stamp=True):
+    page = _write_chrome(doc, "List of Benchmarks used for comparison")
+    _bench_table(page, BENCH_INDICES, [0.05, 0.78, 0.3, 0.1], 1)
+    _bench_table(page, BENCH_MF, [0.05, 0.06, 0.4, 0.7], 2)
+    _bench_table(page, BENCH_PMS, [0.55, 0.06, 0.4, 0.8], 2)
+    _write_images(page, stamp)
+
+def write_benchmark_tables_page2(doc, stamp=True):
+    page = _write_chrome(doc, "List of Benchmarks used for comparison")
+    _bench_table(page, BENCH_PMS2, [0.25, 0.06, 0.4, 0.8], 1)
+    _write_images(page, stamp)
+
 def rearrange_and_add_total(df):
     df["Portfolio Value"] = pd.to_numeric(df["Portfolio Value"], errors='coerce')
     df["Portfolio Value"] = df["Portfolio Value"].round().astype(int)
@@ -502,62 +416,376 @@ def preprocess_table(dataframe, category_name):
 
     return result_df, sums
 
-def create_portfolio_reports(data, portfolio_dir):
+# 'fixed' saves data pages on their own canvas plus the tight-bbox margin,
+# so each is drawn once and every client gets the same page size; 'tight'
+# measures the drawn content first, as savefig(bbox_inches='tight') does
+LAYOUT_ENV = 'REPORTIQ_LAYOUT'
+
+def page_box(fig) -> Bbox:
+    pad = plt.rcParams['savefig.pad_inches']
+    w, h = fig.get_size_inches()
+    return Bbox.from_extents(-pad, -pad, w + pad, h + pad)
+
+def save_fig(pdf, figs):
+    tight = os.environ.get(LAYOUT_ENV, 'fixed') == 'tight'
+    for fig in [figs] if isinstance(figs, plt.Figure) else figs:
+        pdf.savefig(fig, bbox_inches='tight' if tight else page_box(fig))
+        plt.close(fig)
+
+PAGES = [
+    ('cover', lambda pdf, ctx: create_cover_page(pdf, ctx['customer_name'], ctx['ucid'])),
+    ('summary', lambda pdf, ctx: save_fig(pdf, plot_table_and_pie(ctx['holding_doc'], ctx['equity_allocation_percentage'],
+                                                                   stamp=_stamp(ctx)))),
+    ('holdings', lambda pdf, ctx: save_fig(pdf, create_holdings_summary(ctx['Equity'], ctx['Debt'], ctx['Holding'],
+                                                                        stamp=_stamp(ctx)))),
+    ('equity', lambda pdf, ctx: save_fig(pdf, create_portfolio_table(ctx['holding_doc'], ctx.get('watchlist'),
+                                                                     stamp=_stamp(ctx)))),
+    ('fno', lambda pdf, ctx: save_fig(pdf, analyze_fno_holdings(ctx['holding_doc'], stamp=_stamp(ctx)))),
+    ('eqmf', lambda pdf, ctx: save_fig(pdf, eqmf(ctx['holding_doc'], stamp=_stamp(ctx)))),
+    ('dmf', lambda pdf, ctx: save_fig(pdf, dmf(ctx['holding_doc'], stamp=_stamp(ctx)))),
+    ('benchmarks', lambda pdf, ctx: create_benchmark_tables_page(pdf)),
+    ('benchmarks2', lambda pdf, ctx: create_benchmark_tables_page2(pdf)),
+    ('notes', lambda pdf, ctx: create_footer_page(pdf)),
+]
+PAGE_FNS = dict(PAGES)
+
+# pages that can also be written straight to PDF with standard fonts,
+# skipping matplotlib; picked per page with direct= or REPORTIQ_DIRECT
+DIRECT_PAGES = {
+    'holdings': lambda doc, ctx: create_holdings_summary(ctx['Equity'], ctx['Debt'], ctx['Holding'], pdf_doc=doc,
+                                                         stamp=_stamp(ctx)),
+    'equity': lambda doc, ctx: create_portfolio_table(ctx['holding_doc'], ctx.get('watchlist'), pdf_doc=doc,
+                                                      stamp=_stamp(ctx)),
+    'fno': lambda doc, ctx: analyze_fno_holdings(ctx['holding_doc'], pdf_doc=doc, stamp=_stamp(ctx)),
+    'eqmf': lambda doc, ctx: eqmf(ctx['holding_doc'], pdf_doc=doc, stamp=_stamp(ctx)),
+    'dmf': lambda doc, ctx: dmf(ctx['holding_doc'], pdf_doc=doc, stamp=_stamp(ctx)),
+    'benchmarks': lambda doc, ctx: write_benchmark_tables_page(doc),
+    'benchmarks2': lambda doc, ctx: write_benchmark_tables_page2(doc),
+    'notes': lambda doc, ctx: write_footer_page(doc),
+}
+DIRECT_ENV = 'REPORTIQ_DIRECT'
+
+STATIC_PAGES = ['cover', 'benchmarks', 'benchmarks2', 'notes']
+STATIC_VERSION = 2
+# seconds a superseded static copy is kept after its last use
+STATIC_GRACE = 3600
+
+# the context entries each data page reads; with memo= (or REPORTIQ_MEMO)
+# a page whose entries hash the same as in an earlier run today is taken
+# from the page cache instead of being drawn again
+PAGE_INPUTS = {
+    'summary': ('Holding', 'equity_allocation_percentage'),
+    'holdings': ('Equity', 'Debt'),
+    'equity': ('Holding', 'watchlist'),
+    'fno': ('Holding',),
+    'eqmf': ('Holding',),
+    'dmf': ('Holding',),
+}
+PAGE_VERSION = 1
+MEMO_ENV = 'REPORTIQ_MEMO'
+
+class ReportCancelled(Exception):
+    pass
+
+def _stamp(ctx) -> bool:
+    # cached data pages are kept without the footer, which carries the
+    # generation time, and get it stamped on when a report is assembled
+    return ctx.get('stamp', True)
+
+def memo_on(memo=None) -> bool:
+    if memo is None:
+        memo = os.environ.get(MEMO_ENV, '') not in ('', '0')
+    return bool(memo)
+
+def direct_keys(direct=None) -> frozenset:
+    # direct: page keys, 'all', or None for REPORTIQ_DIRECT (comma separated)
+    if direct is None:
+        direct = os.environ.get(DIRECT_ENV, '')
+    if isinstance(direct, str):
+        direct = DIRECT_PAGES if direct.strip() == 'all' else [k.strip() for k in direct.split(',') if k.strip()]
+    keys = frozenset(direct)
+    unknown = keys - DIRECT_PAGES.keys()
+    if unknown:
+        raise ValueError(f"No direct PDF writer for pages: {', '.join(sorted(unknown))}")
+    return keys
+
+def page_ticker(total, progress=None, cancel=None):
+    # tick(key) records a finished page and raises ReportCancelled once
+    # cancel is set, so jobs stop between pages
+    done = 0
+    def tick(key=None):
+        nonlocal done
+        if key is not None:
+            done += 1
+            if progress:
+                progress(done, total, key)
+        if cancel is not None and cancel.is_set():
+            raise ReportCancelled(f"Report cancelled after {done} of {total} pages")
+    return tick
+
+def _init_page_worker():
+    plt.switch_backend('Agg')
+
+def build_page(key, pdf, ctx):
+    ucid = ctx.get('ucid')
+    with span('page', page=key, ucid=ucid):
+        PAGE_FNS[key](traced_pdf(pdf, page=key, ucid=ucid), ctx)
+
+def build_direct(key, doc, ctx):
+    with span('page', page=key, ucid=ctx.get('ucid'), backend='direct'):
+        DIRECT_PAGES[key](doc, ctx)
+
+def render_pages(keys, ctx, path, tick=None, direct=()):
+    # matplotlib pages go to path, direct ones to <path>.direct.pdf
+    path = Path(path)
+    doc = PdfDoc(path.with_suffix('.direct.pdf')) if direct else None
+    spans = {}
+    with PdfPages(path) as pdf:
+        for key in keys:
+            out, src = (doc, doc.path) if key in direct else (pdf, path)
+            start = out.get_pagecount()
+            if key in direct:
+                build_direct(key, doc, ctx)
+            else:
+                build_page(key, pdf, ctx)
+            spans[key] = [(src, i) for i in range(start, out.get_pagecount())]
+            if tick:
+                tick(key)
+    if doc is not None:
+        doc.close()
+    return spans
+
+def _render_page(key, ctx, path, direct):
+    # one page in a worker; its trace spans go back with the result so they
+    # land in the parent's run
+    with collected() as records:
+        spans = render_pages([key], ctx, path, None, direct)
+    return spans[key], records
+
+def render_pages_parallel(keys, ctx, tmp, workers=None, tick=None, direct=()):
+    workers = workers or min(len(keys), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_page_worker) as ex:
+        futs = {ex.submit(_render_page, key, ctx, Path(tmp) / f"{key}.pdf", direct & {key}): key
+                for key in keys}
+        spans = {}
+        try:
+            for fut in as_completed(futs):
+                key = futs[fut]
+                spans[key], records = fut.result()
+                merge(records)
+                if tick:
+                    tick(key)
+        except BaseException:
+            ex.shutdown(wait=True, cancel_futures=True)
+            raise
+        return spans
+
+def _static_key(path: Path):
+    m = re.fullmatch(r'static_v(\d+)_(\d{8})\.pdf', path.name)
+    return (int(m.group(1)), m.group(2)) if m else None
+
+def static_pages():
+    day = pd.Timestamp.now().strftime('%Y%m%d')
+    path = cache_dir('static') / f"static_v{STATIC_VERSION}_{day}.pdf"
+    if path.exists():
+        # a hit marks the copy in use, so the cleanup below leaves it to
+        # reports that took it just before the day or version changed
+        try:
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
     try:
-        Portfolio_Value = data['Portfolio Value']
-        Holding = data['Holding']
-        xirr = data['XIRR']
-        equity = data['Equity']
-        debt = data['Debt']
-        fno = data['FNO']
-        profit = data['Profits']
-        
-        customer_name, ucid = get_customer_details(Holding)
-        
-        Portfolio_Value_Modified, cash_equivalent_value, cash_equivalent_percentage, equity_allocation_percentage = rearrange_and_add_total(
-            Portfolio_Value
-        )
+        with PdfPages(tmp) as pdf:
+            create_cover_page(pdf, None, None, stamp=False)
+            create_benchmark_tables_page(pdf, stamp=False)
+            create_benchmark_tables_page2(pdf, stamp=False)
+            create_footer_page(pdf, stamp=False)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    # other workers may be racing on the same cleanup or still merging an
+    # older copy: only drop copies older than this key and unused for a while
+    key, cutoff = _static_key(path), time.time() - STATIC_GRACE
+    for old in path.parent.glob('static_*.pdf'):
+        old_key = _static_key(old)
+        try:
+            if old_key is not None and old_key < key and old.stat().st_mtime < cutoff:
+                old.unlink(missing_ok=True)
+        except OSError:
+            pass
+    return path
+
+def stamp_pages(ctx, path):
+    with PdfPages(path) as pdf:
+        for key in STATIC_PAGES:
+            fig = plt.figure(figsize=(16, 10))
+            ax = fig.add_axes([0, 0, 1, 1])
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
+            ax.axis('off')
+            if key == 'cover':
+                draw_cover_stamp(ax, ctx['customer_name'], ctx['ucid'])
+            else:
+                draw_footer(ax)
+            pdf.savefig(fig, bbox_inches=None, pad_inches=0, transparent=True)
+            plt.close(fig)
+    return path
+
+def footer_stamps(tmp) -> dict:
+    # the data page footer alone on a transparent page of the fixed layout's
+    # size, drawn as detail_page and write_detail_page draw it; keyed by
+    # whether the page is a direct one
+    fig = plt.figure(figsize=(15.8, 10))
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.axis('off')
+    ax.text(0.5, 0.02, page_footer(), horizontalalignment='center', fontsize=10, color=FOOTER_COLOR, wrap=True)
+    path = Path(tmp) / 'footer.pdf'
+    with PdfPages(path) as pdf:
+        pdf.savefig(fig, bbox_inches=page_box(fig), transparent=True)
+    plt.close(fig)
+
+    doc = PdfDoc(path.with_suffix('.direct.pdf'))
+    page = doc.page((15.8, 10), pad=0.1)
+    page.text(0.5, 0.02, page_footer(), size=10, color=FOOTER_COLOR, ha='center')
+    doc.add(page)
+    return {False: path, True: doc.close()}
+
+def page_digests(keys, ctx, direct=()) -> dict:
+    # one hash per page over its PAGE_INPUTS, the backend drawing it, the
+    # table split and page layout, and the day printed on it; each input is
+    # hashed once
+    day = pd.Timestamp.now().strftime('%Y%m%d')
+    layout = os.environ.get(LAYOUT_ENV, 'fixed')
+    names = sorted({name for key in keys for name in PAGE_INPUTS[key]})
+    hashes = {name: value_hash(ctx.get(name)) for name in names}
+    return {
+        key: value_hash((PAGE_VERSION, day, key, 'direct' if key in direct else 'mpl', layout, ROWS_PER_PAGE,
+                         [hashes[name] for name in PAGE_INPUTS[key]]))
+        for key in keys
+    }
+
+def report_ctx(data, watchlist=None):
+    Portfolio_Value = data['Portfolio Value']
+    with span('parse_holding'):
+        holding_doc = parse_holding(data['Holding'])
+    
+    customer_name, ucid = get_customer_details(holding_doc)
+    tag(ucid=ucid)
+    
+    Portfolio_Value_Modified, cash_equivalent_value, cash_equivalent_percentage, equity_allocation_percentage = rearrange_and_add_total(
+        Portfolio_Value
+    )
+    
+    return dict(
+        data,
+        customer_name=customer_name,
+        ucid=ucid,
+        holding_doc=holding_doc,
+        watchlist=ld_watchlist() if watchlist is None else watchlist,
+        equity_allocation_percentage=equity_allocation_percentage,
+    )
+
+def create_portfolio_reports(data, portfolio_dir, filename='portfolio_report.pdf', parallel=False, workers=None,
+                             static_cache=False, watchlist=None, progress=None, cancel=None, direct=None,
+                             memo=None):
+    out_path = Path(portfolio_dir) / filename
+    direct = direct_keys(direct)
+    memo = memo_on(memo)
+    with traced_run(), profiled(out_path), span('report', parallel=parallel, static_cache=static_cache,
+                                                direct=','.join(sorted(direct)) or None, memo=memo or None):
+        return _create_portfolio_reports(data, portfolio_dir, filename, parallel, workers, static_cache,
+                                         watchlist, progress, cancel, direct, memo)
+
+def _create_portfolio_reports(data, portfolio_dir, filename, parallel, workers, static_cache, watchlist,
+                              progress, cancel, direct, memo):
+    part = None
+    try:
+        tick = page_ticker(len(PAGES), progress, cancel)
+        tick()
+        ctx = report_ctx(data, watchlist)
         
         portfolio_dir = Path(portfolio_dir)
+        out_path = portfolio_dir / filename
+        part = out_path.with_name(f"{out_path.name}.part")
+
+        if (parallel or static_cache or direct or memo) and not can_merge():
+            print("Warning: pypdf is not installed, rendering all pages sequentially with matplotlib")
+            parallel = static_cache = memo = False
+            direct = frozenset()
+        if memo and os.environ.get(LAYOUT_ENV, 'fixed') == 'tight':
+            print("Warning: page reuse needs the fixed layout, rendering every page")
+            memo = False
+        # with memo the static pages come from today's cached copy as well
+        static_cache = static_cache or memo
         
-        with PdfPages(portfolio_dir / 'portfolio_report.pdf') as pdf:
-            create_cover_page(pdf, customer_name, ucid)
-
-            fig1 = plot_table_and_pie(
-                Portfolio_Value_Modified,
-                Holding,
-                xirr,
-                cash_equivalent_value,
-                cash_equivalent_percentage,
-                equity_allocation_percentage,
-            )
-            pdf.savefig(fig1, bbox_inches='tight')
-            plt.close(fig1)
-
-            fig2 = create_holdings_summary(equity, debt, Holding)
-            pdf.savefig(fig2, bbox_inches='tight')
-            plt.close(fig2)
-            
-            fig3 = create_portfolio_table(Holding)
-            pdf.savefig(fig3, bbox_inches='tight')
-            plt.close(fig3)
-            
-            
-            fig5 = analyze_fno_holdings(Holding)
-            pdf.savefig(fig5, bbox_inches='tight')
-            plt.close(fig5)
-
-            fig4 = eqmf(Holding)
-            pdf.savefig(fig4, bbox_inches='tight')
-            plt.close(fig4)
-            
-            fig6 = dmf(Holding)
-            pdf.savefig(fig6, bbox_inches='tight')
-            plt.close(fig6)
-            
-            create_benchmark_tables_page(pdf)
-            create_benchmark_tables_page2(pdf)
-            create_footer_page(pdf)
-
+        if not (parallel or static_cache or direct):
+            with PdfPages(part) as pdf:
+                for key, _ in PAGES:
+                    build_page(key, pdf, ctx)
+                    tick(key)
+            os.replace(part, out_path)
+            return out_path
+
+        keys = [key for key, _ in PAGES if not (static_cache and key in STATIC_PAGES)]
+        reused = {}
+        if memo:
+            with span('memo_lookup'):
+                digests = page_digests(keys, ctx, direct)
+                for key in keys:
+                    cached = get_page(key, digests[key])
+                    if cached is not None:
+                        reused[key] = [(cached, i) for i in range(pdf_pages(cached))]
+            for key in reused:
+                tick(key)
+            ctx = dict(ctx, stamp=False)
+
+        render = [key for key in keys if key not in reused]
+        with tempfile.TemporaryDirectory(prefix='reportiq_pages_') as tmp:
+            spans = dict(reused)
+            if render and parallel:
+                spans.update(render_pages_parallel(render, ctx, tmp, workers, tick, direct))
+            elif render:
+                spans.update(render_pages(render, ctx, Path(tmp) / 'pages.pdf', tick, direct))
+
+            if memo:
+                with span('memo_store'):
+                    for key in render:
+                        put_page(key, digests[key], spans[key])
+                    evict_pages()
+                    stamps = footer_stamps(tmp)
+                for key in keys:
+                    spans[key] = [(src, i, stamps[key in direct], 0) for src, i in spans[key]]
+                print(f"Reused {len(reused)} of {len(keys)} data pages from the page cache"
+                      f"{': ' + ', '.join(reused) if reused else ''}")
+                tag(reused=','.join(reused) or None)
+
+            if static_cache:
+                with span('static_pages'):
+                    static = static_pages()
+                with span('stamp_pages'):
+                    stamps = stamp_pages(ctx, Path(tmp) / 'stamps.pdf')
+                for i, key in enumerate(STATIC_PAGES):
+                    spans[key] = [(static, i, stamps, i)]
+                    tick(key)
+
+            with span('assemble'):
+                asm_pdf([p for key, _ in PAGES for p in spans[key]], part)
+        os.replace(part, out_path)
+
+        return out_path
+
+    except ReportCancelled as e:
+        print(e)
+        raise
     except Exception as e:
-        print(f"Error generating reports: {e}")
\ No newline at end of file
+        print(f"Error generating reports: {e}")
+        raise
+    finally:
+        if part is not None:
+            del_f(part)
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import pandas as pd
+
+@dataclass(frozen=True)
+class Schema:
+    # The columns of one input file the report reads, and their types.
+    # cols=None keeps every column as parsed; () keeps none (the file must
+    # still be present and parse). num columns load as float64 with
+    # unparseable cells as NaN, cat columns as pandas categoricals.
+    cols: Tuple[str, ...] = None
+    num: Tuple[str, ...] = ()
+    cat: Tuple[str, ...] = ()
+
+# Holding is kept whole: its sections are cut out by position and carry
+# their own header rows (utils/holding.py). XIRR, FNO and Profits are
+# required inputs that no page reads yet.
+_POSITIONS = Schema(('Category', 'Buy Price', 'Market Value'), num=('Buy Price', 'Market Value'),
+                    cat=('Category',))
+SCHEMAS: Dict[str, Schema] = {
+    'Portfolio Value.csv': Schema(('Portfolio Component', 'Portfolio Value'), num=('Portfolio Value',)),
+    'Holding.csv': Schema(),
+    'XIRR.csv': Schema(()),
+    'Equity.csv': _POSITIONS,
+    'Debt.csv': _POSITIONS,
+    'FNO.csv': Schema(()),
+    'Profits.csv': Schema(()),
+}
+
+def _typed(df: pd.DataFrame, schema: Schema) -> pd.DataFrame:
+    for c in schema.num:
+        if df[c].dtype != 'float64':
+            df[c] = pd.to_numeric(df[c], errors='coerce').astype('float64')
+    for c in schema.cat:
+        if df[c].dtype != 'category':
+            df[c] = df[c].astype('category')
+    return df
+
+def read_csv(src, fname: str) -> pd.DataFrame:
+    # pd.read_csv of one input file, parsing only the columns its schema lists
+    schema = SCHEMAS.get(fname)
+    if schema is None or schema.cols is None:
+        return pd.read_csv(src)
+    if not schema.cols:
+        pd.read_csv(src, nrows=0)
+        return pd.DataFrame()
+    return _typed(pd.read_csv(src, usecols=list(schema.cols), dtype={c: 'category' for c in schema.cat}),
+                  schema)
+
+def conform(df: pd.DataFrame, fname: str) -> pd.DataFrame:
+    # the same pruning and typing, on a copy, for a frame parsed some other
+    # way (converted from a workbook)
+    schema = SCHEMAS.get(fname)
+    if schema is None or schema.cols is None:
+        return df
+    missing = [c for c in schema.cols if c not in df.columns]
+    if missing:
+        raise ValueError(f"{fname} has no {', '.join(missing)} column{'s' if len(missing) > 1 else ''}")
+    if not schema.cols:
+        return pd.DataFrame()
+    return _typed(df[[c for c in df.columns if c in schema.cols]].copy(), schema)
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
@@ -0,0 +1,313 @@
+import base64
+import binascii
+import io
+import json
+import os
+import shutil
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict
+
+from utils.batch import run_client
+from utils.ops import cache_dir, safe_name, val_file
+
+QUEUE_MAX = int(os.environ.get('REPORTIQ_SERVE_QUEUE', 256))
+KEEP_JOBS = int(os.environ.get('REPORTIQ_SERVE_KEEP', 10000))
+MAX_BODY = int(os.environ.get('REPORTIQ_SERVE_MAX_BODY', 256 * 1024 * 1024))
+
+class QueueFull(Exception):
+    pass
+
+def warm() -> None:
+    # Runs once in every worker so the first job starts hot: backend and
+    # font caches, decoded page chrome, and one throwaway page through the
+    # PDF backend (which also fills the per-process chrome image cache).
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    from utils.chrome import chrome
+    from utils.plotting import detail_page
+    from utils.report import save_fig
+    from utils.tables import text_width
+
+    for weight in ('normal', 'bold'):
+        text_width('0123456789', 10, weight)
+    for kind, size in (('page', (15.8, 10)), ('page', (16, 10)), ('cover', (16, 10))):
+        chrome(kind, size)
+    with PdfPages(io.BytesIO()) as pdf:
+        save_fig(pdf, detail_page('Warm-up'))
+    plt.close('all')
+
+@dataclass
+class Job:
+    id: str
+    name: str
+    out_dir: str
+    submitted: float
+    args: tuple = ()
+    fut: object = None
+    spool: str = None
+    pdf: str = None
+    error: str = None
+    secs: float = None
+    finished: float = None
+
+    @property
+    def status(self) -> str:
+        if self.finished is not None:
+            return 'done' if self.pdf else 'cancelled' if self.error == 'cancelled' else 'failed'
+        return 'queued' if self.fut is None else 'running'
+
+    def info(self) -> dict:
+        return dict(id=self.id, name=self.name, status=self.status, pdf=self.pdf, error=self.error,
+                    secs=self.secs, submitted=self.submitted, finished=self.finished)
+
+class JobQueue:
+    # A warmed process pool plus a bounded table of jobs. Jobs wait here
+    # rather than in the pool, which is only ever handed one per worker, so
+    # a waiting job can still be cancelled; submit() refuses work once
+    # queue_max are waiting so callers can back off.
+    def __init__(self, out_dir, workers: int = None, opts: dict = None, queue_max: int = QUEUE_MAX):
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = workers or os.cpu_count() or 1
+        self.opts = opts or {}
+        self.queue_max = queue_max
+        self.jobs: Dict[str, Job] = OrderedDict()
+        self.waiting = deque()
+        self.running = 0
+        self.lock = threading.Lock()
+        self.pool = self._new_pool()
+        # start every worker now rather than on the first jobs
+        for f in [self.pool.submit(time.sleep, 0) for _ in range(self.workers)]:
+            f.result()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=warm)
+
+    def _rebuild(self, broken) -> None:
+        # called with the lock held once a worker has died (killed, out of
+        # memory): the pool then refuses all work, so swap in a fresh one
+        # whose workers warm up as they start
+        if broken is not self.pool:
+            return
+        print("Warning: a worker process died, restarting the worker pool", flush=True)
+        self.pool = self._new_pool()
+        for _ in range(self.workers):
+            self.pool.submit(time.sleep, 0)
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, client_dir=None, files=None, uploads: Dict[str, bytes] = None, out_dir=None,
+               name=None) -> Job:
+        # one of: client_dir (every input file in it), files (paths) or
+        # uploads (file name -> contents, spooled to disk for the worker;
+        # name, default the job id, then stands in for the client folder)
+        job_id = uuid.uuid4().hex
+        spool = None
+        if uploads:
+            bad = [n for n in uploads if Path(n).name != n or not val_file(n)]
+            if bad:
+                raise ValueError(f"Unsupported upload names: {', '.join(bad)}")
+            spool = cache_dir('jobs', job_id)
+            client_dir = spool / (name or job_id)
+            client_dir.mkdir()
+            for fname, data in uploads.items():
+                (client_dir / fname).write_bytes(data)
+        elif files:
+            missing = [f for f in files if not Path(f).is_file()]
+            if missing:
+                raise ValueError(f"Missing input files: {', '.join(missing)}")
+            client_dir = Path(files[0]).parent
+        elif not client_dir or not Path(client_dir).is_dir():
+            raise ValueError(f"Not a directory: {client_dir}")
+
+        with self.lock:
+            if len(self.waiting) >= self.queue_max:
+                if spool:
+                    shutil.rmtree(spool, ignore_errors=True)
+                raise QueueFull(f"{len(self.waiting)} jobs waiting")
+            out_dir = str(out_dir or self.out_dir)
+            job = Job(job_id, Path(client_dir).name, out_dir, time.time(),
+                      (str(client_dir), out_dir, self.opts, files), spool=spool and str(spool))
+            self.jobs[job_id] = job
+            self.waiting.append(job)
+            self._prune()
+            self._dispatch()
+        return job
+
+    def _dispatch(self) -> None:
+        # called with the lock held
+        while self.waiting and self.running < self.workers:
+            job = self.waiting[0]
+            pool = self.pool
+            try:
+                fut = pool.submit(run_client, *job.args)
+            except BrokenProcessPool:
+                # died while idle; the job is still first in line for the new pool
+                self._rebuild(pool)
+                continue
+            self.waiting.popleft()
+            self.running += 1
+            job.fut = fut
+            fut.add_done_callback(lambda fut, job=job, pool=pool: self._finish(job, fut, pool))
+
+    def _finish(self, job: Job, fut, pool) -> None:
+        broken = False
+        try:
+            _, job.pdf, job.error, job.secs = fut.result()
+        except CancelledError:
+            job.error = 'cancelled'
+        except BrokenProcessPool:
+            broken = True
+            job.error = "a worker process died while the job was running; submit it again"
+        except Exception as e:
+            job.error = str(e)
+        self._done(job)
+        with self.lock:
+            self.running -= 1
+            if broken:
+                self._rebuild(pool)
+            self._dispatch()
+
+    def _done(self, job: Job) -> None:
+        job.finished = time.time()
+        if job.spool:
+            shutil.rmtree(job.spool, ignore_errors=True)
+
+    def _prune(self) -> None:
+        # forget the oldest finished jobs beyond KEEP_JOBS; their PDFs stay
+        done = [k for k, j in self.jobs.items() if j.finished is not None]
+        for k in done[:max(0, len(self.jobs) - KEEP_JOBS)]:
+            del self.jobs[k]
+
+    def get(self, job_id: str) -> Job:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        # only a job still waiting; one already in a worker runs to the end
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job not in self.waiting:
+                return False
+            self.waiting.remove(job)
+        job.error = 'cancelled'
+        self._done(job)
+        return True
+
+    def stats(self) -> dict:
+        with self.lock:
+            counts = {}
+            for j in self.jobs.values():
+                counts[j.status] = counts.get(j.status, 0) + 1
+        return dict(workers=self.workers, queue_max=self.queue_max, jobs=counts)
+
+    def close(self) -> None:
+        with self.lock:
+            for job in self.waiting:
+                job.error = 'cancelled'
+                self._done(job)
+            self.waiting.clear()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+class Handler(BaseHTTPRequestHandler):
+    # POST /jobs            {"client_dir": ...} | {"files": [...]} |
+    #                       {"uploads": {"Holding.csv": "<base64>", ...}},
+    #                       optional "output_dir", and "name" for uploads
+    # GET  /jobs/<id>       status; GET /jobs/<id>/pdf the report itself
+    # DELETE /jobs/<id>     cancel a queued job
+    # GET  /health          pool and queue counts
+    jobs: JobQueue = None
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, code: int, body: bytes, ctype='application/json', headers=None) -> None:
+        self.send_response(code)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, code: int, obj, headers=None) -> None:
+        self._send(code, json.dumps(obj).encode(), headers=headers)
+
+    def _job(self, parts):
+        job = self.jobs.get(parts[1]) if len(parts) >= 2 else None
+        if job is None:
+            self._json(404, {'error': 'no such job'})
+        return job
+
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+        if parts == ['health']:
+            return self._json(200, self.jobs.stats())
+        if parts[0] != 'jobs' or len(parts) not in (2, 3) or (len(parts) == 3 and parts[2] != 'pdf'):
+            return self._json(404, {'error': 'not found'})
+        job = self._job(parts)
+        if job is None:
+            return
+        if len(parts) == 2:
+            return self._json(200, job.info())
+        if job.status != 'done':
+            return self._json(409, {'error': f"job is {job.status}", **job.info()})
+        body = Path(job.pdf).read_bytes()
+        self._send(200, body, 'application/pdf',
+                   {'Content-Disposition': f'attachment; filename="{Path(job.pdf).name}"'})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            return self._json(404, {'error': 'not found'})
+        size = int(self.headers.get('Content-Length') or 0)
+        if size > MAX_BODY:
+            self.close_connection = True
+            return self._json(413, {'error': f"body over {MAX_BODY} bytes"})
+        try:
+            req = json.loads(self.rfile.read(size) or b'{}')
+            uploads = {n: base64.b64decode(v, validate=True) for n, v in (req.get('uploads') or {}).items()}
+            job = self.jobs.submit(req.get('client_dir'), req.get('files'), uploads, req.get('output_dir'),
+                                   req.get('name') and safe_name(req['name']))
+        except QueueFull as e:
+            return self._json(503, {'error': f"queue full: {e}"}, {'Retry-After': '5'})
+        except (ValueError, TypeError, AttributeError, binascii.Error) as e:
+            return self._json(400, {'error': str(e)})
+        self._json(202, job.info(), {'Location': f"/jobs/{job.id}"})
+
+    def do_DELETE(self):
+        parts = self.path.strip('/').split('/')
+        if parts[0] != 'jobs' or len(parts) != 2:
+            return self._json(404, {'error': 'not found'})
+        job = self._job(parts)
+        if job is None:
+            return
+        if self.jobs.cancel(job.id):
+            return self._json(200, job.info())
+        self._json(409, {'error': f"job is {job.status}", **job.info()})
+
+    def address_string(self):
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+class UnixHTTPServer(ThreadingHTTPServer):
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        # skip HTTPServer's host/port lookup, which a socket path lacks
+        Path(self.server_address).unlink(missing_ok=True)
+        socketserver.TCPServer.server_bind(self)
+        self.server_name, self.server_port = str(self.server_address), 0
+
+def make_server(jobs: JobQueue, host='127.0.0.1', port=8765, sock=None):
+    handler = type('JobHandler', (Handler,), {'jobs': jobs})
+    if sock:
+        return UnixHTTPServer(str(sock), handler)
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,207 @@
+import csv
+import io
+import json
+import os
+import shutil
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+from utils.holding import CLIENT_MARKER
+from utils.ops import safe_name, val_file
+
+CHUNK = int(os.environ.get('REPORTIQ_SPLIT_CHUNK', 1 << 20))
+INDEX_VERSION = 1
+_MARKER = CLIENT_MARKER.encode()
+
+@dataclass
+class ClientBlock:
+    ucid: str
+    info: str
+    start: int
+    end: int
+    data: bytes = b''
+
+@dataclass
+class ExportIndex:
+    # byte offsets into one multi-client Holding export: head is the header
+    # line plus the rows before the first client, shared by every client
+    path: str
+    size: int
+    mtime_ns: int
+    head: Tuple[int, int]
+    clients: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    info: Dict[str, str] = field(default_factory=dict)
+    version: int = INDEX_VERSION
+
+def index_path(path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + '.idx.json')
+
+def _client_info(line: bytes) -> str:
+    # the marker row's second cell, e.g. 'EQ1/UC1/John Doe'
+    row = next(csv.reader([line.decode('utf-8-sig', errors='replace')]), [])
+    if len(row) < 2 or row[0].strip() != CLIENT_MARKER:
+        return None
+    return row[1].strip()
+
+def _ucid(info: str) -> str:
+    parts = info.split('/')
+    if len(parts) != 3:
+        raise ValueError(f"Unexpected format in client information: {info}")
+    return parts[1]
+
+def _close(block: ClientBlock, end: int, rows: List[bytes]) -> ClientBlock:
+    block.end = end
+    block.data = b''.join(rows)
+    return block
+
+def scan(path, keep=True) -> Iterator[Tuple[bytes, ClientBlock]]:
+    # Streams the export line by line (read in CHUNK-sized buffers) and yields
+    # (head, block) per client; only one client's rows are held at a time. A
+    # block runs from its marker row up to the next one, less any rows there
+    # that repeat the head's preamble (a title printed per client), which the
+    # shared head stands in for when the block is read back.
+    head = b''
+    preamble: List[bytes] = []
+    block: ClientBlock = None
+    rows: List[bytes] = []
+    recent = deque()
+    offset = 0
+
+    with open(path, 'rb', buffering=CHUNK) as f:
+        for n, line in enumerate(f):
+            info = _client_info(line) if n and _MARKER in line[:len(_MARKER) + 4] else None
+            if info is None:
+                if block is None:
+                    head += line
+                    if n:
+                        preamble.append(line)
+                else:
+                    if keep:
+                        rows.append(line)
+                    if preamble:
+                        recent.append((offset, line))
+                        if len(recent) > len(preamble):
+                            recent.popleft()
+            else:
+                if block is not None:
+                    end = offset
+                    if preamble and [l for _, l in recent] == preamble:
+                        end = recent[0][0]
+                        if keep:
+                            del rows[-len(preamble):]
+                    yield head, _close(block, end, rows)
+                block = ClientBlock(_ucid(info), info, offset, 0)
+                rows = [line] if keep else []
+                recent.clear()
+            offset += len(line)
+
+    if block is None:
+        raise ValueError(f"No '{CLIENT_MARKER}' row in {Path(path).name}")
+    yield head, _close(block, offset, rows)
+
+def _frame(head: bytes, data: bytes) -> pd.DataFrame:
+    return pd.read_csv(io.BytesIO(head + data))
+
+def _indexed(path: Path, keep=True) -> Iterator[Tuple[ExportIndex, bytes, ClientBlock]]:
+    # scan(), recording each block in an index that is complete once the
+    # scan is exhausted
+    st = path.stat()
+    idx = None
+    for head, block in scan(path, keep):
+        if idx is None:
+            idx = ExportIndex(str(path), st.st_size, st.st_mtime_ns, (0, len(head)))
+        if block.ucid in idx.clients:
+            raise ValueError(f"Client {block.ucid} appears more than once in {path.name}")
+        idx.clients[block.ucid] = (block.start, block.end)
+        idx.info[block.ucid] = block.info
+        yield idx, head, block
+
+def build_index(path) -> ExportIndex:
+    idx = None
+    for idx, _, _ in _indexed(Path(path), keep=False):
+        pass
+    return idx
+
+def save_index(idx: ExportIndex, dest=None) -> Path:
+    dest = Path(dest) if dest else index_path(idx.path)
+    tmp = dest.with_name(f"{dest.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(asdict(idx)))
+    os.replace(tmp, dest)
+    return dest
+
+def load_index(path, rebuild=True) -> ExportIndex:
+    # the saved index when it still matches the export, else a fresh scan
+    path = Path(path)
+    st = path.stat()
+    try:
+        raw = json.loads(index_path(path).read_text())
+        idx = ExportIndex(**{**raw, 'head': tuple(raw['head']),
+                             'clients': {k: tuple(v) for k, v in raw['clients'].items()}})
+        if idx.version == INDEX_VERSION and (idx.size, idx.mtime_ns) == (st.st_size, st.st_mtime_ns):
+            return idx
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    if not rebuild:
+        raise FileNotFoundError(f"No current index for {path.name}")
+    idx = build_index(path)
+    save_index(idx)
+    return idx
+
+def client_bytes(path, ucid: str, idx: ExportIndex = None) -> bytes:
+    # one client's rows as a standalone CSV, via two seeks without scanning
+    idx = idx or load_index(path)
+    if ucid not in idx.clients:
+        raise KeyError(f"Client {ucid} not in {Path(path).name}")
+    start, end = idx.clients[ucid]
+    with open(path, 'rb') as f:
+        f.seek(idx.head[0])
+        head = f.read(idx.head[1] - idx.head[0])
+        f.seek(start)
+        return head + f.read(end - start)
+
+def read_client(path, ucid: str, idx: ExportIndex = None) -> pd.DataFrame:
+    return pd.read_csv(io.BytesIO(client_bytes(path, ucid, idx)))
+
+def split_holding(path, out_dir=None, name='Holding.csv') -> Iterator[Tuple[str, pd.DataFrame]]:
+    # Yields (ucid, Holding frame) per client and saves the byte-offset index
+    # next to the export. With out_dir, each client's rows are also written
+    # as out_dir/<ucid>/<name>, the one-folder-per-client layout batch.py reads.
+    idx = None
+    for idx, head, block in _indexed(Path(path)):
+        if out_dir is not None:
+            d = Path(out_dir) / safe_name(block.ucid)
+            d.mkdir(parents=True, exist_ok=True)
+            (d / name).write_bytes(head + block.data)
+        yield block.ucid, _frame(head, block.data)
+    save_index(idx)
+
+def client_inputs(inputs, ucid: str) -> Path:
+    # the folder under inputs with a client's other input files, named by
+    # UCID as the split folders are
+    for name in (safe_name(ucid), ucid):
+        d = Path(inputs) / name
+        if d.is_dir():
+            return d
+    return None
+
+def link_inputs(dest, src, skip=('Holding.csv',)) -> List[str]:
+    # Hard-links (copies across file systems) every input file in src into
+    # a split client folder, so it holds the full set batch.py reads; the
+    # split Holding.csv is kept over any in src.
+    linked = []
+    for f in sorted(Path(src).iterdir()):
+        if not f.is_file() or not val_file(f.name) or f.name in skip:
+            continue
+        target = Path(dest) / f.name
+        target.unlink(missing_ok=True)
+        try:
+            os.link(f, target)
+        except OSError:
+            shutil.copy2(f, target)
+        linked.append(f.name)
+    return linked
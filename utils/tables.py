@@ -0,0 +1,233 @@
+import os
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+from matplotlib.artist import Artist, allow_rasterization
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.font_manager import FontProperties, findfont, get_font
+from matplotlib.ft2font import LoadFlags
+from matplotlib.transforms import Bbox
+
+def _table_rows() -> int:
+    value = os.environ.get('REPORTIQ_TABLE_ROWS') or '20'
+    try:
+        rows = int(value)
+    except ValueError:
+        raise ValueError(f"REPORTIQ_TABLE_ROWS must be a whole number of rows, got {value!r}") from None
+    # a page holds at least one row
+    return max(1, rows)
+
+ROWS_PER_PAGE = _table_rows()
+TABLE_RECT = [0.03, 0.25, 0.94, 0.5]
+EMPTY_LABEL = 'No holdings'
+
+@dataclass
+class TablePage:
+    columns: List[str]
+    rows: list
+    subtotal: list
+    number: int
+    count: int
+
+def paginate(df: pd.DataFrame, columns: Sequence[str], sum_cols: Sequence[str] = (),
+             rows: int = ROWS_PER_PAGE) -> List[TablePage]:
+    # Splits a section into pages of at most `rows` lines. When it takes more
+    # than one page, every page ends with the running subtotal of sum_cols.
+    columns = list(columns)
+    values = df[columns].values.tolist()
+    count = max(1, -(-len(values) // rows))
+
+    running = None
+    if count > 1 and sum_cols:
+        nums = df[list(sum_cols)].apply(pd.to_numeric, errors='coerce').fillna(0)
+        running = nums.groupby(np.arange(len(nums)) // rows).sum().cumsum()
+
+    pages = []
+    for i in range(count):
+        subtotal = None
+        if count > 1:
+            label = 'Total' if i == count - 1 else f"Subtotal c/f (page {i + 1})"
+            subtotal = [label] + [
+                round(running.at[i, c], 2) if running is not None and c in running else ''
+                for c in columns[1:]
+            ]
+        pages.append(TablePage(columns, values[i * rows:(i + 1) * rows], subtotal, i + 1, count))
+    return pages
+
+CELL_PAD = 0.1
+# baseline offset below a row's centre, as a fraction of the font size,
+# matching matplotlib's va='center' for single-line cell text
+BASELINE = 0.26
+_advances = {}
+
+def _font_props(size: float, weight: str) -> FontProperties:
+    return FontProperties(size=size, weight=weight)
+
+def text_width(s: str, size: float = 10, weight: str = 'normal') -> float:
+    # advance width in points from cached per-glyph advances (no kerning),
+    # so column widths never need a renderer
+    key = (size, weight)
+    table = _advances.get(key)
+    if table is None:
+        font = get_font(findfont(_font_props(size, weight)))
+        font.set_size(size, 72)
+        table = _advances[key] = {'font': font}
+    w = 0.0
+    for ch in s:
+        adv = table.get(ch)
+        if adv is None:
+            adv = table[ch] = table['font'].load_char(ord(ch), flags=LoadFlags.NO_HINTING).linearHoriAdvance / 65536
+        w += adv
+    return w
+
+class TableText(Artist):
+    # Draws every cell string with one renderer.draw_text call each, at
+    # positions fixed when the table was laid out; no Text artists.
+    def __init__(self, ax, items, fontsize, extent):
+        super().__init__()
+        self.ax = ax
+        self.items = items
+        self.fontsize = fontsize
+        self.extent = extent
+        self.set_transform(ax.transAxes)
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if not self.get_visible() or not self.items:
+            return
+        k = renderer.points_to_pixels(1.0)
+        dy = BASELINE * self.fontsize * k
+        props = {w: _font_props(self.fontsize, w) for w in ('normal', 'bold')}
+        pts = self.ax.transAxes.transform([(x, y) for x, y, *_ in self.items])
+
+        gc = renderer.new_gc()
+        for (px, py), (_, _, s, ha, weight, color, width, *_) in zip(pts, self.items):
+            if ha == 'right':
+                px -= width * k
+            elif ha == 'center':
+                px -= width * k / 2
+            gc.set_foreground(color)
+            renderer.draw_text(gc, px, py - dy, s, props[weight], 0)
+        gc.restore()
+        self.stale = False
+
+    def get_window_extent(self, renderer=None):
+        return self.ax.transAxes.transform_bbox(Bbox.from_bounds(*self.extent))
+
+@dataclass
+class TableLayout:
+    # backend-neutral table geometry: fills are (x0, y0, x1, y1, color),
+    # items are (x, y_centre, text, ha, weight, color, width_pt, x0, x1)
+    fills: list
+    segs: list
+    items: list
+    fontsize: float
+    extent: tuple
+
+def layout_table(cells, columns=None, bbox=(0, 0, 1, 1), col_widths=None, align='center', header_align='center',
+                 fontsize=10, fill='white', header_fill='#E6E6E6', style=None, measure=text_width) -> TableLayout:
+    # Lays out an optional header + body in bbox units. style(row, col, text)
+    # may return fill / weight / color overrides; with columns, row 0 is the header.
+    x0, y0, width, height = bbox
+    head = columns is not None
+    rows = ([list(map(str, columns))] if head else []) + [['' if v is None else str(v) for v in r] for r in cells]
+    ncols = len(rows[0])
+    aligns = [align] * ncols if isinstance(align, str) else list(align)
+
+    if col_widths is None:
+        col_widths = [
+            max(measure(r[c], fontsize, 'bold' if head and i == 0 else 'normal') for i, r in enumerate(rows))
+            / (1 - 2 * CELL_PAD)
+            for c in range(ncols)
+        ]
+    total = float(sum(col_widths)) or 1.0
+    xs = np.concatenate([[0], np.cumsum(col_widths)]) / total * width + x0
+    row_h = height / len(rows)
+    top = y0 + height
+
+    # one rectangle for the body background, cells only for overrides
+    body_top = top - row_h if head else top
+    fills = [(x0, y0, x0 + width, body_top, fill)] if fill else []
+    items = []
+    for r, row in enumerate(rows):
+        is_head = head and r == 0
+        y1 = top - r * row_h
+        for c, text in enumerate(row):
+            st = (style(r, c, text) if style else None) or {}
+            face = st.get('fill', header_fill if is_head else None)
+            if face:
+                fills.append((xs[c], y1 - row_h, xs[c + 1], y1, face))
+            if not text:
+                continue
+            cw = xs[c + 1] - xs[c]
+            ha = header_align if is_head else aligns[c]
+            x = xs[c] + CELL_PAD * cw if ha == 'left' else xs[c + 1] - CELL_PAD * cw if ha == 'right' else xs[c] + cw / 2
+            weight = st.get('weight', 'bold' if is_head else 'normal')
+            items.append((x, y1 - row_h / 2, text, ha, weight, st.get('color', 'black'),
+                          measure(text, fontsize, weight), xs[c], xs[c + 1]))
+
+    ys = top - np.arange(len(rows) + 1) * row_h
+    segs = [[(x0, y), (x0 + width, y)] for y in ys] + [[(x, y0), (x, top)] for x in xs]
+    return TableLayout(fills, segs, items, fontsize, (x0, y0, width, height))
+
+def grid_table(ax, cells, columns=None, bbox=(0, 0, 1, 1), edgecolor='black', linewidth=1.0, **kw):
+    # draws layout_table's result in axes coordinates
+    lay = layout_table(cells, columns, bbox, **kw)
+    if lay.fills:
+        ax.add_collection(PolyCollection(
+            [[(a, b), (c, b), (c, d), (a, d)] for a, b, c, d, _ in lay.fills],
+            facecolors=[f[4] for f in lay.fills], edgecolors='none', transform=ax.transAxes, zorder=1,
+        ), autolim=False)
+    ax.add_collection(LineCollection(lay.segs, colors=edgecolor, linewidths=linewidth,
+                                     transform=ax.transAxes, zorder=2), autolim=False)
+
+    text = TableText(ax, lay.items, lay.fontsize, lay.extent)
+    text.set_zorder(3)
+    ax.add_artist(text)
+    return text
+
+def _negative(text: str) -> bool:
+    return text.startswith('(') or (text.replace('.', '').replace('-', '').isdigit() and float(text) < 0)
+
+def _page_table(page: TablePage, red_cols: Sequence[int], rows: int):
+    cell_text = [list(r) for r in page.rows] or [[EMPTY_LABEL] + [''] * (len(page.columns) - 1)]
+    if page.subtotal:
+        cell_text.append(page.subtotal)
+
+    last = len(cell_text)
+    def style(row, col, text):
+        if page.subtotal and row == last:
+            return {'fill': '#E6F3FF', 'weight': 'bold'}
+        if row > 0 and col in red_cols and _negative(text):
+            return {'color': 'red'}
+
+    # fixed row height: a full page (header + rows + subtotal) fills rect
+    height = (len(cell_text) + 1) / (rows + 2)
+    return cell_text, style, height
+
+def draw_table(fig, page: TablePage, red_cols: Sequence[int] = (), rect=TABLE_RECT,
+               rows: int = ROWS_PER_PAGE):
+    table_ax = fig.add_axes(rect)
+    table_ax.axis('off')
+
+    cell_text, style, height = _page_table(page, red_cols, rows)
+    table = grid_table(table_ax, cell_text, page.columns, bbox=(0, 1 - height, 1, height), style=style)
+
+    if page.count > 1:
+        table_ax.text(1, -0.04, f"Page {page.number} of {page.count}", transform=table_ax.transAxes,
+                      ha='right', va='top', fontsize=10, color='#666666')
+    return table
+
+def write_table(out, page: TablePage, red_cols: Sequence[int] = (), rect=TABLE_RECT,
+                rows: int = ROWS_PER_PAGE):
+    # draw_table for a pdfwrite.Page; rect is in figure fractions
+    l, b, w, h = rect
+    cell_text, style, height = _page_table(page, red_cols, rows)
+    out.table(layout_table(cell_text, page.columns, bbox=(l, b + h * (1 - height), w, h * height), style=style,
+                           measure=out.text_width))
+
+    if page.count > 1:
+        out.text(l + w, b - 0.04 * h, f"Page {page.number} of {page.count}", size=10, color='#666666',
+                 ha='right', va='top')
@@ -0,0 +1,146 @@
+import contextvars
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+TRACE_ENV = 'REPORTIQ_TRACE'
+PROFILE_ENV = 'REPORTIQ_PROFILE'
+
+_run = contextvars.ContextVar('trace_run', default=None)
+_lock = threading.Lock()
+
+def trace_target() -> str:
+    # REPORTIQ_TRACE=<path> appends JSON lines to that file; 1/stderr prints them
+    return os.environ.get(TRACE_ENV) or None
+
+def enabled() -> bool:
+    return trace_target() is not None
+
+def profile_top() -> int:
+    try:
+        return int(os.environ.get(PROFILE_ENV) or 0)
+    except ValueError:
+        return 0
+
+def _write(records) -> None:
+    target = trace_target()
+    if not target or not records:
+        return
+    lines = ''.join(json.dumps(r, default=str) + '\n' for r in records)
+    with _lock:
+        if target in ('1', 'stderr'):
+            sys.stderr.write(lines)
+        else:
+            with open(target, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+def tag(**tags) -> None:
+    run = _run.get()
+    if run is not None:
+        run['tags'].update((k, v) for k, v in tags.items() if v is not None)
+
+@contextmanager
+def traced_run(**tags):
+    # Buffers the spans of one report so tags learned part-way through
+    # (the UCID, once the Holding file is parsed) land on every record.
+    if not enabled() or _run.get() is not None:
+        tag(**tags)
+        yield
+        return
+
+    state = {'tags': {k: v for k, v in tags.items() if v is not None}, 'records': []}
+    token = _run.set(state)
+    try:
+        yield
+    finally:
+        _run.reset(token)
+        _write([dict(state['tags'], **r) for r in state['records']])
+
+@contextmanager
+def span(stage: str, **tags):
+    if not enabled():
+        yield
+        return
+
+    rec = dict(stage=stage, pid=os.getpid(), ts=round(time.time(), 3))
+    rec.update((k, v) for k, v in tags.items() if v is not None)
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    except BaseException as e:
+        rec['error'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        rec['wall'] = round(time.perf_counter() - wall, 6)
+        rec['cpu'] = round(time.thread_time() - cpu, 6)
+        state = _run.get()
+        if state is not None:
+            state['records'].append(rec)
+        else:
+            _write([rec])
+
+@contextmanager
+def collected():
+    # Buffers the spans of the block apart from any run this process has
+    # (a forked worker inherits its parent's) and yields them, for a worker
+    # to hand back with its result.
+    state = {'tags': {}, 'records': []}
+    token = _run.set(state)
+    try:
+        yield state['records']
+    finally:
+        _run.reset(token)
+
+def merge(records) -> None:
+    # records collected in a worker, into the current run or straight out
+    state = _run.get()
+    if state is not None:
+        state['records'].extend(records)
+    else:
+        _write(records)
+
+class TracedPdf:
+    # PdfPages proxy that records every savefig as its own span
+    def __init__(self, pdf, **tags):
+        self.pdf = pdf
+        self.tags = tags
+
+    def savefig(self, *args, **kwargs):
+        with span('savefig', **self.tags):
+            return self.pdf.savefig(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.pdf, name)
+
+def traced_pdf(pdf, **tags):
+    return TracedPdf(pdf, **tags) if enabled() else pdf
+
+@contextmanager
+def profiled(out: Path, top: int = None):
+    # Wraps the block in cProfile and writes the top-N functions by
+    # cumulative time to <out>.profile.txt
+    top = profile_top() if top is None else top
+    if top <= 0:
+        yield
+        return
+
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats('cumulative').print_stats(top)
+        path = Path(out).with_suffix('.profile.txt')
+        try:
+            path.write_text(buf.getvalue())
+        except OSError as e:
+            print(f"Warning: could not write profile {path}: {e}")